@@ -0,0 +1,4 @@
+from api.lookups import LookupTable
+from .models import Role
+
+roles = LookupTable(Role, "roles")
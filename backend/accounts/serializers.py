@@ -2,10 +2,14 @@ from django.db import transaction
 from django.db.models import F
 from rest_framework import serializers
 
+from api.serializers import LookupSlugRelatedField
 from files.serializers import FileSerializer
 from files.utils import generate_presigned_url
+from tags.models import Tag
 from tags.serializers import TagSerializer
+from .lookups import roles
 from .models import User, Company, Role, UserTag
+from .signals import user_tags_changed
 
 
 class RoleSerializer(serializers.ModelSerializer):
@@ -15,7 +19,9 @@ class RoleSerializer(serializers.ModelSerializer):
 
 
 class UserPostSerializer(serializers.ModelSerializer):
-    role = serializers.SlugRelatedField(slug_field="name", queryset=Role.objects.filter(hidden=False))
+    role = LookupSlugRelatedField(
+        roles, queryset=Role.objects.filter(hidden=False), condition=lambda role: not role.hidden
+    )
 
     class Meta:
         model = User
@@ -48,9 +54,10 @@ class UserTagSerializer(serializers.ModelSerializer):
             raise serializers.ValidationError("Already exists.")
 
         position = validated_data.get("position")
-        if model.objects.filter(position=position, tag=tag).exists():
+        user = validated_data.get("user")
+        if model.objects.filter(position=position, user=user).exists():
             with transaction.atomic():
-                model.objects.filter(position__gte=position, tag=tag).update(position=F('position') + 1)
+                model.objects.filter(position__gte=position, user=user).update(position=F('position') + 1)
                 instance = super().create(validated_data)
         else:
             instance = super().create(validated_data)
@@ -86,13 +93,43 @@ class UserTagPositionSerializer(serializers.ModelSerializer):
         return instance
 
 
+class UserTagOrderSerializer(serializers.Serializer):
+    tags = serializers.ListField(child=serializers.IntegerField(), allow_empty=True)
+
+    def validate_tags(self, value):
+        if len(set(value)) != len(value):
+            raise serializers.ValidationError("Tags must not repeat.")
+        missing = set(value) - set(Tag.objects.filter(id__in=value).values_list("id", flat=True))
+        if missing:
+            raise serializers.ValidationError(f"Tags do not exist: {', '.join(map(str, sorted(missing)))}.")
+        return value
+
+    def create(self, validated_data):
+        """
+        Makes ``tags`` the user's complete ordered tag list (positions from 1): dropped tags are deleted,
+        the rest are inserted or moved with one upsert.
+        """
+        user, tag_ids = validated_data["user"], validated_data["tags"]
+        user_tags = [UserTag(user=user, tag_id=tag_id, position=position) for position, tag_id in enumerate(tag_ids, 1)]
+        with transaction.atomic():
+            current = list(UserTag.objects.select_for_update().filter(user=user).values_list("tag_id", "position"))
+            if sorted(current) == sorted((user_tag.tag_id, user_tag.position) for user_tag in user_tags):
+                return user_tags
+            UserTag.objects.filter(user=user).exclude(tag_id__in=tag_ids).delete()
+            UserTag.objects.bulk_create(
+                user_tags, update_conflicts=True, unique_fields=("user", "tag"), update_fields=("position",)
+            )
+            user_tags_changed.send(sender=UserTag, user_id=user.pk)
+        return user_tags
+
+
 class ContactSerializer(serializers.Serializer):
     name = serializers.CharField(max_length=50)
     value = serializers.CharField(max_length=255)
 
 
 class UserSerializer(serializers.ModelSerializer):
-    role = serializers.StringRelatedField(source="role.name", read_only=True)
+    role = LookupSlugRelatedField(roles, read_only=True)
     company = CompanySerializer(read_only=True)
     tags = TagSerializer(many=True, read_only=True)
     photo = serializers.SerializerMethodField()
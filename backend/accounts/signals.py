@@ -0,0 +1,9 @@
+from django.dispatch import Signal
+
+from api.cache import bump_version_on_change
+from .models import Role
+
+bump_version_on_change("roles", Role)
+
+# sent with user_id after a bulk change to a user's tags, which bypasses the per-row model signals
+user_tags_changed = Signal()
@@ -1,17 +1,19 @@
 from django.db.models import Prefetch
+from drf_spectacular.utils import extend_schema
 from rest_framework.generics import CreateAPIView, RetrieveUpdateDestroyAPIView, ListAPIView, \
     DestroyAPIView
 from rest_framework.mixins import UpdateModelMixin
 from rest_framework.permissions import IsAuthenticated
+from rest_framework.response import Response
 
 from accounts.filters import CurrentUserFilterBackend
 from accounts.models import User, Role, UserTag, Company
 from accounts.serializers import UserPostSerializer, UserSerializer, RoleSerializer, CompanySerializer, \
-    UserTagSerializer, UserTagPositionSerializer
+    UserTagSerializer, UserTagPositionSerializer, UserTagOrderSerializer
+from api.mixins import ConditionalListMixin
 from api.permissions import CreatedByPermission
-from api.utils import get_language_code
 from files.models import File
-from tags.models import Tag, TagTranslation
+from tags.models import Tag
 
 
 class UserCreateAPIView(CreateAPIView):
@@ -24,28 +26,29 @@ class UserRetrieveView(RetrieveUpdateDestroyAPIView):
     permission_classes = [IsAuthenticated]
 
     def get_queryset(self):
-        language_code = get_language_code()
-
         return User.objects.select_related(
             "photo"
         ).prefetch_related(
-            Prefetch("tags", queryset=Tag.objects.prefetch_related(
-                Prefetch("translations", TagTranslation.objects.filter(language_code=language_code)),
-            ).order_by("usertag__position")),
-            Prefetch("files", queryset=File.objects.filter(user_photo__isnull=True).select_related("type")),
+            Prefetch("tags", queryset=Tag.objects.order_by("usertag__position")),
+            Prefetch("files", queryset=File.objects.filter(user_photo__isnull=True)),
         ).all()
 
     def get_object(self):
         return self.get_queryset().get(pk=self.request.user.pk)
 
 
-class RoleListAPIView(ListAPIView):
+class RoleListAPIView(ConditionalListMixin, ListAPIView):
     queryset = Role.objects.filter(hidden=False)
     serializer_class = RoleSerializer
+    etag_namespaces = ("roles",)
 
 
 class CompanyCreateAPIView(CreateAPIView):
     serializer_class = CompanySerializer
+    permission_classes = [IsAuthenticated]
+
+    def perform_create(self, serializer):
+        serializer.save(created_by=self.request.user)
 
 
 class CompanyRetrieveUpdateDestroyAPIView(RetrieveUpdateDestroyAPIView):
@@ -72,6 +75,13 @@ class UserTagCreateAPIView(CreateAPIView):
         many = type(self.request.data) is list
         return serializer_class(many=many, *args, **kwargs)
 
+    @extend_schema(request=UserTagOrderSerializer, responses=UserTagSerializer(many=True))
+    def put(self, request, *args, **kwargs):
+        serializer = UserTagOrderSerializer(data=request.data, context=self.get_serializer_context())
+        serializer.is_valid(raise_exception=True)
+        user_tags = serializer.save(user=request.user)
+        return Response(UserTagSerializer(user_tags, many=True).data)
+
 
 class UserTagDestroyAPIView(DestroyAPIView, UpdateModelMixin):
     queryset = UserTag.objects.all()
@@ -1,6 +1,14 @@
 from django.apps import AppConfig
+from django.db.backends.signals import connection_created
 
 
 class ApiConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'api'
+
+    def ready(self):
+        from .cache import check_shared_cache
+        from .profiling import install_query_profiler
+
+        check_shared_cache()
+        connection_created.connect(install_query_profiler, dispatch_uid="api.profiling")
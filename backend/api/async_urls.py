@@ -0,0 +1,12 @@
+from django.urls import path
+
+from dict.views import CountryListAsyncView
+from vacancies.views import VacancyListAsyncView, VacancyRetrieveAsyncView, VacancySearchListAsyncView
+
+# Served by the ASGI application only (config.asgi_urls); the names match the synchronous routes they shadow
+urlpatterns = [
+    path("vacancies/", VacancyListAsyncView.as_view(), name="vacancies-list-create"),
+    path("vacancies/<int:pk>/", VacancyRetrieveAsyncView.as_view(), name="vacancies-retrieve-update-delete"),
+    path("vacancies/personalized/", VacancySearchListAsyncView.as_view()),
+    path("dict/countries/", CountryListAsyncView.as_view(), name="countries-list"),
+]
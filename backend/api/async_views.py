@@ -0,0 +1,159 @@
+import functools
+from concurrent.futures import ThreadPoolExecutor
+
+from asgiref.sync import sync_to_async
+from django.core.cache import cache
+from django.core.exceptions import ValidationError
+from django.db import connections
+from django.http import Http404
+from django.views import View
+from django.views.decorators.csrf import csrf_exempt
+from rest_framework import status
+from rest_framework.response import Response
+
+from api.cache import aget_versions
+from api.metrics import count_cache
+from api.replicas import primary_reads
+from config.settings import ASYNC_DB_CONNECTIONS
+
+_database_executor = ThreadPoolExecutor(ASYNC_DB_CONNECTIONS, thread_name_prefix="async-views-db")
+
+
+def _call_with_connections(func, *args, **kwargs):
+    # the thread's connections stay open for the next request; one left broken by a failed query is replaced
+    for connection in connections.all(initialized_only=True):
+        if connection.connection is not None and connection.errors_occurred:
+            connection.errors_occurred = False
+            if not connection.is_usable():
+                connection.close()
+    return func(*args, **kwargs)
+
+
+async def run_in_database_thread(func, *args, **kwargs):
+    """
+    Runs ``func`` in one of the ASYNC_DB_CONNECTIONS threads of the process, which query over connections they keep
+    between requests; the threads of ASGI requests are new for every request, so their connections could not be
+    reused. Requests wait for a free thread, which bounds the connections of the process.
+    """
+    return await sync_to_async(_call_with_connections, thread_sensitive=False, executor=_database_executor)(
+        func, *args, **kwargs
+    )
+
+
+class AsyncAPIView(View):
+    """
+    Async GET of a DRF view, for the hot read endpoints served through config.asgi. The DRF view (``view_class``,
+    with the viewset ``actions`` of the route) still provides authentication, permissions, the filtered queryset,
+    pagination, serializer and error responses. The DRF checks, queries and serializers run in a database thread
+    (run_in_database_thread()), never on the event loop, since they query or sign S3 URLs; the event loop only
+    waits for the cache. Other methods are handled by the DRF view itself.
+    """
+    view_class = None
+    actions = None
+
+    @classmethod
+    def as_view(cls, **initkwargs):
+        # the DRF view applies its own CSRF policy
+        return csrf_exempt(super().as_view(**initkwargs))
+
+    @classmethod
+    @functools.cache
+    def get_fallback_view(cls):
+        return cls.view_class.as_view(cls.actions) if cls.actions else cls.view_class.as_view()
+
+    async def dispatch(self, request, *args, **kwargs):
+        if request.method in ("GET", "HEAD"):
+            return await self.get(request, *args, **kwargs)
+        return await sync_to_async(self.get_fallback_view())(request, *args, **kwargs)
+
+    async def get(self, request, *args, **kwargs):
+        view = self.get_drf_view(request, *args, **kwargs)
+        try:
+            queryset = await run_in_database_thread(self.prepare, view, *args, **kwargs)
+            response = await self.get_response(view, queryset)
+        except Exception as exc:
+            response = view.handle_exception(exc)
+        return view.finalize_response(view.request, response, *args, **kwargs)
+
+    def get_drf_view(self, request, *args, **kwargs):
+        view = self.view_class()
+        if self.actions:
+            view.action_map = {**self.actions, "head": self.actions["get"]}
+        view.args, view.kwargs = args, kwargs
+        view.request = view.initialize_request(request, *args, **kwargs)
+        view.headers = view.default_response_headers
+        return view
+
+    @staticmethod
+    def prepare(view, *args, **kwargs):
+        """
+        DRF's authentication and permission checks, then the filtered queryset (not evaluated yet).
+        """
+        view.initial(view.request, *args, **kwargs)
+        return view.filter_queryset(view.get_queryset())
+
+    async def get_response(self, view, queryset):
+        raise NotImplementedError
+
+
+class AsyncListAPIView(AsyncAPIView):
+    async def get_response(self, view, queryset):
+        data, paginated = await run_in_database_thread(self.serialize, view, queryset)
+        return view.get_paginated_response(data) if paginated else Response(data)
+
+    @staticmethod
+    def serialize(view, queryset):
+        page = view.paginate_queryset(queryset)
+        return view.get_serializer(queryset if page is None else page, many=True).data, page is not None
+
+
+class AsyncRetrieveAPIView(AsyncAPIView):
+    async def get_response(self, view, queryset):
+        return Response(await run_in_database_thread(self.serialize, view, queryset))
+
+    @staticmethod
+    def serialize(view, queryset):
+        lookup_url_kwarg = view.lookup_url_kwarg or view.lookup_field
+        try:
+            instance = queryset.get(**{view.lookup_field: view.kwargs[lookup_url_kwarg]})
+        except (queryset.model.DoesNotExist, TypeError, ValueError, ValidationError):
+            raise Http404(f"No {queryset.model._meta.object_name} matches the given query.")
+        view.check_object_permissions(view.request, instance)
+        return view.get_serializer(instance).data
+
+
+class AsyncCachedResponseMixin:
+    """
+    api.mixins.CachedResponseMixin for async views, with the response cache read and written through the async
+    cache API.
+    """
+
+    async def get_response(self, view, queryset):
+        key = view.get_cache_key(view.request, await aget_versions(view.cache_namespaces))
+        data = await cache.aget(key)
+        count_cache("responses", data is not None)
+        if data is None:
+            response = await super().get_response(view, queryset)
+            if response.status_code != 200:
+                return response
+            data = view.get_shared_data(response.data)
+            await cache.aset(key, data, view.get_cache_timeout())
+        return Response(await run_in_database_thread(view.get_user_data, data))
+
+
+class AsyncConditionalListMixin:
+    """
+    api.mixins.ConditionalListMixin for async views, with the ETag versions read through the async cache API.
+    """
+
+    async def get_response(self, view, queryset):
+        return await self.get_conditional_response(view, super().get_response, queryset)
+
+    async def get_conditional_response(self, view, handler, *args):
+        etag = view.get_etag(view.request, await aget_versions(view.etag_namespaces))
+        if view.is_not_modified(view.request, etag):
+            response = Response(status=status.HTTP_304_NOT_MODIFIED)
+        else:
+            with primary_reads():
+                response = await handler(view, *args)
+        return view.add_conditional_headers(response, etag)
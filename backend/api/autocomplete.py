@@ -0,0 +1,160 @@
+import bisect
+import heapq
+import re
+import threading
+import time
+from collections import defaultdict
+
+from drf_spectacular.utils import extend_schema, OpenApiParameter
+from rest_framework.response import Response
+from rest_framework.views import APIView
+from rest_framework_simplejwt.authentication import JWTStatelessUserAuthentication
+
+from api.cache import get_version, bump_version
+from api.replicas import primary_reads
+from api.utils import get_language_code
+from config.settings import LOCAL_CACHE_VERSION_CHECK_INTERVAL
+
+WORD_START = re.compile(r"(?<!\w)\w")
+
+
+def normalize(text):
+    return text.casefold().strip()
+
+
+class PrefixIndex:
+    """
+    In-process autocomplete over translated names: per language, a sorted array of every word-start suffix
+    of every name, so a prefix is two bisects away ("york" finds "New York").
+
+    ``loader(ids)`` yields (id, language_code, name, rank) for the given ids, or for all rows when ids is None;
+    lower ranks come first. ``update(ids)`` reloads just those ids; other processes see the bumped version
+    and reload everything.
+    """
+
+    def __init__(self, namespace, loader):
+        self.namespace = namespace
+        self.loader = loader
+        self._keys = {}
+        self._entries = {}
+        self._rows = {}
+        self._version = None
+        self._checked_at = 0.0
+        self._lock = threading.Lock()
+
+    def search(self, language_code, prefix, limit):
+        prefix = normalize(prefix)
+        self._refresh()
+        with self._lock:
+            keys, entries = self._keys.get(language_code, []), self._entries.get(language_code, [])
+            start = bisect.bisect_left(keys, prefix)
+            end = bisect.bisect_left(keys, prefix + "\U0010ffff", start)
+
+            best = {}
+            for rank, owner_id in entries[start:end]:  # a name matches once per word
+                best[owner_id] = min(rank, best.get(owner_id, rank))
+            rows = self._rows.get(language_code, {})
+            return [
+                (owner_id, rows[owner_id][0])
+                for rank, owner_id in heapq.nsmallest(limit, ((rank, owner_id) for owner_id, rank in best.items()))
+            ]
+
+    def update(self, ids):
+        with self._lock:
+            expected = self._version
+            version = bump_version(self.namespace)
+            if self._version is None or expected is None or version != expected + 1:
+                self._version = None  # another process changed it too: reload everything on the next search
+                return
+            for owner_id in ids:
+                self._remove(owner_id)
+            for owner_id, language_code, name, rank in self.loader(ids):
+                self._insert(owner_id, language_code, name, rank)
+            self._version = version
+
+    def invalidate(self):
+        """
+        Rebuilds the index on the next search, in this process and the others, for changes too large for update().
+        """
+        with self._lock:
+            bump_version(self.namespace)
+            self._version = None
+
+    def _refresh(self):
+        now = time.monotonic()
+        if self._version is not None and now - self._checked_at < LOCAL_CACHE_VERSION_CHECK_INTERVAL:
+            return
+        with self._lock:
+            version = get_version(self.namespace)
+            self._checked_at = now
+            if version != self._version:
+                self._build()
+                self._version = version
+
+    def _build(self):
+        keyed = defaultdict(list)
+        self._rows = defaultdict(dict)
+        with primary_reads():
+            for owner_id, language_code, name, rank in self.loader(None):
+                self._rows[language_code][owner_id] = (name, rank)
+                keyed[language_code] += [(key, (rank, owner_id)) for key in self._get_keys(name)]
+        self._keys, self._entries = {}, {}
+        for language_code, items in keyed.items():
+            items.sort()
+            self._keys[language_code] = [key for key, _ in items]
+            self._entries[language_code] = [entry for _, entry in items]
+
+    def _insert(self, owner_id, language_code, name, rank):
+        self._rows[language_code][owner_id] = (name, rank)
+        keys = self._keys.setdefault(language_code, [])
+        entries = self._entries.setdefault(language_code, [])
+        for key in self._get_keys(name):
+            position = bisect.bisect_left(keys, key)
+            keys.insert(position, key)
+            entries.insert(position, (rank, owner_id))
+
+    def _remove(self, owner_id):
+        for language_code, rows in self._rows.items():
+            if owner_id not in rows:
+                continue
+            name, rank = rows.pop(owner_id)
+            keys, entries = self._keys[language_code], self._entries[language_code]
+            for key in self._get_keys(name):
+                position = bisect.bisect_left(keys, key)
+                while entries[position][1] != owner_id:
+                    position += 1
+                del keys[position], entries[position]
+
+    @staticmethod
+    def _get_keys(name):
+        normalized = normalize(name)
+        return {normalized[match.start():] for match in WORD_START.finditer(normalized)}
+
+
+@extend_schema(
+    parameters=[
+        OpenApiParameter("q", str, OpenApiParameter.QUERY, required=True, description="Name or word prefix"),
+        OpenApiParameter("limit", int, OpenApiParameter.QUERY, required=False),
+    ]
+)
+class AutocompleteAPIView(APIView):
+    """
+    [{"id", "name"}] in the request language, answered from ``index`` without database queries.
+    """
+    index = None
+    authentication_classes = (JWTStatelessUserAuthentication,)
+    default_limit = 10
+    max_limit = 50
+
+    def get(self, request):
+        prefix = request.query_params.get("q", "").strip()
+        try:
+            limit = min(int(request.query_params.get("limit", self.default_limit)), self.max_limit)
+        except ValueError:
+            limit = self.default_limit
+        if not prefix or limit < 1:
+            return Response([])
+        return Response([
+            {"id": owner_id, "name": name}
+            for owner_id, name in self.index.search(get_language_code(), prefix, limit)
+        ])
@@ -0,0 +1,71 @@
+import csv
+import io
+import json
+
+from django.db import connections, models
+from django.dispatch import Signal
+
+from api.utils import iter_chunks
+
+COPY_BATCH_SIZE = 50_000
+COPY_NULL = "\\N"
+
+# sent with sender=model and ids=[primary keys] after rows were written around save(), e.g. by COPY;
+# receivers invalidate what their post_save receivers would have
+bulk_loaded = Signal()
+
+
+def reserve_ids(model, count, using="default"):
+    """
+    Takes ``count`` primary keys from the model's sequence, so rows written with COPY can reference each other.
+    """
+    if not count:
+        return []
+    with connections[using].cursor() as cursor:
+        cursor.execute(
+            "SELECT nextval(pg_get_serial_sequence(%s, %s)) FROM generate_series(1, %s)",
+            [model._meta.db_table, model._meta.pk.column, count],
+        )
+        return [row[0] for row in cursor.fetchall()]
+
+
+def _get_converter(field):
+    if isinstance(field, models.JSONField):
+        return json.dumps
+    if isinstance(field, models.BooleanField):
+        return lambda value: "t" if value else "f"
+    if isinstance(field, models.DateTimeField):
+        return lambda value: value.isoformat()
+    return str
+
+
+def copy_rows(model, fields, rows, using="default", batch_size=COPY_BATCH_SIZE, table=None):
+    """
+    Writes ``rows`` (tuples in ``fields`` order; names or attnames such as "vacancy_id") with COPY FROM STDIN,
+    one COPY per batch, into the model's table or ``table`` with the same columns. Bypasses save(),
+    auto_now_add and signals: callers fill every NOT NULL column and rebuild what signals maintain.
+    A text value of exactly ``\\N`` is read as NULL. Returns the row count.
+    """
+    connection = connections[using]
+    columns = [model._meta.get_field(name) for name in fields]
+    converters = [_get_converter(field) for field in columns]
+    quote_name = connection.ops.quote_name
+    column_names = ", ".join(quote_name(field.column) for field in columns)
+    sql = (
+        f"COPY {quote_name(table or model._meta.db_table)} ({column_names}) "
+        f"FROM STDIN WITH (FORMAT csv, NULL '{COPY_NULL}')"
+    )
+
+    count = 0
+    for chunk in iter_chunks(rows, batch_size):
+        buffer = io.StringIO()
+        writer = csv.writer(buffer)
+        writer.writerows(
+            [COPY_NULL if value is None else convert(value) for convert, value in zip(converters, row)]
+            for row in chunk
+        )
+        buffer.seek(0)
+        with connection.cursor() as cursor:
+            cursor.copy_expert(sql, buffer)
+        count += len(chunk)
+    return count
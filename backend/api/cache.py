@@ -0,0 +1,142 @@
+import threading
+import time
+
+from django.core.cache import cache, caches
+from django.core.cache.backends.dummy import DummyCache
+from django.core.cache.backends.locmem import LocMemCache
+from django.core.exceptions import ImproperlyConfigured
+from django.db import transaction
+from django.db.models.signals import post_save, post_delete, m2m_changed
+
+from api.bulk import bulk_loaded
+from api.metrics import count_cache
+from api.replicas import primary_reads
+from config.settings import (
+    DATABASE_REPLICAS, LOCAL_CACHE_VERSION_CHECK_INTERVAL, PROMETHEUS_MULTIPROC_DIR, WEB_CONCURRENCY
+)
+
+
+def check_shared_cache():
+    """
+    Refuses a process-local cache when several processes serve requests or replicas are configured: the versions
+    bumped, and the users pinned to the primary, in one process would go unseen by the others.
+    """
+    if not isinstance(caches["default"], (LocMemCache, DummyCache)):
+        return
+    if WEB_CONCURRENCY > 1 or PROMETHEUS_MULTIPROC_DIR or DATABASE_REPLICAS:
+        raise ImproperlyConfigured(
+            "Several worker processes or read replicas need a cache shared between processes: "
+            "set CACHE_LOCATION to a Redis URL, or CACHE_BACKEND to another shared backend."
+        )
+
+
+def _version_key(namespace):
+    return f"versions:{namespace}"
+
+
+def get_version(namespace):
+    """
+    Content version of a namespace, shared between processes through the cache framework.
+    A missing key starts from the current time, so it never goes back to a value seen before.
+    """
+    key = _version_key(namespace)
+    version = cache.get(key)
+    if version is None:
+        cache.add(key, time.time_ns(), timeout=None)
+        version = cache.get(key)
+    return version
+
+
+async def aget_versions(namespaces):
+    """
+    get_version() of several namespaces through the async cache API, in one round trip when they all exist.
+    """
+    keys = [_version_key(namespace) for namespace in namespaces]
+    versions = await cache.aget_many(keys)
+    missing = [namespace for key, namespace in zip(keys, namespaces) if key not in versions]
+    for namespace in missing:
+        await cache.aadd(_version_key(namespace), time.time_ns(), timeout=None)
+    if missing:
+        versions = await cache.aget_many(keys)
+    return [versions.get(key) for key in keys]
+
+
+def bump_version(namespace):
+    key = _version_key(namespace)
+    try:
+        return cache.incr(key)
+    except ValueError:
+        cache.add(key, time.time_ns(), timeout=None)
+        return cache.get(key)
+
+
+def bump_version_on_change(namespace, *models):
+    """
+    Bumps the namespace after every committed save or delete of the models (bulk loads included), and for m2m
+    through models after add, remove and clear. Bumping on commit keeps readers from caching pre-commit data
+    under the new version.
+    """
+    def receiver(**kwargs):
+        transaction.on_commit(lambda: bump_version(namespace))
+
+    def m2m_receiver(action, **kwargs):
+        if action.startswith("post_"):
+            transaction.on_commit(lambda: bump_version(namespace))
+
+    for model in models:
+        label = model._meta.label
+        post_save.connect(receiver, sender=model, weak=False, dispatch_uid=f"{namespace}:{label}:save")
+        post_delete.connect(receiver, sender=model, weak=False, dispatch_uid=f"{namespace}:{label}:delete")
+        bulk_loaded.connect(receiver, sender=model, weak=False, dispatch_uid=f"{namespace}:{label}:bulk")
+        m2m_changed.connect(m2m_receiver, sender=model, weak=False, dispatch_uid=f"{namespace}:{label}:m2m")
+
+
+class LocalVersionedCache:
+    """
+    Process-local copy of a small dataset, reloaded (from the primary) when the namespace version changes.
+    The shared version is checked at most once per LOCAL_CACHE_VERSION_CHECK_INTERVAL seconds.
+    """
+
+    def __init__(self, namespace, loader):
+        self.namespace = namespace
+        self.loader = loader
+        self.hits = 0
+        self.misses = 0
+        self._data = None
+        self._version = None
+        self._checked_at = 0.0
+        self._lock = threading.Lock()
+
+    def get(self):
+        now = time.monotonic()
+        if self._data is not None and now - self._checked_at < LOCAL_CACHE_VERSION_CHECK_INTERVAL:
+            self.hits += 1
+            count_cache(self.namespace, True)
+            return self._data
+
+        with self._lock:
+            version = get_version(self.namespace)
+            self._checked_at = now
+            hit = self._data is not None and version == self._version
+            if not hit:
+                self.misses += 1
+                with primary_reads():
+                    self._data = self.loader()
+                self._version = version
+            else:
+                self.hits += 1
+            count_cache(self.namespace, hit)
+            return self._data
+
+    def invalidate(self):
+        bump_version(self.namespace)
+        self.reset()
+
+    def reset(self):
+        """
+        Drops the local copy only, for writes that bump the shared version themselves.
+        """
+        self._data = None
+
+    def stats(self):
+        return {"hits": self.hits, "misses": self.misses}
@@ -0,0 +1,253 @@
+import json
+import os
+import re
+from collections import defaultdict
+
+from django.apps import apps
+from django.conf import settings
+from django.core.management.color import no_style
+from django.db import connections, transaction
+
+from api.bulk import COPY_BATCH_SIZE, bulk_loaded, copy_rows
+
+STREAM_CHUNK_SIZE = 1 << 16
+WHITESPACE = re.compile(r"\s*")
+
+
+class FixtureError(Exception):
+    pass
+
+
+def find_fixture(name):
+    """
+    Resolves a fixture file name the way loaddata does: the ``fixtures`` directory of every app, then FIXTURE_DIRS.
+    """
+    directories = [os.path.join(app_config.path, "fixtures") for app_config in apps.get_app_configs()]
+    paths = [
+        path for path in (os.path.join(directory, name) for directory in directories + list(settings.FIXTURE_DIRS))
+        if os.path.isfile(path)
+    ]
+    if not paths:
+        raise FixtureError(f"No fixture named {name!r}.")
+    if len(paths) > 1:
+        raise FixtureError(f"Fixture {name!r} found in several directories: {', '.join(paths)}.")
+    return paths[0]
+
+
+def iter_fixture_objects(file, chunk_size=STREAM_CHUNK_SIZE):
+    """
+    Yields the objects of a JSON fixture (a top-level array) one by one, reading ``chunk_size`` characters at a time.
+    """
+    decoder = json.JSONDecoder()
+    buffer, position = "", 0
+
+    def peek():
+        # the next character that is not whitespace, reading on when the buffer is used up
+        nonlocal buffer, position
+        while True:
+            position = WHITESPACE.match(buffer, position).end()
+            if position < len(buffer):
+                return buffer[position]
+            buffer, position = file.read(chunk_size), 0
+            if not buffer:
+                return ""
+
+    if peek() != "[":
+        raise FixtureError("A fixture must be a JSON array.")
+    position += 1
+    if peek() == "]":
+        return
+    while True:
+        try:
+            obj, position = decoder.raw_decode(buffer, position)
+        except json.JSONDecodeError:
+            chunk = file.read(chunk_size)
+            if not chunk:
+                raise FixtureError("Invalid or truncated fixture.")
+            buffer, position = buffer[position:] + chunk, 0
+            continue
+        yield obj
+
+        separator = peek()
+        if separator == "]":
+            return
+        if not separator:
+            raise FixtureError("Invalid or truncated fixture.")
+        if separator != ",":
+            raise FixtureError("Fixture objects must be separated by commas.")
+        position += 1
+        peek()
+
+
+def get_fields(model):
+    return [field for field in model._meta.local_concrete_fields if not field.generated]
+
+
+def sort_models(models):
+    """
+    Orders models so that every model comes after the models its foreign keys point to; cycles keep their order
+    (PostgreSQL foreign keys created by Django are deferred to commit anyway).
+    """
+    pending, ordered = list(models), []
+    while pending:
+        ready = [
+            model for model in pending
+            if not {field.related_model for field in get_fields(model) if field.is_relation} & (set(pending) - {model})
+        ]
+        ordered += ready or pending
+        pending = [model for model in pending if model not in ordered]
+    return ordered
+
+
+class FixtureLoader:
+    """
+    Streams JSON fixtures into temporary staging tables with COPY, then upserts every model in dependency order,
+    so loading the same fixtures again updates rows instead of failing. Like loaddata, objects are matched by
+    primary key, missing fields take their model defaults and given many-to-many lists replace existing ones.
+    """
+
+    def __init__(self, using="default"):
+        self.connection = connections[using]
+        self.using = using
+        self.counts = {}
+        self.links = {}  # auto-created through model -> (m2m field, ids of objects whose list was given)
+        self.staged = set()
+
+    def load(self, names):
+        with transaction.atomic(using=self.using):
+            for name in names:
+                self.stage(find_fixture(name))
+            models = sort_models(model for model in self.staged if model not in self.links)
+            loaded_ids = {}
+            for model in models:
+                self.upsert(model)
+                loaded_ids[model] = self.get_staged_ids(model)
+                self.counts[model._meta.label] = len(loaded_ids[model])
+            for through, (field, object_ids) in self.links.items():
+                self.replace_links(through, field, object_ids)
+            self.reset_sequences(models + list(self.links))
+            for model, ids in loaded_ids.items():
+                bulk_loaded.send(sender=model, ids=ids, using=self.using)
+        return dict(self.counts)
+
+    def stage(self, path):
+        batches = defaultdict(list)
+
+        def add(model, rows):
+            batches[model] += rows
+            if len(batches[model]) >= COPY_BATCH_SIZE:
+                self.copy(model, batches.pop(model))
+
+        with open(path, encoding="utf-8") as file:
+            for obj in iter_fixture_objects(file):
+                try:
+                    model = apps.get_model(obj["model"])
+                except (KeyError, LookupError, ValueError):
+                    raise FixtureError(f"{path}: unknown model {obj.get('model')!r}.")
+                add(model, [self.get_row(model, obj)])
+                for field in model._meta.local_many_to_many:
+                    if field.name in obj["fields"] and field.remote_field.through._meta.auto_created:
+                        through = field.remote_field.through
+                        self.links.setdefault(through, (field, set()))[1].add(obj["pk"])
+                        add(through, [(obj["pk"], target_id) for target_id in obj["fields"][field.name]])
+        for model, rows in batches.items():
+            self.copy(model, rows)
+
+    def get_row(self, model, obj):
+        if obj.get("pk") is None:
+            raise FixtureError(f"{obj['model']}: every object needs a primary key.")
+        row = []
+        for field in get_fields(model):
+            if field.primary_key:
+                value = obj["pk"]
+            elif field.name not in obj["fields"]:
+                value = field.get_default()
+            elif field.is_relation:
+                value = obj["fields"][field.name]
+                if isinstance(value, list):
+                    raise FixtureError(f"{obj['model']}.{field.name}: natural keys are not supported.")
+            else:
+                value = field.to_python(obj["fields"][field.name])
+            row.append(value)
+        return row
+
+    def get_staging_table(self, model):
+        return f"fixture_{model._meta.db_table}"
+
+    def get_copied_fields(self, model):
+        if model in self.links:
+            field = self.links[model][0]
+            return [
+                model._meta.get_field(name).attname for name in (field.m2m_field_name(), field.m2m_reverse_field_name())
+            ]
+        return [field.attname for field in get_fields(model)]
+
+    def copy(self, model, rows):
+        fields = self.get_copied_fields(model)
+        if model not in self.staged:
+            quote_name = self.connection.ops.quote_name
+            columns = ", ".join(quote_name(model._meta.get_field(name).column) for name in fields)
+            staging = quote_name(self.get_staging_table(model))
+            with self.connection.cursor() as cursor:
+                cursor.execute(f"DROP TABLE IF EXISTS {staging}")
+                # the column types without constraints or defaults
+                cursor.execute(
+                    f"CREATE TEMPORARY TABLE {staging} ON COMMIT DROP "
+                    f"AS SELECT {columns} FROM {quote_name(model._meta.db_table)} WITH NO DATA"
+                )
+            self.staged.add(model)
+        copy_rows(model, fields, rows, using=self.using, table=self.get_staging_table(model))
+
+    def upsert(self, model):
+        quote_name = self.connection.ops.quote_name
+        pk = quote_name(model._meta.pk.column)
+        columns = [quote_name(field.column) for field in get_fields(model)]
+        updates = ", ".join(f"{column} = EXCLUDED.{column}" for column in columns if column != pk)
+        # an object listed twice keeps its last version, as with loaddata
+        sql = (
+            f"INSERT INTO {quote_name(model._meta.db_table)} ({', '.join(columns)}) "
+            f"SELECT DISTINCT ON ({pk}) {', '.join(columns)} FROM {quote_name(self.get_staging_table(model))} "
+            f"ORDER BY {pk}, ctid DESC "
+            f"ON CONFLICT ({pk}) " + (f"DO UPDATE SET {updates}" if updates else "DO NOTHING")
+        )
+        with self.connection.cursor() as cursor:
+            cursor.execute(sql)
+
+    def replace_links(self, through, field, object_ids):
+        quote_name = self.connection.ops.quote_name
+        source = quote_name(through._meta.get_field(field.m2m_field_name()).column)
+        target = quote_name(through._meta.get_field(field.m2m_reverse_field_name()).column)
+        table = quote_name(through._meta.db_table)
+        with self.connection.cursor() as cursor:
+            cursor.execute(f"DELETE FROM {table} WHERE {source} = ANY(%s)", [list(object_ids)])
+            cursor.execute(
+                f"INSERT INTO {table} ({source}, {target}) "
+                f"SELECT DISTINCT {source}, {target} FROM {quote_name(self.get_staging_table(through))}"
+            )
+            self.counts[through._meta.label] = cursor.rowcount
+
+    def reset_sequences(self, models):
+        with self.connection.cursor() as cursor:
+            for sql in self.connection.ops.sequence_reset_sql(no_style(), models):
+                cursor.execute(sql)
+
+    def get_staged_ids(self, model):
+        quote_name = self.connection.ops.quote_name
+        with self.connection.cursor() as cursor:
+            cursor.execute(
+                f"SELECT DISTINCT {quote_name(model._meta.pk.column)} "
+                f"FROM {quote_name(self.get_staging_table(model))}"
+            )
+            return [row[0] for row in cursor.fetchall()]
+
+
+def load_fixtures(names, using="default"):
+    """
+    Loads JSON fixtures through COPY, or through loaddata on databases other than PostgreSQL.
+    Returns {model label: objects loaded}.
+    """
+    if connections[using].vendor != "postgresql":
+        from django.core.management import call_command
+        call_command("loaddata", *names, database=using, verbosity=0)
+        return {}
+    return FixtureLoader(using).load(names)
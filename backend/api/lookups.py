@@ -0,0 +1,85 @@
+import time
+from collections import Counter
+from contextvars import ContextVar
+
+from django.db import transaction
+from django.db.models.signals import post_save, post_delete
+
+from api.bulk import bulk_loaded
+from api.cache import LocalVersionedCache
+from config.settings import LOCAL_CACHE_VERSION_CHECK_INTERVAL
+
+# namespace -> lookups answered from memory in the current request, each one a query or join avoided;
+# set by the middleware
+saved_queries = ContextVar("saved_queries", default=None)
+
+
+def start_counting_saved_queries():
+    counter = Counter()
+    saved_queries.set(counter)
+    return counter
+
+
+class LookupTable:
+    """
+    A small, rarely written table (statuses, types, roles) kept in process memory and looked up by pk or slug.
+    It is reloaded after the namespace version is bumped by bump_version_on_change, and on a miss, for rows added
+    before the version check caught up (at most once per LOCAL_CACHE_VERSION_CHECK_INTERVAL, so unknown keys from
+    request data do not query on every request). The instances are shared between requests, so treat them as
+    read-only.
+    """
+
+    def __init__(self, model, namespace, slug_field="name"):
+        self.model = model
+        self.namespace = namespace
+        self.slug_field = slug_field
+        self._cache = LocalVersionedCache(namespace, self._load)
+        self._reloaded_at = float("-inf")
+        # other processes follow the version bumped by bump_version_on_change; this one reloads right away
+        post_save.connect(self._changed, sender=model, weak=False, dispatch_uid=f"lookups:{namespace}:save")
+        post_delete.connect(self._changed, sender=model, weak=False, dispatch_uid=f"lookups:{namespace}:delete")
+        bulk_loaded.connect(self._changed, sender=model, weak=False, dispatch_uid=f"lookups:{namespace}:bulk")
+
+    def __deepcopy__(self, memo):  # serializer fields deep-copy their arguments; the table stays shared
+        return self
+
+    def _changed(self, **kwargs):
+        transaction.on_commit(self._cache.reset)
+
+    def _load(self):
+        rows = list(self.model.objects.all())
+        return {row.pk: row for row in rows}, {getattr(row, self.slug_field): row for row in rows}
+
+    def _lookup(self, index, key):
+        misses = self._cache.misses
+        data = self._cache.get()
+        counter = saved_queries.get()
+        if counter is not None and self._cache.misses == misses:  # a reload is a query, not a saved one
+            counter[self.namespace] += 1
+        try:
+            return data[index][key]
+        except TypeError:  # an unhashable key from request data
+            raise self.model.DoesNotExist(f"{self.model.__name__} matching {key!r} does not exist.")
+        except KeyError:
+            pass
+        now = time.monotonic()
+        if self._cache.misses == misses and now - self._reloaded_at >= LOCAL_CACHE_VERSION_CHECK_INTERVAL:
+            self._reloaded_at = now
+            self._cache.reset()
+            data = self._cache.get()
+        try:
+            return data[index][key]
+        except KeyError:
+            raise self.model.DoesNotExist(f"{self.model.__name__} matching {key!r} does not exist.")
+
+    def get(self, pk):
+        return self._lookup(0, pk)
+
+    def get_by_slug(self, slug):
+        return self._lookup(1, slug)
+
+    def all(self):
+        return list(self._cache.get()[0].values())
+
+    def stats(self):
+        return self._cache.stats()
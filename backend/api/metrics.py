@@ -0,0 +1,81 @@
+import time
+
+from django.http import HttpResponse, Http404
+from prometheus_client import CollectorRegistry, Counter, Histogram, REGISTRY, generate_latest, multiprocess
+from prometheus_client import CONTENT_TYPE_LATEST
+
+from config.settings import METRICS_ALLOWED_IPS, PROMETHEUS_MULTIPROC_DIR
+
+# With PROMETHEUS_MULTIPROC_DIR set (before the first import of prometheus_client), every worker process writes
+# its samples to files in that shared directory and the endpoint merges them, whichever worker answers.
+
+REQUEST_DURATION = Histogram(
+    "http_request_duration_seconds", "Request wall time by URL name and method", ["route", "method"],
+    buckets=(0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10),
+)
+REQUEST_DB_DURATION = Histogram(
+    "http_request_db_duration_seconds", "Time spent in database queries per request", ["route", "method"],
+    buckets=(0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5),
+)
+REQUEST_QUERIES = Histogram(
+    "http_request_db_queries", "Database queries per request", ["route", "method"],
+    buckets=(0, 1, 2, 3, 5, 8, 13, 21, 34, 55, 89),
+)
+CACHE_REQUESTS = Counter(
+    "cache_requests_total", "Cache lookups by cache and result (hit or miss)", ["cache", "result"],
+)
+S3_DURATION = Histogram(
+    "s3_request_duration_seconds", "S3 API calls and URL presigning by operation", ["operation"],
+    buckets=(0.0005, 0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5),
+)
+
+
+def observe_request(record):
+    """
+    Takes the record of config.utils.PerformanceMiddleware; unresolved URLs share one label.
+    """
+    labels = (record["route"] or "unmatched", record["method"])
+    REQUEST_DURATION.labels(*labels).observe(record["wall_ms"] / 1000)
+    REQUEST_DB_DURATION.labels(*labels).observe(record["db_ms"] / 1000)
+    REQUEST_QUERIES.labels(*labels).observe(record["queries"])
+
+
+def count_cache(cache_name, hit):
+    CACHE_REQUESTS.labels(cache_name, "hit" if hit else "miss").inc()
+
+
+def instrument_s3_client(client):
+    """
+    Times every API call of a boto3 S3 client, labeled with the operation name (PutObject, DeleteObject...).
+    """
+    if getattr(client, "_metrics_instrumented", False):
+        return client
+
+    def before_call(context, **kwargs):
+        context["metrics_started_at"] = time.perf_counter()
+
+    def after_call(model, context, **kwargs):
+        if "metrics_started_at" in context:
+            S3_DURATION.labels(model.name).observe(time.perf_counter() - context["metrics_started_at"])
+
+    client.meta.events.register("before-call.s3", before_call)
+    client.meta.events.register("after-call.s3", after_call)
+    client._metrics_instrumented = True
+    return client
+
+
+def get_registry():
+    if not PROMETHEUS_MULTIPROC_DIR:
+        return REGISTRY
+    registry = CollectorRegistry()
+    multiprocess.MultiProcessCollector(registry)
+    return registry
+
+
+def metrics_view(request):
+    """
+    Prometheus text exposition, only for METRICS_ALLOWED_IPS; others get a 404.
+    """
+    if request.META.get("REMOTE_ADDR") not in METRICS_ALLOWED_IPS:
+        raise Http404
+    return HttpResponse(generate_latest(get_registry()), content_type=CONTENT_TYPE_LATEST)
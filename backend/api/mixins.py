@@ -0,0 +1,140 @@
+import hashlib
+
+from django.core.cache import cache
+from django.utils.cache import patch_cache_control
+from django.utils.http import parse_etags, quote_etag
+from rest_framework import status
+from rest_framework.response import Response
+from rest_framework_simplejwt.authentication import JWTStatelessUserAuthentication
+
+from api.cache import get_version
+from api.metrics import count_cache
+from api.replicas import primary_reads, read_from_replica
+from api.utils import get_language_code
+from config.settings import RESPONSE_CACHE_TIMEOUT, DICTIONARY_CACHE_MAX_AGE, REPLICA_CACHE_TIMEOUT
+
+
+class CachedResponseMixin:
+    """
+    Caches the data of list and retrieve responses per language and URL, in Django's cache framework.
+    The key carries the versions of ``cache_namespaces``, so a write bumping any of them invalidates it.
+    ``user_fields`` are left out of the shared copy and filled in by ``add_user_fields()`` on every response.
+    """
+    cache_namespaces = ()
+    cache_timeout = RESPONSE_CACHE_TIMEOUT
+    user_fields = ()
+
+    def list(self, request, *args, **kwargs):
+        return self.get_cached_response(super().list, request, *args, **kwargs)
+
+    def retrieve(self, request, *args, **kwargs):
+        return self.get_cached_response(super().retrieve, request, *args, **kwargs)
+
+    def get_cache_key(self, request, versions=None):
+        # versions are read before rendering, so a page rendered during a write is stored under the old key
+        if versions is None:
+            versions = [get_version(namespace) for namespace in self.cache_namespaces]
+        url = hashlib.md5(request.build_absolute_uri().encode()).hexdigest()
+        return f"responses:{self.__class__.__name__}:{':'.join(map(str, versions))}:{get_language_code()}:{url}"
+
+    def get_cached_response(self, handler, request, *args, **kwargs):
+        key = self.get_cache_key(request)
+        data = cache.get(key)
+        count_cache("responses", data is not None)
+        if data is None:
+            response = handler(request, *args, **kwargs)
+            if response.status_code != 200:
+                return response
+            data = self.get_shared_data(response.data)
+            cache.set(key, data, self.get_cache_timeout())
+        return Response(self.get_user_data(data))
+
+    def get_cache_timeout(self):
+        # a replica may not have replayed the write that bumped the versions of the key yet
+        return min(self.cache_timeout, REPLICA_CACHE_TIMEOUT) if read_from_replica() else self.cache_timeout
+
+    def get_shared_data(self, data):
+        """
+        The copy of the response data that is cached: without ``user_fields``.
+        """
+        return self.map_objects(data, lambda obj: {
+            field: value for field, value in obj.items() if field not in self.user_fields
+        })
+
+    def get_user_data(self, data):
+        """
+        A copy of the cached data, with ``user_fields`` filled in for the request's user.
+        """
+        objects = []
+
+        def copy(obj):
+            objects.append(dict(obj))
+            return objects[-1]
+
+        data = self.map_objects(data, copy)
+        if self.user_fields:
+            self.add_user_fields(objects)
+        return data
+
+    @staticmethod
+    def map_objects(data, func):
+        if isinstance(data, list):
+            return [func(obj) for obj in data]
+        if isinstance(data.get("results"), list):
+            return {**data, "results": [func(obj) for obj in data["results"]]}
+        return func(data)
+
+    def add_user_fields(self, objects):
+        pass
+
+
+class ConditionalListMixin:
+    """
+    Strong ETag for list responses, derived from the versions of ``etag_namespaces``, the language, the URL and the
+    content coding of the body, so identity, gzip and br representations never share one.
+    A matching If-None-Match is answered with 304 before the queryset is touched; the token is checked without
+    loading the user, so a revalidation does not query the database at all.
+    """
+    etag_namespaces = ()
+    authentication_classes = (JWTStatelessUserAuthentication,)
+    cache_control = {"public": True, "max_age": DICTIONARY_CACHE_MAX_AGE}
+
+    def get_etag(self, request, versions=None):
+        if versions is None:
+            versions = [get_version(namespace) for namespace in self.etag_namespaces]
+        versions = ":".join(map(str, versions))
+        key = f"{self.__class__.__name__}:{versions}:{get_language_code()}:{request.get_full_path()}"
+        etag = hashlib.md5(key.encode()).hexdigest()
+        coding = self.get_content_coding(request)
+        return quote_etag(etag if coding == "identity" else f"{etag}-{coding}")
+
+    def get_content_coding(self, request):
+        """
+        The Content-Encoding the response body will have; known before the body is built.
+        """
+        return "identity"
+
+    def list(self, request, *args, **kwargs):
+        return self.get_conditional_response(request, super().list, *args, **kwargs)
+
+    def get_conditional_response(self, request, handler, *args, **kwargs):
+        etag = self.get_etag(request)
+        if self.is_not_modified(request, etag):
+            response = Response(status=status.HTTP_304_NOT_MODIFIED)
+        else:
+            with primary_reads():  # clients keep the body as long as the ETag matches
+                response = handler(request, *args, **kwargs)
+        return self.add_conditional_headers(response, etag)
+
+    @staticmethod
+    def is_not_modified(request, etag):
+        # weak comparison, as If-None-Match requires
+        if_none_match = {tag.removeprefix("W/") for tag in parse_etags(request.headers.get("If-None-Match", ""))}
+        not_modified = etag in if_none_match or "*" in if_none_match
+        count_cache("etags", not_modified)
+        return not_modified
+
+    def add_conditional_headers(self, response, etag):
+        response["ETag"] = etag
+        patch_cache_control(response, **self.cache_control)
+        return response
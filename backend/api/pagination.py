@@ -1,9 +1,23 @@
-from rest_framework.pagination import PageNumberPagination
+import base64
+import binascii
+import datetime
+import json
+from operator import attrgetter
+
+from django.core.exceptions import FieldDoesNotExist, ValidationError as DjangoValidationError
+from django.core.serializers.json import DjangoJSONEncoder
+from django.db import connections
+from django.db.models import Q
+from rest_framework.exceptions import NotFound
+from rest_framework.pagination import PageNumberPagination, BasePagination, _positive_int
 from rest_framework.response import Response
+from rest_framework.utils.urls import replace_query_param
 
 
 class DefaultPageNumberPagination(PageNumberPagination):
     page_size = 15
+    page_size_query_param = "page_size"
+    max_page_size = 100
 
     def get_paginated_response(self, data):
         return Response({
@@ -12,4 +26,250 @@ class DefaultPageNumberPagination(PageNumberPagination):
             'next': self.get_next_link(),
             'previous': self.get_previous_link(),
             'results': data,
-        })
\ No newline at end of file
+        })
+
+
+class CursorEncoder(DjangoJSONEncoder):
+    def default(self, o):
+        # DjangoJSONEncoder truncates to milliseconds, which would skip rows sharing a millisecond
+        if isinstance(o, datetime.datetime):
+            return o.isoformat()
+        return super().default(o)
+
+
+def estimate_count(queryset):
+    """
+    Row estimate from the planner, for lists where an exact COUNT(*) costs as much as the page.
+    """
+    connection = connections[queryset.db]
+    if connection.vendor != "postgresql":
+        return queryset.count()
+
+    sql, params = queryset.order_by().query.sql_with_params()
+    with connection.cursor() as cursor:
+        cursor.execute(f"EXPLAIN (FORMAT JSON) {sql}", params)
+        plan = cursor.fetchone()[0]
+    if isinstance(plan, str):
+        plan = json.loads(plan)
+    return plan[0]["Plan"]["Plan Rows"]
+
+
+class KeysetPagination(BasePagination):
+    """
+    Cursor pagination keyed on the queryset's own ordering plus ``id`` as a tie-breaker,
+    e.g. ``(created_at, id)`` or ``(match_score, id)``. No OFFSET, and no COUNT(*) unless asked for
+    with ``?count=exact`` or ``?count=approximate``.
+    """
+    page_size = 15
+    page_size_query_param = "page_size"
+    max_page_size = 100
+    cursor_query_param = "cursor"
+    count_query_param = "count"
+    invalid_cursor_message = "Invalid cursor"
+
+    def paginate_queryset(self, queryset, request, view=None):
+        page_queryset = self.get_page_queryset(queryset, request)
+        self.count = self.get_count(queryset, request)
+        return self.set_page(list(page_queryset))
+
+    def get_page_queryset(self, queryset, request):
+        """
+        The rows after the cursor position, plus one telling whether there is a further page.
+        """
+        self.model = queryset.model
+        self.base_url = request.build_absolute_uri()
+        self.ordering = self.get_ordering(queryset)
+        self.page_size = self.get_page_size(request)
+
+        self.position, self.reverse = self.decode_cursor(request)
+        ordering = self.reverse_ordering(self.ordering) if self.reverse else self.ordering
+        queryset = queryset.order_by(*ordering)
+        if self.position is not None:
+            queryset = queryset.filter(self.get_position_filter(ordering, self.position))
+        return queryset[:self.page_size + 1]
+
+    def set_page(self, results):
+        has_more = len(results) > self.page_size
+        results = results[:self.page_size]
+        if self.reverse:
+            results.reverse()
+
+        self.has_next = has_more if not self.reverse else True
+        self.has_previous = has_more if self.reverse else self.position is not None
+        self.page = results
+        return results
+
+    def get_paginated_response(self, data):
+        return Response({
+            "count": self.count,
+            "next": self.get_next_link(),
+            "previous": self.get_previous_link(),
+            "results": data,
+        })
+
+    def get_paginated_response_schema(self, schema):
+        return {
+            "type": "object",
+            "required": ["results"],
+            "properties": {
+                "count": {"type": "integer", "nullable": True},
+                "next": {"type": "string", "nullable": True, "format": "uri"},
+                "previous": {"type": "string", "nullable": True, "format": "uri"},
+                "results": schema,
+            },
+        }
+
+    def get_schema_operation_parameters(self, view):
+        return [
+            {
+                "name": self.cursor_query_param,
+                "required": False,
+                "in": "query",
+                "description": "The pagination cursor value.",
+                "schema": {"type": "string"},
+            },
+            {
+                "name": self.page_size_query_param,
+                "required": False,
+                "in": "query",
+                "description": "Number of results to return per page.",
+                "schema": {"type": "integer"},
+            },
+            {
+                "name": self.count_query_param,
+                "required": False,
+                "in": "query",
+                "description": "Include the total count: exact or approximate.",
+                "schema": {"type": "string", "enum": ["exact", "approximate"]},
+            },
+        ]
+
+    @staticmethod
+    def get_ordering(queryset):
+        ordering = list(queryset.query.order_by or queryset.model._meta.ordering)
+        if not all(isinstance(field, str) for field in ordering):
+            raise ValueError("Keyset pagination requires an ordering made of field or annotation names.")
+        if not any(field.lstrip("-") in ("id", "pk") for field in ordering):
+            ordering.append("-id" if ordering and ordering[-1].startswith("-") else "id")
+        return tuple(ordering)
+
+    @staticmethod
+    def reverse_ordering(ordering):
+        return tuple(field[1:] if field.startswith("-") else f"-{field}" for field in ordering)
+
+    @staticmethod
+    def get_position_filter(ordering, position):
+        position_filter = Q()
+        for index, field in enumerate(ordering):
+            name = field.lstrip("-")
+            lookup = "lt" if field.startswith("-") else "gt"
+            condition = Q(**{f"{name}__{lookup}": position[index]})
+            for previous_field, value in zip(ordering[:index], position):
+                condition &= Q(**{previous_field.lstrip("-"): value})
+            position_filter |= condition
+        return position_filter
+
+    def get_page_size(self, request):
+        try:
+            return _positive_int(request.query_params[self.page_size_query_param], strict=True,
+                                 cutoff=self.max_page_size)
+        except (KeyError, ValueError):
+            return self.page_size
+
+    def get_count(self, queryset, request):
+        mode = request.query_params.get(self.count_query_param)
+        if mode == "exact":
+            return queryset.count()
+        if mode == "approximate":
+            return estimate_count(queryset)
+        return None
+
+    def get_position(self, instance):
+        return [attrgetter(field.lstrip("-").replace("__", "."))(instance) for field in self.ordering]
+
+    def get_next_link(self):
+        if not self.has_next or not self.page:
+            return None
+        return self.encode_cursor(self.get_position(self.page[-1]), reverse=False)
+
+    def get_previous_link(self):
+        if not self.has_previous or not self.page:
+            return None
+        return self.encode_cursor(self.get_position(self.page[0]), reverse=True)
+
+    def encode_cursor(self, position, reverse):
+        data = json.dumps({"p": position, "r": int(reverse)}, cls=CursorEncoder)
+        cursor = base64.urlsafe_b64encode(data.encode()).decode()
+        return replace_query_param(self.base_url, self.cursor_query_param, cursor)
+
+    def decode_cursor(self, request):
+        encoded = request.query_params.get(self.cursor_query_param)
+        if not encoded:
+            return None, False
+
+        try:
+            data = json.loads(base64.urlsafe_b64decode(encoded.encode()).decode())
+            position, reverse = data["p"], bool(data["r"])
+            if len(position) != len(self.ordering):
+                raise ValueError
+            return [self.to_python(field, value) for field, value in zip(self.ordering, position)], reverse
+        except (binascii.Error, UnicodeDecodeError, ValueError, KeyError, TypeError, DjangoValidationError):
+            raise NotFound(self.invalid_cursor_message)
+
+    def to_python(self, field, value):
+        try:
+            model_field = self.model._meta.get_field(field.lstrip("-"))
+        except FieldDoesNotExist:
+            return value
+        return model_field.to_python(value)
+
+
+class SwitchablePagination(BasePagination):
+    """
+    Page-number or keyset pagination, selected per request with ``?pagination=page|cursor``.
+    Views pick the default with ``default_mode``; ``None`` leaves the list unpaginated unless asked.
+    An unknown mode is answered with 404, like an invalid page or cursor, rather than disabling pagination.
+    """
+    mode_query_param = "pagination"
+    default_mode = "page"
+    invalid_mode_message = "Invalid pagination mode"
+    paginator_classes = {
+        "page": DefaultPageNumberPagination,
+        "cursor": KeysetPagination,
+    }
+
+    def paginate_queryset(self, queryset, request, view=None):
+        self.paginator = self.get_paginator(request)
+        if self.paginator is None:
+            return None
+        return self.paginator.paginate_queryset(queryset, request, view)
+
+    def get_paginator(self, request):
+        mode = request.query_params.get(self.mode_query_param, self.default_mode)
+        if mode is None:
+            return None
+        if mode not in self.paginator_classes:
+            raise NotFound(self.invalid_mode_message)
+        return self.paginator_classes[mode]()
+
+    def get_paginated_response(self, data):
+        return self.paginator.get_paginated_response(data)
+
+    def get_paginated_response_schema(self, schema):
+        return self.paginator_classes[self.default_mode or "cursor"]().get_paginated_response_schema(schema)
+
+    def get_schema_operation_parameters(self, view):
+        parameters = [{
+            "name": self.mode_query_param,
+            "required": False,
+            "in": "query",
+            "description": "Pagination mode.",
+            "schema": {"type": "string", "enum": list(self.paginator_classes)},
+        }]
+        for paginator_class in self.paginator_classes.values():
+            parameters += paginator_class().get_schema_operation_parameters(view)
+        return parameters
+
+
+class OptionalPagination(SwitchablePagination):
+    default_mode = None
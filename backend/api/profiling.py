@@ -0,0 +1,109 @@
+import hashlib
+import re
+import time
+from collections import Counter, defaultdict
+from contextlib import contextmanager
+from contextvars import ContextVar
+
+from rest_framework.renderers import JSONRenderer
+
+# the profile of the request being handled; set by config.utils.PerformanceMiddleware
+current_profile = ContextVar("current_profile", default=None)
+
+IN_LIST = re.compile(r"\((?:\s*%s\s*,)+\s*%s\s*\)")
+VALUES_LIST = re.compile(r"(\((?:\s*%s\s*,?)+\))(?:\s*,\s*\1)+")
+LITERAL = re.compile(r"'(?:[^']|'')*'|\b\d+(?:\.\d+)?\b")
+
+
+def get_fingerprint(sql):
+    """
+    The query shape: literals and the length of IN and VALUES lists are ignored, so a query repeated per row
+    of a page (N+1) has one fingerprint whatever its parameters.
+    """
+    sql = LITERAL.sub("?", sql)
+    sql = VALUES_LIST.sub(r"\1, ...", sql)
+    return IN_LIST.sub("(...)", sql)
+
+
+class RequestProfile:
+    def __init__(self):
+        self.started_at = time.perf_counter()
+        self.queries = 0
+        self.db_seconds = 0.0
+        self.fingerprints = Counter()
+        self.examples = {}
+        self.timings = defaultdict(float)
+
+    def __call__(self, execute, sql, params, many, context):
+        """
+        connection.execute_wrapper hook: times every query and counts its fingerprint.
+        """
+        start = time.perf_counter()
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            self.db_seconds += time.perf_counter() - start
+            self.queries += 1
+            fingerprint = get_fingerprint(sql)
+            self.fingerprints[fingerprint] += 1
+            self.examples.setdefault(fingerprint, sql)
+
+    def get_duplicates(self, limit=5):
+        """
+        The most repeated query shapes: [{"fingerprint", "count", "sql"}], most frequent first.
+        """
+        return [
+            {
+                "fingerprint": hashlib.md5(fingerprint.encode()).hexdigest()[:12],
+                "count": count,
+                "sql": self.examples[fingerprint][:300],
+            }
+            for fingerprint, count in self.fingerprints.most_common(limit) if count > 1
+        ]
+
+    def get_duplicate_count(self):
+        return sum(count - 1 for count in self.fingerprints.values())
+
+    def get_elapsed(self):
+        return time.perf_counter() - self.started_at
+
+
+def profile_query(execute, sql, params, many, context):
+    """
+    execute_wrapper of every connection: passes the query to the current request's profile, if any. Installed per
+    connection rather than per request, since async views run their queries in threads with connections of their own.
+    """
+    profile = current_profile.get()
+    if profile is None:
+        return execute(sql, params, many, context)
+    return profile(execute, sql, params, many, context)
+
+
+def install_query_profiler(connection, **kwargs):
+    """
+    connection_created receiver; a connection object keeps its wrappers across reconnects.
+    """
+    if profile_query not in connection.execute_wrappers:
+        connection.execute_wrappers.append(profile_query)
+
+
+@contextmanager
+def track(name):
+    """
+    Adds the time spent in the block to the current request's ``name`` timing; a no-op outside a request.
+    """
+    profile = current_profile.get()
+    if profile is None:
+        yield
+        return
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        profile.timings[name] += time.perf_counter() - start
+
+
+class ProfiledJSONRenderer(JSONRenderer):
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        with track("render"):
+            return super().render(data, accepted_media_type, renderer_context)
@@ -0,0 +1,199 @@
+import logging
+import random
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction
+from django.core.cache import cache
+from django.db import DEFAULT_DB_ALIAS, DatabaseError, connections
+from django.http import HttpResponse
+from rest_framework.exceptions import AuthenticationFailed
+from rest_framework_simplejwt.authentication import JWTStatelessUserAuthentication
+
+from config.settings import DATABASE_REPLICAS, REPLICA_PIN_SECONDS, REPLICA_RETRY_SECONDS
+
+logger = logging.getLogger(__name__)
+
+SAFE_METHODS = ("GET", "HEAD", "OPTIONS")
+
+_unavailable_until = {}  # replica alias -> time.monotonic() after which it is tried again
+
+
+class ReadRouting:
+    """
+    Routing state of one request: whether its reads may go to a replica, the replica they go to, whether it has
+    written and whether a query failed while reading from the replica.
+    """
+
+    def __init__(self, replicas_allowed):
+        self.replicas_allowed = replicas_allowed
+        self.replica = None
+        self.wrote = False
+        self.failed = False
+
+
+current_routing = ContextVar("current_routing", default=None)
+
+
+@contextmanager
+def primary_reads():
+    """
+    Sends the reads of the block to the primary, for data kept beyond the request (process-local dictionaries,
+    snapshots): a lagging replica would otherwise leave them stale until the next write.
+    """
+    routing = current_routing.get()
+    if routing is None:
+        yield
+        return
+    replicas_allowed, routing.replicas_allowed = routing.replicas_allowed, False
+    try:
+        yield
+    finally:
+        routing.replicas_allowed = replicas_allowed and not routing.wrote
+
+
+def read_from_replica():
+    """
+    Whether the current request has read from a replica.
+    """
+    routing = current_routing.get()
+    return routing is not None and routing.replica is not None
+
+
+def get_available_replica():
+    """
+    A random replica of DATABASE_REPLICAS that accepts connections, or None. The connection opened to find out is
+    the one the request then queries over; a replica that refuses it is skipped for REPLICA_RETRY_SECONDS.
+    """
+    now = time.monotonic()
+    replicas = [alias for alias in DATABASE_REPLICAS if _unavailable_until.get(alias, 0) <= now]
+    random.shuffle(replicas)
+    for alias in replicas:
+        try:
+            connections[alias].ensure_connection()
+        except DatabaseError as exc:
+            mark_unavailable(alias, exc)
+            continue
+        return alias
+    return None
+
+
+def mark_unavailable(alias, exc):
+    _unavailable_until[alias] = time.monotonic() + REPLICA_RETRY_SECONDS
+    logger.warning("Replica %s unavailable, retrying in %s s: %s", alias, REPLICA_RETRY_SECONDS, exc)
+
+
+class ReplicaRouter:
+    """
+    Sends the reads of requests that allow it (ReplicaMiddleware) to one replica per request, and everything else
+    to the primary: writes, reads after a write or inside a transaction, reads outside requests (commands,
+    on-commit jobs) and the body of streaming responses. Without an available replica, reads fall back to the
+    primary. Replicas get their schema and data through replication, so nothing is migrated on them.
+    """
+
+    def db_for_read(self, model, **hints):
+        routing = current_routing.get()
+        if routing is None or not routing.replicas_allowed or connections[DEFAULT_DB_ALIAS].in_atomic_block:
+            return DEFAULT_DB_ALIAS
+        if routing.replica is None:
+            routing.replica = get_available_replica()
+            if routing.replica is None:
+                routing.replicas_allowed = False
+                return DEFAULT_DB_ALIAS
+        return routing.replica
+
+    def db_for_write(self, model, **hints):
+        routing = current_routing.get()
+        if routing is not None:
+            routing.wrote = True
+            routing.replicas_allowed = False
+        return DEFAULT_DB_ALIAS
+
+    def allow_relation(self, obj1, obj2, **hints):
+        return True  # every database holds the same data
+
+    def allow_migrate(self, db, app_label, model_name=None, **hints):
+        return False if db in DATABASE_REPLICAS else None
+
+
+def _pin_key(user_id):
+    return f"replicas:pinned:{user_id}"
+
+
+class ReplicaMiddleware:
+    """
+    Lets the reads of safe-method requests go to replicas (ReplicaRouter), except for users pinned to the primary:
+    an unsafe-method request, or any request that writes, pins its user for REPLICA_PIN_SECONDS, so users read
+    their own writes while the replicas catch up. Users are identified by their access token, without a query.
+    A request whose view fails with a database error after reading from a replica, without having written, is
+    served again from the primary, and the replica is left out for REPLICA_RETRY_SECONDS.
+    """
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        self.async_mode = iscoroutinefunction(get_response)
+        if self.async_mode:
+            markcoroutinefunction(self)
+
+    def __call__(self, request):
+        if self.async_mode:
+            return self.__acall__(request)
+
+        user_id = self.get_user_id(request)
+        safe = request.method in SAFE_METHODS
+        routing = ReadRouting(safe and (user_id is None or cache.get(_pin_key(user_id)) is None))
+        response = self.get_routed_response(request, routing)
+        if routing.failed:
+            routing = ReadRouting(False)
+            response = self.get_routed_response(request, routing)
+
+        if user_id is not None and (routing.wrote or not safe):
+            cache.set(_pin_key(user_id), True, REPLICA_PIN_SECONDS)
+        return response
+
+    async def __acall__(self, request):
+        user_id = self.get_user_id(request)
+        safe = request.method in SAFE_METHODS
+        routing = ReadRouting(safe and (user_id is None or await cache.aget(_pin_key(user_id)) is None))
+        response = await self.aget_routed_response(request, routing)
+        if routing.failed:
+            routing = ReadRouting(False)
+            response = await self.aget_routed_response(request, routing)
+
+        if user_id is not None and (routing.wrote or not safe):
+            await cache.aset(_pin_key(user_id), True, REPLICA_PIN_SECONDS)
+        return response
+
+    def get_routed_response(self, request, routing):
+        token = current_routing.set(routing)
+        try:
+            return self.get_response(request)
+        finally:
+            current_routing.reset(token)
+
+    async def aget_routed_response(self, request, routing):
+        token = current_routing.set(routing)
+        try:
+            return await self.get_response(request)
+        finally:
+            current_routing.reset(token)
+
+    def process_exception(self, request, exception):
+        routing = current_routing.get()
+        if not isinstance(exception, DatabaseError) or routing is None or routing.replica is None or routing.wrote:
+            return None
+        routing.failed = True
+        mark_unavailable(routing.replica, exception)
+        # answers in place of the error, which is neither logged nor sent: __call__ serves the request again
+        return HttpResponse(status=503)
+
+    @staticmethod
+    def get_user_id(request):
+        try:
+            authenticated = JWTStatelessUserAuthentication().authenticate(request)
+        except AuthenticationFailed:
+            return None  # the view answers 401
+        return authenticated[0].id if authenticated else None
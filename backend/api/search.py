@@ -0,0 +1,51 @@
+from django.contrib.postgres.search import TrigramWordSimilarity
+from django.db.models import F, Q, OuterRef, Subquery, FloatField, Value
+from django.db.models.functions import Coalesce
+from django.db.models.lookups import IContains
+
+from config.settings import TRIGRAM_SEARCH
+
+
+class ILikeContains(IContains):
+    """
+    icontains as ``column ILIKE %pattern%``, which the gin_trgm_ops indexes on the bare column serve; Django's
+    ``UPPER(column) LIKE UPPER(pattern)`` would need an index on the expression.
+    """
+    lookup_name = "ilike_contains"
+
+    def as_sql(self, compiler, connection):
+        lhs_sql, params = self.process_lhs(compiler, connection)
+        rhs_sql, rhs_params = self.process_rhs(compiler, connection)
+        return f"{lhs_sql} ILIKE {rhs_sql}", (*params, *rhs_params)
+
+
+def get_name_filter(search):
+    """
+    Substring or fuzzy word match on a translation name; both are served by the gin_trgm_ops indexes.
+    """
+    name_filter = Q(ILikeContains(F("name"), search))
+    if TRIGRAM_SEARCH:
+        name_filter |= Q(name__trigram_word_similar=search)
+    return name_filter
+
+
+def get_matching_ids(translation_model, owner_field, search):
+    """
+    Subquery of the ids whose translation (in any language) matches, for ``id__in`` filters without joins.
+    """
+    return translation_model.objects.filter(get_name_filter(search)).values(owner_field)
+
+
+def get_similarity(translation_model, search, **outer_filters):
+    """
+    Best word similarity of the search among the translations selected by ``outer_filters`` (using OuterRef),
+    0 without pg_trgm.
+    """
+    if not TRIGRAM_SEARCH:
+        return Value(0.0, output_field=FloatField())
+    return Coalesce(Subquery(
+        translation_model.objects.filter(**outer_filters)
+        .annotate(similarity=TrigramWordSimilarity(search, "name"))
+        .order_by("-similarity")
+        .values("similarity")[:1]
+    ), 0.0, output_field=FloatField())
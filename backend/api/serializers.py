@@ -1,10 +1,41 @@
+from django.utils.encoding import smart_str
 from rest_framework import serializers
 
+from api.translations import translation_cache
+from api.utils import get_language_code
+
 
 class NameTranslationSerializer(serializers.ModelSerializer):
     name = serializers.SerializerMethodField()
 
     def get_name(self, obj):
-        for translation in obj.translations.all():  # Makes prefetch working, lol
-            return translation.name
-        return None
+        return translation_cache.get_name(type(obj), obj.pk, get_language_code())
+
+
+class LookupSlugRelatedField(serializers.SlugRelatedField):
+    """
+    SlugRelatedField over a LookupTable: validating a slug and rendering the related row take no queries.
+    ``condition`` limits the accepted rows, e.g. to visible roles.
+    """
+
+    def __init__(self, lookup, condition=None, **kwargs):
+        self.lookup = lookup
+        self.condition = condition
+        if not kwargs.get("read_only"):
+            kwargs.setdefault("queryset", lookup.model.objects.all())  # choices for the schema and browsable API
+        super().__init__(slug_field=lookup.slug_field, **kwargs)
+
+    def use_pk_only_optimization(self):
+        return True
+
+    def to_internal_value(self, data):
+        try:
+            instance = self.lookup.get_by_slug(data)
+        except self.lookup.model.DoesNotExist:
+            instance = None
+        if instance is None or (self.condition and not self.condition(instance)):
+            self.fail("does_not_exist", slug_name=self.slug_field, value=smart_str(data))
+        return instance
+
+    def to_representation(self, obj):
+        return getattr(self.lookup.get(obj.pk), self.slug_field)
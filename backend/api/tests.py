@@ -0,0 +1,194 @@
+from concurrent.futures import ThreadPoolExecutor
+from unittest import mock
+
+from django.core.cache import cache
+from django.core.exceptions import ImproperlyConfigured
+from django.conf import settings
+from django.db import OperationalError, connections
+from django.db.backends.signals import connection_created
+from django.test import AsyncClient, SimpleTestCase, TestCase, TransactionTestCase, override_settings
+from rest_framework import status
+from rest_framework.test import APIClient
+from rest_framework_simplejwt.tokens import RefreshToken
+
+from accounts.models import Role, User
+from api.cache import check_shared_cache, get_version
+from api.lookups import LookupTable
+from api.replicas import _unavailable_until
+from api.search import get_name_filter
+from api.translations import get_translations_namespace, translation_cache
+from tags.models import Tag, TagGroup, TagTranslation
+
+
+class SwitchablePaginationTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        role, _ = Role.objects.get_or_create(name="Candidate")
+        cls.user = User.objects.create_user("candidate@example.com", "password", role=role)
+
+    def setUp(self):
+        self.client = APIClient()
+        self.client.force_authenticate(self.user)
+
+    def test_unknown_mode_is_not_found(self):
+        for path in ("/api/v1/vacancies/", "/api/v1/vacancies/personalized/"):
+            with self.subTest(path=path):
+                response = self.client.get(path, {"pagination": "x"})
+                self.assertEqual(response.status_code, status.HTTP_404_NOT_FOUND)
+
+    def test_known_modes_paginate(self):
+        for path in ("/api/v1/vacancies/", "/api/v1/vacancies/personalized/"):
+            for mode in ("page", "cursor"):
+                with self.subTest(path=path, mode=mode):
+                    response = self.client.get(path, {"pagination": mode})
+                    self.assertEqual(response.status_code, status.HTTP_200_OK)
+                    self.assertIn("results", response.json())
+
+
+class SharedCacheCheckTests(SimpleTestCase):
+    local_cache = {"default": {"BACKEND": "django.core.cache.backends.locmem.LocMemCache"}}
+    shared_cache = {"default": {"BACKEND": "django.core.cache.backends.db.DatabaseCache", "LOCATION": "cache"}}
+
+    @override_settings(CACHES=local_cache)
+    def test_local_cache_serves_a_single_process(self):
+        check_shared_cache()
+
+    @override_settings(CACHES=local_cache)
+    def test_local_cache_is_refused_for_several_workers_or_replicas(self):
+        for name, value in (("WEB_CONCURRENCY", 4), ("PROMETHEUS_MULTIPROC_DIR", "/tmp/metrics"),
+                            ("DATABASE_REPLICAS", ["replica_1"])):
+            with self.subTest(name=name), mock.patch(f"api.cache.{name}", value):
+                with self.assertRaises(ImproperlyConfigured):
+                    check_shared_cache()
+
+    @override_settings(CACHES=shared_cache)
+    def test_shared_cache_serves_several_workers(self):
+        with mock.patch("api.cache.WEB_CONCURRENCY", 4):
+            check_shared_cache()
+
+
+class LookupTableTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.roles = LookupTable(Role, "tests:roles")
+        self.roles.all()
+
+    def test_miss_reloads_once(self):
+        role, = Role.objects.bulk_create([Role(name="Hiring manager")])  # no post_save: the version is not bumped
+        with self.assertNumQueries(1):
+            self.assertEqual(self.roles.get_by_slug("Hiring manager"), role)
+            self.assertEqual(self.roles.get(role.pk), role)
+
+    def test_unknown_keys_reload_at_most_once_per_interval(self):
+        with self.assertNumQueries(1):
+            for _ in range(3):
+                with self.assertRaises(Role.DoesNotExist):
+                    self.roles.get_by_slug("Unknown")
+        with self.assertNumQueries(0), self.assertRaises(Role.DoesNotExist):
+            self.roles.get(["unhashable"])
+
+
+class TranslationCacheTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.tag = Tag.objects.create(group=TagGroup.objects.create())
+        self.namespace = get_translations_namespace(Tag)
+        self.assertIsNone(translation_cache.get_name(Tag, self.tag.id, "en"))
+
+    def test_write_invalidates_on_commit(self):
+        version = get_version(self.namespace)
+        with self.captureOnCommitCallbacks(execute=True):
+            TagTranslation.objects.create(tag=self.tag, name="Python", language_code="en")
+            self.assertEqual(get_version(self.namespace), version)
+            self.assertIsNone(translation_cache.get_name(Tag, self.tag.id, "en"))
+        self.assertNotEqual(get_version(self.namespace), version)
+        self.assertEqual(translation_cache.get_name(Tag, self.tag.id, "en"), "Python")
+
+
+class NameFilterTests(SimpleTestCase):
+    def test_both_arms_compare_the_bare_column(self):
+        # gin_trgm_ops indexes serve ILIKE and %> on "name", not on UPPER("name"::text)
+        with mock.patch("api.search.TRIGRAM_SEARCH", True):
+            query = TagTranslation.objects.filter(get_name_filter("50%_py")).values("tag_id").query
+        sql, params = query.sql_with_params()
+        self.assertIn('"tags_translations"."name" ILIKE %s', sql)
+        self.assertIn('"tags_translations"."name" %%> %s', sql)
+        self.assertNotIn("UPPER", sql)
+        self.assertEqual(params[0], r"%50\%\_py%")
+
+
+@override_settings(ROOT_URLCONF="config.asgi_urls")
+class AsyncViewConnectionTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        # the database threads are swapped for one the test can close, so the test database is left unused
+        self.executor = ThreadPoolExecutor(1)
+        patcher = mock.patch("api.async_views._database_executor", self.executor)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        self.addCleanup(self.executor.shutdown)
+        self.addCleanup(lambda: self.executor.submit(connections.close_all).result())
+
+    async def test_requests_reuse_the_connection_of_their_thread(self):
+        created = []
+        connection_created.connect(lambda connection, **kwargs: created.append(connection.alias), weak=False,
+                                   dispatch_uid="tests:async_connections")
+        self.addCleanup(connection_created.disconnect, dispatch_uid="tests:async_connections")
+        client = AsyncClient()
+        for path in ("/api/v1/vacancies/", "/api/v1/vacancies/?pagination=cursor", "/api/v1/dict/countries/"):
+            response = await client.get(path)
+            self.assertEqual(response.status_code, status.HTTP_200_OK, response.content)
+        self.assertEqual(created, ["default"])
+
+
+def fail_query(execute, sql, params, many, context):
+    raise OperationalError("terminating connection due to conflict with recovery")
+
+
+@override_settings(
+    DATABASE_ROUTERS=["api.replicas.ReplicaRouter"],
+    MIDDLEWARE=[*settings.MIDDLEWARE, "api.replicas.ReplicaMiddleware"],
+)
+class ReplicaRoutingTests(TransactionTestCase):
+    """
+    replica_1 is a test database of its own: the user's first name there tells which database served the request.
+    Transactions send every read to the primary, so these tests run outside one.
+    """
+    databases = {"default", "replica_1"}
+    fixtures = ["roles.json"]
+
+    def setUp(self):
+        cache.clear()
+        patcher = mock.patch("api.replicas.DATABASE_REPLICAS", ["replica_1"])
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        self.addCleanup(_unavailable_until.clear)
+
+        self.user = User.objects.create_user("candidate@example.com", "password", role_id=1, first_name="Primary")
+        User.objects.db_manager("replica_1").create_user(
+            "candidate@example.com", "password", id=self.user.id, role_id=1, first_name="Replica"
+        )
+        self.access_token = str(RefreshToken.for_user(self.user).access_token)
+        self.client = APIClient()
+        self.client.credentials(HTTP_AUTHORIZATION=f"Bearer {self.access_token}")
+
+    def get_first_name(self):
+        response = self.client.get("/api/v1/users/me/")
+        self.assertEqual(response.status_code, status.HTTP_200_OK, response.content)
+        return response.json()["first_name"]
+
+    def test_safe_requests_read_from_the_replica(self):
+        self.assertEqual(self.get_first_name(), "Replica")
+
+    def test_unsafe_request_pins_the_user_to_the_primary(self):
+        response = self.client.post("/api/v1/auth/token/verify/", {"token": self.access_token})
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(self.get_first_name(), "Primary")
+
+    def test_failed_replica_read_is_served_from_the_primary(self):
+        with connections["replica_1"].execute_wrapper(fail_query), self.assertLogs("api.replicas", "WARNING"):
+            self.assertEqual(self.get_first_name(), "Primary")
+        # left out until REPLICA_RETRY_SECONDS have passed
+        self.assertEqual(self.get_first_name(), "Primary")
+        _unavailable_until.clear()
+        self.assertEqual(self.get_first_name(), "Replica")
@@ -0,0 +1,61 @@
+from django.db import transaction
+from django.db.models.signals import post_save, post_delete
+
+from api.bulk import bulk_loaded
+from api.cache import LocalVersionedCache
+
+
+def get_translations_namespace(model):
+    return f"translations:{model._meta.label}"
+
+
+class TranslationCache:
+    """
+    (model, id, language_code) -> name for the translated dictionaries (tags, tag groups, cities, countries).
+    Each model's translations are loaded once per process and reloaded after a write.
+    """
+
+    def __init__(self):
+        self._caches = {}
+
+    def _get_cache(self, model):
+        label = model._meta.label
+        if label not in self._caches:
+            translations = model.translations
+            translation_model = translations.rel.related_model
+            owner_field = translations.field.attname
+
+            def load():
+                return {
+                    (owner_id, language_code): name
+                    for owner_id, language_code, name in translation_model.objects.values_list(
+                        owner_field, "language_code", "name"
+                    )
+                }
+
+            self._caches[label] = LocalVersionedCache(get_translations_namespace(model), load)
+        return self._caches[label]
+
+    def get_name(self, model, pk, language_code):
+        return self._get_cache(model).get().get((pk, language_code))
+
+    def invalidate(self, model):
+        self._get_cache(model).invalidate()
+
+    def stats(self):
+        return {label: cache.stats() for label, cache in self._caches.items()}
+
+
+translation_cache = TranslationCache()
+
+
+def invalidate_translations_on_change(*models):
+    for model in models:
+        def receiver(model=model, **kwargs):
+            transaction.on_commit(lambda: translation_cache.invalidate(model))
+
+        translation_model = model.translations.rel.related_model
+        label = model._meta.label
+        post_save.connect(receiver, sender=translation_model, weak=False, dispatch_uid=f"translations:{label}:save")
+        post_delete.connect(receiver, sender=translation_model, weak=False, dispatch_uid=f"translations:{label}:delete")
+        bulk_loaded.connect(receiver, sender=translation_model, weak=False, dispatch_uid=f"translations:{label}:bulk")
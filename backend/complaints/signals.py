@@ -0,0 +1,4 @@
+from api.cache import bump_version_on_change
+from .models import ComplaintCause
+
+bump_version_on_change("complaint_causes", ComplaintCause)
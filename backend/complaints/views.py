@@ -2,19 +2,23 @@ from rest_framework import viewsets
 from rest_framework.generics import ListAPIView
 from rest_framework.permissions import IsAuthenticated
 
+from api.mixins import ConditionalListMixin
+from api.pagination import OptionalPagination
 from complaints.models import ComplaintCause, Complaint
 from complaints.serializers import ComplaintCauseSerializer, ComplaintSerializer
 
 
-class ComplaintCauseSerializerListAPIView(ListAPIView):
+class ComplaintCauseSerializerListAPIView(ConditionalListMixin, ListAPIView):
     queryset = ComplaintCause.objects.all()
     serializer_class = ComplaintCauseSerializer
+    etag_namespaces = ("complaint_causes",)
 
 
 class ComplaintModelViewSet(viewsets.ModelViewSet):
-    queryset = Complaint.objects.all()
+    queryset = Complaint.objects.prefetch_related("causes").order_by("id")
     serializer_class = ComplaintSerializer
     permission_classes = (IsAuthenticated,) # todo: enhance permissions
+    pagination_class = OptionalPagination
 
     def perform_create(self, serializer):
         serializer.save(created_by=self.request.user)
\ No newline at end of file
@@ -2,6 +2,8 @@
 ASGI config for config project.
 
 It exposes the ASGI callable as a module-level variable named ``application``.
+With ASYNC_VIEWS, requests are resolved through config.asgi_urls, which serves the hot read endpoints with async
+views; otherwise every route is served as in config.urls.
 
 For more information on this file, see
 https://docs.djangoproject.com/en/5.0/howto/deployment/asgi/
@@ -9,8 +11,21 @@ https://docs.djangoproject.com/en/5.0/howto/deployment/asgi/
 
 import os
 
-from django.core.asgi import get_asgi_application
+import django
+from django.core.handlers.asgi import ASGIHandler, ASGIRequest
+
+from config.settings import ASYNC_VIEWS
 
 os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'config.settings')
+django.setup(set_prefix=False)
+
+
+class AsyncRoutesRequest(ASGIRequest):
+    urlconf = "config.asgi_urls"
+
+
+class AsyncRoutesASGIHandler(ASGIHandler):
+    request_class = AsyncRoutesRequest
+
 
-application = get_asgi_application()
+application = AsyncRoutesASGIHandler() if ASYNC_VIEWS else ASGIHandler()
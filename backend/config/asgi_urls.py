@@ -0,0 +1,12 @@
+"""
+URL configuration of the ASGI application (config.asgi): the hot read endpoints of api.async_urls are served
+by async views, every other route as in config.urls.
+"""
+from django.urls import path, include
+
+from config.urls import urlpatterns as sync_urlpatterns
+
+urlpatterns = [
+    path('api/v1/', include('api.async_urls')),
+    *sync_urlpatterns,
+]
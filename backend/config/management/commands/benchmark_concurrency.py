@@ -0,0 +1,169 @@
+import asyncio
+import io
+import logging
+import math
+import sys
+import time
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import nullcontext
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db.backends.signals import connection_created
+from django.db.models import Count
+from django.test import override_settings
+from rest_framework_simplejwt.tokens import RefreshToken
+
+from accounts.models import User
+from config.asgi import AsyncRoutesASGIHandler
+from config.settings import ASYNC_DB_CONNECTIONS
+from config.wsgi import application as wsgi_application
+from vacancies.models import Vacancy
+
+asgi_application = AsyncRoutesASGIHandler()  # the async views, whatever ASYNC_VIEWS says
+
+def percentile(values, share):
+    values = sorted(values)
+    return values[min(len(values) - 1, math.ceil(share * len(values)) - 1)]
+
+
+class Command(BaseCommand):
+    help = ("Throughput of the endpoints with async variants (api.async_urls) under --clients concurrent clients, "
+            "served in process by the ASGI application (config.asgi) and by the WSGI application on --wsgi-threads "
+            "threads. Reads the existing data, e.g. from generate_dataset.")
+
+    def add_arguments(self, parser):
+        parser.add_argument("--clients", type=int, default=500)
+        parser.add_argument("--requests", type=int, default=1_000, help="Measured requests per endpoint and server")
+        parser.add_argument("--wsgi-threads", type=int, default=ASYNC_DB_CONNECTIONS,
+                            help="Worker threads of the WSGI server; defaults to the connections of async views")
+        parser.add_argument("--no-cache", action="store_true",
+                            help="Leave the response caches out, so every request reads the database")
+        parser.add_argument("--query-latency", type=float, default=0.0,
+                            help="Milliseconds added to every query, as the round trip to a database on another host")
+
+    def handle(self, *args, **options):
+        if options["clients"] < 1 or options["requests"] < 1 or options["wsgi_threads"] < 1:
+            raise CommandError("--clients, --requests and --wsgi-threads must be at least 1.")
+        self.query_latency = options["query_latency"] / 1000
+        user = User.objects.annotate(scores=Count("vacancy_match_scores")).order_by("-scores", "id").first()
+        vacancy = Vacancy.objects.order_by("-created_at").first()
+        if vacancy is None or user is None:
+            raise CommandError("No vacancies to read; fill the database with generate_dataset first.")
+        self.authorization = f"Bearer {RefreshToken.for_user(user).access_token}"
+
+        endpoints = [
+            ("vacancies", "/api/v1/vacancies/", ""),
+            ("vacancies search", "/api/v1/vacancies/", "search=developer&pagination=cursor"),
+            ("vacancy", f"/api/v1/vacancies/{vacancy.id}/", ""),
+            ("feed", "/api/v1/vacancies/personalized/", ""),
+            ("feed cursor", "/api/v1/vacancies/personalized/", "pagination=cursor"),
+            ("countries", "/api/v1/dict/countries/", ""),
+            ("countries search", "/api/v1/dict/countries/", "search=ky"),
+        ]
+        # every request over its thresholds would be logged
+        performance_logger = logging.getLogger("performance")
+        level = performance_logger.level
+        performance_logger.setLevel(logging.ERROR)
+        # WSGI opens a connection per request, in the thread serving it; async views reuse their threads' connections
+        connection_created.connect(self.delay_queries)
+        try:
+            dummy_cache = {"default": {"BACKEND": "django.core.cache.backends.dummy.DummyCache"}}
+            with override_settings(CACHES=dummy_cache) if options["no_cache"] else nullcontext():
+                self.run(endpoints, options["clients"], options["requests"], options["wsgi_threads"])
+        finally:
+            connection_created.disconnect(self.delay_queries)
+            performance_logger.setLevel(level)
+
+    def delay_queries(self, connection, **kwargs):
+        if self.query_latency and self.delay_query not in connection.execute_wrappers:
+            connection.execute_wrappers.append(self.delay_query)
+
+    def delay_query(self, execute, sql, params, many, context):
+        time.sleep(self.query_latency)  # releases the GIL, as waiting on a socket does
+        return execute(sql, params, many, context)
+
+    def run(self, endpoints, clients, requests, wsgi_threads):
+        self.stdout.write(f"{clients} clients, {requests} requests per endpoint, "
+                          f"{self.query_latency * 1000:g} ms added per query; WSGI on {wsgi_threads} threads, "
+                          f"ASGI with {ASYNC_DB_CONNECTIONS} database threads")
+        self.stdout.write(f"{'endpoint':18} {'server':6} {'req/s':>8} {'p50':>9} {'p95':>9} {'p99':>9}  statuses")
+        with ThreadPoolExecutor(wsgi_threads) as pool:
+            for name, path, query in endpoints:
+                throughput = {}
+                for server, call in (
+                    ("WSGI", lambda: asyncio.get_running_loop().run_in_executor(pool, self.call_wsgi, path, query)),
+                    ("ASGI", lambda: self.call_asgi(path, query)),
+                ):
+                    asyncio.run(self.run_clients(call, 1, 1))  # warms lookup tables and caches
+                    elapsed, latencies, statuses = asyncio.run(self.run_clients(call, clients, requests))
+                    throughput[server] = requests / elapsed
+                    self.stdout.write(
+                        f"{name:18} {server:6} {throughput[server]:8.0f} "
+                        + " ".join(f"{percentile(latencies, share) * 1000:6.0f} ms" for share in (0.5, 0.95, 0.99))
+                        + "  " + ", ".join(f"{status}: {count}" for status, count in sorted(statuses.items()))
+                    )
+                self.stdout.write(f"{'':18} ASGI/WSGI {throughput['ASGI'] / throughput['WSGI']:.2f}x")
+
+    @staticmethod
+    async def run_clients(call, clients, requests):
+        """
+        ``clients`` clients sending requests one after another until ``requests`` are answered.
+        Returns the elapsed seconds, the latency of every request and the count of every status.
+        """
+        remaining, latencies, statuses = requests, [], Counter()
+
+        async def client():
+            nonlocal remaining
+            while remaining > 0:
+                remaining -= 1
+                started = time.perf_counter()
+                statuses[await call()] += 1
+                latencies.append(time.perf_counter() - started)
+
+        started = time.perf_counter()
+        await asyncio.gather(*(client() for _ in range(clients)))
+        return time.perf_counter() - started, latencies, statuses
+
+    def call_wsgi(self, path, query):
+        environ = {
+            "REQUEST_METHOD": "GET", "PATH_INFO": path, "QUERY_STRING": query, "SCRIPT_NAME": "",
+            "SERVER_NAME": "localhost", "SERVER_PORT": "80", "SERVER_PROTOCOL": "HTTP/1.1", "REMOTE_ADDR": "127.0.0.1",
+            "HTTP_HOST": "localhost", "HTTP_AUTHORIZATION": self.authorization,
+            "wsgi.version": (1, 0), "wsgi.url_scheme": "http", "wsgi.input": io.BytesIO(), "wsgi.errors": sys.stderr,
+            "wsgi.multithread": True, "wsgi.multiprocess": False, "wsgi.run_once": False,
+        }
+        statuses = []
+        response = wsgi_application(environ, lambda status, headers, exc_info=None: statuses.append(status))
+        try:
+            b"".join(response)
+        finally:
+            response.close()  # sends request_finished, which closes the thread's connection
+        return int(statuses[0].split()[0])
+
+    async def call_asgi(self, path, query):
+        scope = {
+            "type": "http", "asgi": {"version": "3.0"}, "http_version": "1.1", "method": "GET", "scheme": "http",
+            "path": path, "raw_path": path.encode(), "query_string": query.encode(), "root_path": "",
+            "headers": [(b"host", b"localhost"), (b"authorization", self.authorization.encode())],
+            "client": ("127.0.0.1", 0), "server": ("localhost", 80),
+        }
+        received, answered, status = False, asyncio.Event(), None
+
+        async def receive():
+            nonlocal received
+            if not received:
+                received = True
+                return {"type": "http.request", "body": b"", "more_body": False}
+            await answered.wait()
+            return {"type": "http.disconnect"}
+
+        async def send(message):
+            nonlocal status
+            if message["type"] == "http.response.start":
+                status = message["status"]
+            elif not message.get("more_body"):
+                answered.set()
+
+        await asgi_application(scope, receive, send)
+        return status
@@ -0,0 +1,471 @@
+import io
+import json
+import logging
+import math
+import statistics
+import tempfile
+import time
+from contextlib import ExitStack, contextmanager
+from urllib.parse import urlencode
+
+from django.core.files.base import ContentFile
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.core.management import call_command
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connections, transaction
+from django.db.models import Count
+from django.test import Client, override_settings
+from django.urls import URLResolver, get_resolver, resolve, reverse
+from rest_framework_simplejwt.tokens import RefreshToken
+
+from accounts.lookups import roles
+from accounts.models import User, UserTag
+from api.profiling import RequestProfile
+from complaints.models import Complaint, ComplaintCause
+from config.settings import BASE_DIR
+from files.models import File
+from tags.models import TagGroup
+from vacancies.models import Vacancy, ApplicationNote
+from vacancies_templates.models import Answer
+
+API_PREFIX = "api/v1/"
+DOCUMENTATION_ROUTES = ("schema", "swagger-ui")
+BUDGETS_PATH = BASE_DIR / "config" / "endpoint_budgets.json"
+PASSWORD = "password"
+# budgets hold for this dataset; the history end is pinned, so every run generates the same rows
+DATASET = {
+    "companies": 20, "recruiters": 60, "candidates": 1_500, "vacancies": 400, "applications": 12_000,
+    "complaints": 50, "days": 180, "end": "2026-01-01T00:00:00", "password": PASSWORD,
+}
+LATENCY_HEADROOM = 3
+LATENCY_METRICS = ("p95_ms",)
+MIN_LATENCY_BUDGET_MS = 20
+SIZE_HEADROOM = 1.25
+
+
+class Rollback(Exception):
+    pass
+
+
+@contextmanager
+def rolled_back():
+    with transaction.atomic():
+        yield
+        transaction.set_rollback(True)
+
+
+def get_api_routes(patterns, prefix=""):
+    for pattern in patterns:
+        route = prefix + str(pattern.pattern)
+        if isinstance(pattern, URLResolver):
+            yield from get_api_routes(pattern.url_patterns, route)
+        elif route.startswith(API_PREFIX) and pattern.name not in DOCUMENTATION_ROUTES:
+            yield route
+
+
+def get_percentile(timings, percent):
+    return statistics.quantiles(timings, n=100, method="inclusive")[percent - 1] if len(timings) > 1 else timings[0]
+
+
+def count_results(content):
+    try:
+        data = json.loads(content)
+    except ValueError:
+        return None
+    if isinstance(data, dict):
+        data = data.get("results")
+    return len(data) if isinstance(data, list) else None
+
+
+class Command(BaseCommand):
+    help = ("Run every API route against a generated dataset, with S3 replaced by local file storage. "
+            "Reports latency percentiles, queries and response size, compares them with the committed budgets "
+            "and fails when a query or size budget is exceeded, a route is not covered or a list's query count "
+            "grows with its page size. Latency budgets depend on the machine, so they only fail the run with "
+            "--check-latency.")
+
+    def add_arguments(self, parser):
+        parser.add_argument("--repeat", type=int, default=20, help="Measured requests per scenario")
+        parser.add_argument("--seed", type=int, default=2022)
+        parser.add_argument("--page-sizes", type=int, nargs=2, default=[10, 50], metavar=("SMALL", "LARGE"))
+        parser.add_argument("--budgets", default=str(BUDGETS_PATH))
+        parser.add_argument("--check-latency", action="store_true",
+                            help="Fail on latency over the budgets too, instead of reporting it")
+        parser.add_argument("--update-budgets", action="store_true",
+                            help="Write the measured numbers, with headroom for latency and size, as the budgets")
+
+    def handle(self, *args, **options):
+        if options["repeat"] < 1:
+            raise CommandError("--repeat must be at least 1.")
+        self.repeat = options["repeat"]
+        self.failures = []
+        self.results = {}
+
+        # the response caches are left out, so every run measures the full request path
+        caches = {"default": {"BACKEND": "django.core.cache.backends.dummy.DummyCache"}}
+        performance_logger = logging.getLogger("performance")
+        level = performance_logger.level
+        performance_logger.setLevel(logging.ERROR)
+        try:
+            with tempfile.TemporaryDirectory() as storage_dir, override_settings(
+                # OPTIONS would be dropped while DEFAULT_FILE_STORAGE is set, so the location comes from MEDIA_ROOT
+                STORAGES={"default": {"BACKEND": "django.core.files.storage.FileSystemStorage"}},
+                MEDIA_ROOT=storage_dir,
+                CACHES=caches,
+            ):
+                with transaction.atomic():
+                    self.generate(options["seed"])
+                    scenarios = self.get_scenarios(self.get_context(options["seed"]))
+                    self.run(scenarios, options["page_sizes"])
+                    raise Rollback
+        except Rollback:
+            pass
+        finally:
+            performance_logger.setLevel(level)
+
+        if options["update_budgets"]:
+            self.write_budgets(options["budgets"])
+        else:
+            self.check_budgets(options["budgets"], options["check_latency"])
+        if self.failures:
+            raise CommandError(f"{len(self.failures)} problem(s):\n" + "\n".join(self.failures))
+        self.stdout.write(self.style.SUCCESS("Every route is covered and within its budget."))
+
+    def generate(self, seed):
+        started = time.perf_counter()
+        call_command("generate_dataset", seed=seed, stdout=io.StringIO(), **DATASET)
+        self.stdout.write(f"Dataset generated in {time.perf_counter() - started:.1f} s")
+
+    def get_context(self, seed):
+        """
+        Picks the busiest generated recruiter and candidate, and adds the rows the dataset lacks
+        (files, a photo, a complaint and its cause, a deleted vacancy).
+        """
+        suffix = f".{seed}@example.test"
+        vacancy = (
+            Vacancy.objects.filter(created_by__email__endswith=suffix)
+            .annotate(application_count=Count("applications"))
+            .order_by("-application_count", "id")
+            .select_related("created_by", "application_template")
+            .first()
+        )
+        recruiter = vacancy.created_by
+        candidate = (
+            User.objects.filter(email__endswith=suffix, role=roles.get_by_slug("CANDIDATE"))
+            .annotate(application_count=Count("applications"))
+            .order_by("-application_count", "id")
+            .first()
+        )
+        application = vacancy.applications.order_by("id").first()
+        template = vacancy.application_template
+
+        target = (
+            Vacancy.objects.filter(created_by__email__endswith=suffix)
+            .exclude(applications__created_by=candidate)
+            .exclude(application_template__questions__type__name="FILE")
+            .order_by("id")
+            .first()
+        )
+        target_answers = []
+        for question in target.application_template.questions.order_by("id"):
+            option = question.initial_answers.order_by("id").first()
+            target_answers.append({"question": question.id, "value": option.id if option else "Benchmark"})
+
+        note = ApplicationNote.objects.filter(application=application).first() or ApplicationNote.objects.create(
+            application=application, text="Benchmark note", created_by=recruiter
+        )
+        user_tag = UserTag.objects.filter(user=candidate).order_by("position").first() or UserTag.objects.create(
+            user=candidate, tag_id=TagGroup.objects.order_by("id").first().tags.order_by("id").first().id, position=1
+        )
+        deleted = Vacancy.all_objects.filter(created_by=recruiter, deleted_at__isnull=False).first()
+        if deleted is None:
+            deleted = Vacancy.objects.filter(created_by=recruiter).exclude(pk=vacancy.pk).order_by("id").first()
+            deleted.soft_delete()
+
+        file = File.objects.create(
+            file=ContentFile(b"%PDF-1.4 benchmark", name="cv.pdf"), user_filename="cv.pdf", extension="pdf",
+            type_id=1, created_by=candidate,
+        )
+        candidate.photo = File.objects.create(
+            file=ContentFile(b"\x89PNG benchmark", name="photo.png"), user_filename="photo.png", extension="png",
+            type_id=3, created_by=candidate,
+        )
+        candidate.save(update_fields=["photo"])
+        complaint = Complaint.objects.create(vacancy=vacancy, description="Benchmark", created_by=candidate)
+        cause = ComplaintCause.objects.order_by("id").first() or ComplaintCause.objects.create(
+            name="Benchmark", description="Benchmark cause"
+        )
+
+        return {
+            "recruiter": recruiter,
+            "candidate": candidate,
+            "vacancy": vacancy,
+            "application": application,
+            "own_application": candidate.applications.order_by("id").first(),
+            "template": template,
+            "question": template.questions.order_by("id").first(),
+            "answer": Answer.objects.filter(application_created=False).order_by("id").first(),
+            "target": target,
+            "target_answers": target_answers,
+            "note": note,
+            "user_tag": user_tag,
+            "deleted": deleted,
+            "file": file,
+            "complaint": complaint,
+            "cause": cause,
+            "tag_group": TagGroup.objects.order_by("id").first(),
+        }
+
+    def get_scenarios(self, context):
+        recruiter, candidate = context["recruiter"], context["candidate"]
+        vacancy, application = context["vacancy"], context["application"]
+        refresh = RefreshToken.for_user(candidate)
+        self.clients = {
+            None: Client(SERVER_NAME="localhost", raise_request_exception=False),
+            recruiter: self.get_client(recruiter),
+            candidate: self.get_client(candidate),
+        }
+
+        def scenario(method, url_name, kwargs=None, user=None, params=None, data=None, label="", status=200,
+                     paginated=False, multipart=False):
+            return {
+                "method": method,
+                "path": url_name if url_name.startswith("/") else reverse(url_name, kwargs=kwargs),
+                "user": user,
+                "params": params or {},
+                "data": data,
+                "label": label,
+                "status": status,
+                "paginated": paginated,
+                "multipart": multipart,
+            }
+
+        def upload(name, content):
+            return lambda: {"file": SimpleUploadedFile(name, content, content_type=f"image/{name.split('.')[1]}")}
+
+        vacancy_kwargs = {"pk": vacancy.pk}
+        page = {"pagination": "page"}
+        scenarios = [
+            scenario("POST", "/api/v1/auth/login/", data={"email": candidate.email, "password": PASSWORD}),
+            scenario("POST", "/api/v1/auth/token/refresh/", data={"refresh": str(refresh)}),
+            scenario("POST", "/api/v1/auth/token/verify/", data={"token": str(refresh.access_token)}),
+
+            scenario("POST", "user-create", status=201, data={
+                "email": "benchmark@example.test", "password": PASSWORD, "first_name": "Bench", "last_name": "Mark",
+                "role": "CANDIDATE",
+            }),
+            scenario("GET", "user-me", user=candidate),
+            scenario("GET", "user-me-applications", user=candidate),
+            scenario("GET", "user-me-applications", user=candidate, params=page, label="page", paginated=True),
+            scenario("GET", "user-me-vacancies", user=recruiter),
+            scenario("GET", "vacancy-recruiter", vacancy_kwargs, user=recruiter),
+            scenario("GET", "vacancies-deleted", user=recruiter),
+            scenario("PUT", "user-tag-create", user=candidate, data={"tags": [context["user_tag"].tag_id]}),
+            scenario("PATCH", "user-tag-delete", {"pk": context["user_tag"].tag_id}, user=candidate,
+                     data={"position": 1}),
+            scenario("POST", "user-me-upload-photo", user=candidate, status=201, multipart=True,
+                     data=upload("photo.png", b"\x89PNG benchmark")),
+            scenario("DELETE", "user-me-delete-photo", user=candidate, status=204),
+            scenario("GET", "role-list"),
+            scenario("POST", "company-create", user=recruiter, status=201,
+                     data={"name": "Benchmark", "website": "https://example.test"}),
+            scenario("GET", "company-get-update-delete", {"pk": recruiter.company_id}, user=recruiter),
+
+            scenario("POST", "tag-create", status=201, data={"group": context["tag_group"].pk}),
+            scenario("GET", "tags-autocomplete", params={"q": "p"}),
+            scenario("GET", "tag-groups-list-create"),
+            scenario("GET", "tag-groups-retrieve-update-delete", {"pk": context["tag_group"].pk}),
+            scenario("GET", "countries-list"),
+            scenario("GET", "cities-autocomplete", params={"q": "к"}),
+
+            scenario("GET", "vacancies-list-create", paginated=True),
+            scenario("GET", "vacancies-list-create", params={"pagination": "cursor"}, label="cursor", paginated=True),
+            scenario("GET", "vacancies-list-create", user=candidate, label="candidate", paginated=True),
+            scenario("POST", "vacancies-list-create", user=recruiter, status=201, data={
+                "name": "Benchmark", "description": "Benchmark vacancy", "work_format": "REMOTE",
+                "application_template": context["template"].pk, "tags": [{"tag": context["user_tag"].tag_id}],
+                "cities": [],
+            }),
+            scenario("GET", "vacancies-retrieve-update-delete", vacancy_kwargs, user=candidate),
+            scenario("GET", "vacancies-application-list", vacancy_kwargs, user=recruiter),
+            scenario("GET", "vacancies-application-list", vacancy_kwargs, user=recruiter, params=page, label="page",
+                     paginated=True),
+            scenario("GET", "vacancies-application-inbox", vacancy_kwargs, user=recruiter, paginated=True),
+            scenario("GET", "vacancies-application-export", vacancy_kwargs, user=recruiter),
+            scenario("GET", "vacancies-application-export", vacancy_kwargs, user=recruiter,
+                     params={"output": "ndjson"}, label="ndjson"),
+            scenario("GET", "vacancies-application-retrieve", {"pk": vacancy.pk, "application_pk": application.pk},
+                     user=recruiter),
+            scenario("PATCH", "vacancies-restore", {"pk": context["deleted"].pk}, user=recruiter),
+            scenario("GET", "/api/v1/vacancies/personalized/", user=candidate, paginated=True),
+
+            scenario("POST", "applications-create", user=candidate, status=201, data={
+                "vacancy": context["target"].pk, "answers": context["target_answers"],
+            }),
+            scenario("GET", "applications-retrieve-update-delete", {"pk": context["own_application"].pk},
+                     user=candidate),
+            scenario("PATCH", "applications-retrieve-update-delete", {"pk": application.pk}, user=recruiter,
+                     data={"status": "Interviewing"}),
+            scenario("GET", "applications-statuses"),
+            scenario("POST", "application-notes-create", user=recruiter, status=201,
+                     data={"application": application.pk, "text": "Benchmark"}),
+            scenario("PATCH", "application-get-update-delete", {"pk": context["note"].pk}, user=recruiter,
+                     data={"text": "Benchmark"}),
+
+            scenario("GET", "application-templates-list-create", user=recruiter),
+            scenario("GET", "application-templates-retrieve-update-delete", {"pk": context["template"].pk},
+                     user=recruiter),
+            scenario("GET", "questions-list-create", user=recruiter),
+            scenario("GET", "questions-list-create", user=recruiter, params=page, label="page", paginated=True),
+            scenario("GET", "questions-retrieve-update-delete", {"pk": context["question"].pk}, user=recruiter),
+            scenario("GET", "types-list", user=recruiter),
+            scenario("GET", "answers-list-create", user=recruiter),
+            scenario("GET", "answers-retrieve-update-delete", {"pk": context["answer"].pk}, user=recruiter),
+
+            scenario("GET", "complaint-causes-list"),
+            scenario("GET", "complaints-list-create", user=candidate),
+            scenario("GET", "complaints-list-create", user=candidate, params=page, label="page", paginated=True),
+            scenario("POST", "complaints-list-create", user=candidate, status=201, data={
+                "vacancy": vacancy.pk, "description": "Benchmark",
+                "causes": [context["cause"].pk],
+            }),
+            scenario("GET", "complaints-retrieve-update-delete", {"pk": context["complaint"].pk}, user=candidate),
+
+            scenario("GET", "files-list-create", user=candidate),
+            scenario("POST", "files-list-create", user=candidate, status=201, multipart=True,
+                     data=lambda: {**upload("cv.png", b"\x89PNG benchmark")(), "type": "CV"}),
+            scenario("GET", "files-retrieve-update-delete", {"pk": context["file"].pk}, user=candidate),
+            scenario("GET", "files-types-list", user=candidate),
+        ]
+        for item in scenarios:
+            route = resolve(item["path"]).route
+            item["route"] = route
+            item["name"] = f"{item['method']} {route.removeprefix(API_PREFIX)}" + (
+                f" ({item['label']})" if item["label"] else ""
+            )
+        return scenarios
+
+    @staticmethod
+    def get_client(user):
+        return Client(
+            SERVER_NAME="localhost", raise_request_exception=False,
+            HTTP_AUTHORIZATION=f"Bearer {RefreshToken.for_user(user).access_token}",
+        )
+
+    def request(self, scenario, params=None):
+        params = {**scenario["params"], **(params or {})}
+        path = f"{scenario['path']}?{urlencode(params)}" if params else scenario["path"]
+        client = self.clients[scenario["user"]]
+        data = scenario["data"]() if callable(scenario["data"]) else scenario["data"]
+        if scenario["multipart"]:
+            kwargs = {"data": data}
+        elif data is not None:
+            kwargs = {"data": json.dumps(data), "content_type": "application/json"}
+        else:
+            kwargs = {}
+
+        profile = RequestProfile()
+        with ExitStack() as stack:
+            for connection in connections.all():
+                stack.enter_context(connection.execute_wrapper(profile))
+            if scenario["method"] != "GET":
+                stack.enter_context(rolled_back())
+            started = time.perf_counter()
+            response = getattr(client, scenario["method"].lower())(path, **kwargs)
+            content = b"".join(response.streaming_content) if response.streaming else response.content
+            elapsed = time.perf_counter() - started
+        return response.status_code, elapsed, profile, content
+
+    def run(self, scenarios, page_sizes):
+        self.stdout.write(f"{'scenario':60} {'p50':>8} {'p95':>8} {'p99':>8} {'queries':>7} {'dupes':>5} "
+                          f"{'bytes':>9}")
+        for scenario in scenarios:
+            status, _, _, content = self.request(scenario)  # warms lookup tables and presigned URLs
+            if status != scenario["status"]:
+                self.failures.append(f"{scenario['name']}: status {status}, expected {scenario['status']}: "
+                                     f"{content[:200].decode(errors='replace')}")
+                continue
+
+            timings, queries, duplicates = [], 0, 0
+            for _ in range(self.repeat):
+                status, elapsed, profile, content = self.request(scenario)
+                timings.append(elapsed * 1000)
+                queries = max(queries, profile.queries)
+                duplicates = max(duplicates, profile.get_duplicate_count())
+
+            result = {
+                "p50_ms": statistics.median(timings),
+                "p95_ms": get_percentile(timings, 95),
+                "p99_ms": get_percentile(timings, 99),
+                "queries": queries,
+                "bytes": len(content),
+            }
+            self.results[scenario["name"]] = result
+            self.stdout.write(f"{scenario['name']:60} {result['p50_ms']:8.1f} {result['p95_ms']:8.1f} "
+                              f"{result['p99_ms']:8.1f} {queries:7} {duplicates:5} {len(content):9}")
+
+        for scenario in scenarios:
+            if scenario["paginated"] and scenario["name"] in self.results:
+                self.check_scaling(scenario, *page_sizes)
+
+        covered = {scenario["route"] for scenario in scenarios}
+        for route in get_api_routes(get_resolver().url_patterns):
+            if route not in covered:
+                self.failures.append(f"{route}: no benchmark scenario")
+
+    def check_scaling(self, scenario, small, large):
+        """
+        Fails the route when a page of ``large`` rows takes more queries than a page of ``small`` rows.
+        """
+        counts = {}
+        for page_size in (small, large):
+            _, _, profile, content = self.request(scenario, {"page_size": page_size})
+            counts[page_size] = (profile.queries, count_results(content))
+
+        (small_queries, small_rows), (large_queries, large_rows) = counts[small], counts[large]
+        self.stdout.write(f"{scenario['name']:60} {small_rows} rows: {small_queries} queries, "
+                          f"{large_rows} rows: {large_queries} queries")
+        if small_rows == large_rows:
+            self.stdout.write(self.style.WARNING(
+                f"{scenario['name']}: {small_rows} rows at both page sizes, query growth not checked"
+            ))
+        elif large_queries > small_queries:
+            self.failures.append(
+                f"{scenario['name']}: queries grow with page size ({small_rows} rows: {small_queries} queries, "
+                f"{large_rows} rows: {large_queries} queries)"
+            )
+
+    def check_budgets(self, path, check_latency=False):
+        try:
+            with open(path) as file:
+                budgets = json.load(file)
+        except FileNotFoundError:
+            raise CommandError(f"No budgets at {path}; create them with --update-budgets.")
+
+        for name, result in self.results.items():
+            budget = budgets.get(name)
+            if budget is None:
+                self.failures.append(f"{name}: no budget; add it with --update-budgets")
+                continue
+            for metric, limit in budget.items():
+                if result[metric] <= limit:
+                    continue
+                message = f"{name}: {metric} {result[metric]:.0f} over the budget of {limit}"
+                if metric in LATENCY_METRICS and not check_latency:
+                    self.stdout.write(self.style.WARNING(message))
+                else:
+                    self.failures.append(message)
+
+    def write_budgets(self, path):
+        budgets = {
+            name: {
+                "queries": result["queries"],
+                "p95_ms": max(math.ceil(result["p95_ms"] * LATENCY_HEADROOM), MIN_LATENCY_BUDGET_MS),
+                "bytes": math.ceil(result["bytes"] * SIZE_HEADROOM),
+            }
+            for name, result in sorted(self.results.items())
+        }
+        with open(path, "w") as file:
+            json.dump(budgets, file, indent=2)
+            file.write("\n")
+        self.stdout.write(self.style.SUCCESS(f"Wrote {len(budgets)} budgets to {path}."))
@@ -0,0 +1,66 @@
+import statistics
+import time
+
+from django.apps import apps
+from django.core.management import call_command
+from django.core.management.base import BaseCommand
+from django.db import connection, transaction
+
+from api.fixtures import find_fixture, iter_fixture_objects, load_fixtures
+from config.management.commands.load_all_fixtures import FIXTURES
+
+
+class Rollback(Exception):
+    pass
+
+
+class Command(BaseCommand):
+    help = ("Compare loaddata with the COPY fixture loader on the load_all_fixtures set, into empty tables "
+            "and over the existing rows; every round is rolled back")
+
+    def add_arguments(self, parser):
+        parser.add_argument("--rounds", type=int, default=3)
+
+    def handle(self, *args, **options):
+        tables = self.get_tables()
+        loaders = {
+            "loaddata": lambda: call_command("loaddata", *FIXTURES, verbosity=0),
+            "COPY": lambda: load_fixtures(FIXTURES),
+        }
+
+        self.stdout.write(f"{'':16} {'loaddata':>10} {'COPY':>10} {'speed-up':>9}")
+        for mode, truncate in (("empty tables", True), ("existing rows", False)):
+            timings = {
+                name: statistics.median(self.measure(loader, tables if truncate else None, options["rounds"]))
+                for name, loader in loaders.items()
+            }
+            self.stdout.write(f"{mode:16} {timings['loaddata']:8.0f} ms {timings['COPY']:7.0f} ms "
+                              f"{timings['loaddata'] / timings['COPY']:8.1f}x")
+
+    @staticmethod
+    def get_tables():
+        models = set()
+        for name in FIXTURES:
+            with open(find_fixture(name), encoding="utf-8") as file:
+                models |= {apps.get_model(obj["model"]) for obj in iter_fixture_objects(file)}
+        return [model._meta.db_table for model in models]
+
+    @staticmethod
+    def measure(loader, truncate_tables, rounds):
+        timings = []
+        for _ in range(rounds):
+            try:
+                with transaction.atomic():
+                    if truncate_tables:
+                        # CASCADE empties every table referencing these too; the rollback brings it all back
+                        with connection.cursor() as cursor:
+                            cursor.execute(
+                                f"TRUNCATE {', '.join(map(connection.ops.quote_name, truncate_tables))} CASCADE"
+                            )
+                    start = time.perf_counter()
+                    loader()
+                    timings.append((time.perf_counter() - start) * 1000)
+                    raise Rollback
+            except Rollback:
+                pass
+        return timings
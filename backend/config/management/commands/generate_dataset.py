@@ -0,0 +1,350 @@
+import datetime
+import random
+import time
+from collections import defaultdict
+from itertools import accumulate
+
+from django.contrib.auth.hashers import make_password
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection, transaction
+from django.utils import timezone
+from django.utils.dateparse import parse_datetime
+
+from accounts.lookups import roles
+from accounts.models import User, Company, UserTag
+from api.bulk import copy_rows, reserve_ids
+from api.cache import bump_version
+from api.utils import iter_chunks
+from complaints.models import Complaint, ComplaintCause
+from dict.models import City
+from tags.models import Tag
+from vacancies.counters import find_counter_drift, repair_counters
+from vacancies.enums import WorkFormat
+from vacancies.lookups import application_statuses
+from vacancies.matching import rebuild_all_scores
+from vacancies.models import Vacancy, VacancyTag, Application, ApplicationAnswer, ApplicationNote
+from vacancies_templates.lookups import question_types
+from vacancies_templates.models import ApplicationTemplate, Question, Answer
+
+CHUNK_SIZE = 20_000
+
+FIRST_NAMES = ["Olena", "Andrii", "Iryna", "Dmytro", "Kateryna", "Oleksandr", "Sofiia", "Maksym", "Anna", "Taras",
+               "Yuliia", "Bohdan", "Mariia", "Serhii", "Daria", "Ivan", "Viktoriia", "Roman", "Nataliia", "Petro"]
+LAST_NAMES = ["Shevchenko", "Kovalenko", "Bondarenko", "Tkachenko", "Kravchenko", "Melnyk", "Boiko", "Oliinyk",
+              "Koval", "Marchenko", "Lysenko", "Rudenko", "Savchenko", "Petrenko", "Moroz", "Pavlenko"]
+LEVELS = ["Junior", "Middle", "Senior", "Lead", "Trainee"]
+POSITIONS = ["Python Developer", "Django Engineer", "Frontend Developer", "QA Engineer", "DevOps Engineer",
+             "Data Analyst", "Product Manager", "UI/UX Designer", "Java Developer", "Recruiter", "Data Engineer",
+             "Mobile Developer", "Project Manager", "Support Engineer", "Machine Learning Engineer"]
+SENTENCES = [
+    "We are looking for a motivated specialist to join our growing team.",
+    "You will design, build and maintain services used by thousands of customers.",
+    "Experience with PostgreSQL, REST APIs and cloud infrastructure is a plus.",
+    "We offer flexible hours, paid vacation and a budget for courses and conferences.",
+    "You will work closely with designers, analysts and other engineers.",
+    "Strong communication skills and attention to detail are required.",
+    "The team follows code review, automated testing and continuous delivery.",
+    "English at an intermediate level or higher is expected.",
+    "Mentoring junior colleagues is part of the role.",
+    "The product is used by companies across Europe.",
+]
+QUESTIONS = {
+    "SHORT_TEXT": ["Expected salary", "Notice period", "Portfolio link", "Current position"],
+    "LONG_TEXT": ["Why do you want to join us?", "Describe your most interesting project", "Cover letter"],
+    "SINGLE_ANSWER": ["Years of experience", "English level", "Preferred work format"],
+}
+OPTIONS = {
+    "Years of experience": ["Less than 1", "1-3", "3-5", "More than 5"],
+    "English level": ["Elementary", "Intermediate", "Upper-intermediate", "Advanced"],
+    "Preferred work format": ["Office", "Remote", "Hybrid"],
+}
+QUESTION_TYPE_WEIGHTS = {"SHORT_TEXT": 40, "LONG_TEXT": 25, "SINGLE_ANSWER": 35}
+STATUS_WEIGHTS = {"New": 55, "Interviewing": 20, "Rejected": 21, "Hired": 4}
+WORK_FORMAT_WEIGHTS = {WorkFormat.REMOTE: 45, WorkFormat.HYBRID: 35, WorkFormat.OFFICE: 20}
+
+
+class Command(BaseCommand):
+    help = ("Generate a seeded synthetic dataset (companies, users, tags, templates, vacancies, applications, notes, "
+            "complaints) with COPY, then rebuild application counters and match scores. "
+            "Requires the reference data of load_all_fixtures.")
+
+    def add_arguments(self, parser):
+        parser.add_argument("--seed", type=int, default=0)
+        parser.add_argument("--companies", type=int, default=300)
+        parser.add_argument("--recruiters", type=int, default=1_000)
+        parser.add_argument("--candidates", type=int, default=10_000)
+        parser.add_argument("--vacancies", type=int, default=2_000)
+        parser.add_argument("--applications", type=int, default=100_000)
+        parser.add_argument("--complaints", type=int, default=1_000)
+        parser.add_argument("--days", type=int, default=365, help="Length of the generated history")
+        parser.add_argument("--end", help="ISO datetime the history ends at (default: now); pin it to reproduce rows")
+        parser.add_argument("--password", default="password", help="Password of every generated user")
+        parser.add_argument("--skip-match-scores", action="store_true",
+                            help="The store holds a row per candidate and vacancy sharing a tag; rebuild it later "
+                                 "with rebuild_match_scores")
+
+    def handle(self, *args, **options):
+        self.rng = random.Random(options["seed"])
+        self.seed = options["seed"]
+        self.end = parse_datetime(options["end"]) if options["end"] else timezone.now()
+        if self.end is None:
+            raise CommandError("--end must be an ISO datetime.")
+        if timezone.is_naive(self.end):
+            self.end = timezone.make_aware(self.end)
+        self.start = self.end - datetime.timedelta(days=options["days"])
+        self.password = make_password(options["password"])
+        self.tag_ids, self.tag_weights = self.get_popularity(Tag.objects.order_by("id").values_list("id", flat=True))
+        cities = list(City.objects.order_by("id").values_list("id", "population"))
+        self.city_ids = [city_id for city_id, _ in cities]
+        # cumulative weights, so each draw is a bisect; big cities get more vacancies
+        self.city_weights = list(accumulate(max(population, 1) for _, population in cities))
+        if not self.tag_ids or not self.city_ids:
+            raise CommandError("Load the reference data first: manage.py load_all_fixtures")
+        if options["candidates"] < 1 or options["recruiters"] < 1:
+            raise CommandError("At least one candidate and one recruiter are required.")
+
+        self.counts = {}
+        started = time.perf_counter()
+        with transaction.atomic():
+            self.step("companies and recruiters", self.generate_recruiters, options["companies"], options["recruiters"])
+            self.step("candidates", self.generate_candidates, options["candidates"])
+            self.step("templates", self.generate_templates)
+            self.step("vacancies", self.generate_vacancies, options["vacancies"])
+            self.step("applications", self.generate_applications, options["applications"])
+            self.step("complaints", self.generate_complaints, options["complaints"])
+            self.step("application counters", lambda: repair_counters(find_counter_drift()))
+            if not options["skip_match_scores"]:
+                self.step("match scores", rebuild_all_scores)
+        bump_version("vacancies")  # COPY bypasses the signals that invalidate cached vacancy responses
+
+        with connection.cursor() as cursor:
+            for model in (User, Company, UserTag, ApplicationTemplate, Question, Answer, Vacancy, VacancyTag,
+                          Vacancy.cities.through, Application, ApplicationAnswer, ApplicationNote, Complaint):
+                cursor.execute(f"ANALYZE {connection.ops.quote_name(model._meta.db_table)}")
+
+        for table, count in self.counts.items():
+            self.stdout.write(f"{table:32} {count:>10}")
+        self.stdout.write(self.style.SUCCESS(f"Generated in {time.perf_counter() - started:.1f} s."))
+
+    def step(self, name, func, *args):
+        started = time.perf_counter()
+        func(*args)
+        self.stdout.write(f"{name} done in {time.perf_counter() - started:.1f} s")
+
+    def copy(self, model, fields, rows):
+        label = model._meta.db_table
+        self.counts[label] = self.counts.get(label, 0) + copy_rows(model, fields, rows)
+
+    def get_popularity(self, ids):
+        """
+        Shuffles ids into a popularity order with Zipf-like weights: a few tags are everywhere, most are rare.
+        """
+        ids = list(ids)
+        self.rng.shuffle(ids)
+        return ids, list(accumulate(1 / (rank + 1) ** 0.8 for rank in range(len(ids))))
+
+    def sample_weighted(self, ids, cum_weights, count):
+        chosen = []
+        for item in self.rng.choices(ids, cum_weights=cum_weights, k=count * 3):
+            if item not in chosen:
+                chosen.append(item)
+                if len(chosen) == count:
+                    break
+        return chosen
+
+    def get_datetime(self, after=None):
+        after = max(after or self.start, self.start)
+        return after + (self.end - after) * self.rng.random()
+
+    def get_user_row(self, user_id, email, role, company_id, date_joined):
+        return (user_id, self.password, False, self.rng.choice(FIRST_NAMES), self.rng.choice(LAST_NAMES), False,
+                True, date_joined, email, None, {}, role.pk, company_id)
+
+    user_fields = ("id", "password", "is_superuser", "first_name", "last_name", "is_staff", "is_active",
+                   "date_joined", "email", "phone_number", "contacts", "role_id", "company_id")
+
+    def generate_recruiters(self, companies, recruiters):
+        company_ids = reserve_ids(Company, companies)
+        self.recruiter_ids = reserve_ids(User, recruiters)
+        self.recruiter_joined = [self.get_datetime() for _ in self.recruiter_ids]
+        # company sizes are skewed: a few large employers, many small ones
+        company_weights = [self.rng.paretovariate(1.2) for _ in company_ids]
+        if company_ids:
+            recruiter_companies = self.rng.choices(company_ids, company_weights, k=recruiters)
+        else:
+            recruiter_companies = [None] * recruiters
+
+        role = roles.get_by_slug("RECRUITER")
+        # companies reference their first recruiter and recruiters their company; the FKs are checked on commit
+        self.copy(User, self.user_fields, (
+            self.get_user_row(user_id, f"recruiter{i}.{self.seed}@example.test", role, company_id, joined)
+            for i, (user_id, company_id, joined) in enumerate(zip(self.recruiter_ids, recruiter_companies,
+                                                                  self.recruiter_joined))
+        ))
+        owners = dict(zip(reversed(recruiter_companies), reversed(self.recruiter_ids)))
+        self.copy(Company, ("id", "name", "website", "contacts", "created_at", "created_by_id"), (
+            (company_id, f"Company {self.seed}-{i}", f"https://company-{self.seed}-{i}.example.test",
+             [{"name": "email", "value": f"hr@company-{self.seed}-{i}.example.test"}], self.get_datetime(),
+             owners.get(company_id, self.recruiter_ids[0]))
+            for i, company_id in enumerate(company_ids)
+        ))
+
+    def generate_candidates(self, candidates):
+        role = roles.get_by_slug("CANDIDATE")
+        self.candidate_ids = []
+        for start in range(0, candidates, CHUNK_SIZE):
+            ids = reserve_ids(User, min(CHUNK_SIZE, candidates - start))
+            self.candidate_ids += ids
+            self.copy(User, self.user_fields, (
+                self.get_user_row(user_id, f"candidate{start + i}.{self.seed}@example.test", role, None,
+                                  self.get_datetime())
+                for i, user_id in enumerate(ids)
+            ))
+            # most candidates pick a handful of tags, a few pick many, some none
+            self.copy(UserTag, ("user_id", "tag_id", "position"), (
+                (user_id, tag_id, position)
+                for user_id in ids
+                for position, tag_id in enumerate(self.sample_weighted(
+                    self.tag_ids, self.tag_weights, min(int(self.rng.lognormvariate(1.3, 0.6)), len(self.tag_ids))
+                ), 1)
+            ))
+
+    def generate_templates(self):
+        """
+        One template per recruiter with one to four questions; single-answer questions get their options.
+        """
+        template_ids = reserve_ids(ApplicationTemplate, len(self.recruiter_ids))
+        planned = [
+            (template_id, type_name, self.rng.choice(QUESTIONS[type_name]), self.rng.random() < 0.8)
+            for template_id in template_ids
+            for type_name in self.rng.choices(
+                list(QUESTION_TYPE_WEIGHTS), list(QUESTION_TYPE_WEIGHTS.values()), k=self.rng.randint(1, 4)
+            )
+        ]
+        question_ids = reserve_ids(Question, len(planned))
+        option_values = [
+            (question_id, value)
+            for question_id, (_, _, name, _) in zip(question_ids, planned) for value in OPTIONS.get(name, [])
+        ]
+        option_ids = reserve_ids(Answer, len(option_values))
+        options_by_question = defaultdict(list)
+        for option_id, (question_id, _) in zip(option_ids, option_values):
+            options_by_question[question_id].append(option_id)
+
+        self.templates = defaultdict(list)  # template id -> [(question id, type name, option ids, is_required)]
+        for question_id, (template_id, type_name, _, is_required) in zip(question_ids, planned):
+            self.templates[template_id].append((question_id, type_name, options_by_question[question_id], is_required))
+        self.recruiter_templates = dict(zip(self.recruiter_ids, template_ids))
+
+        self.copy(ApplicationTemplate, ("id", "name", "is_global", "created_at", "created_by_id", "deleted_at"), (
+            (template_id, "Default application form", False, joined, recruiter_id, None)
+            for template_id, recruiter_id, joined in zip(template_ids, self.recruiter_ids, self.recruiter_joined)
+        ))
+        self.copy(Question, ("id", "name", "type_id", "application_template_id", "max_length", "is_required",
+                             "custom_requirements"), (
+            (question_id, name, question_types.get_by_slug(type_name).pk, template_id,
+             {"SHORT_TEXT": 200, "LONG_TEXT": 2000}.get(type_name), is_required, {})
+            for question_id, (template_id, type_name, name, is_required) in zip(question_ids, planned)
+        ))
+        self.copy(Answer, ("id", "question_id", "value", "application_created"), (
+            (option_id, question_id, value, False) for option_id, (question_id, value) in zip(option_ids, option_values)
+        ))
+
+    def generate_vacancies(self, vacancies):
+        recruiter_weights = list(accumulate(self.rng.paretovariate(1.5) for _ in self.recruiter_ids))
+        joined = dict(zip(self.recruiter_ids, self.recruiter_joined))
+        self.vacancies = []  # (id, recruiter id, template id, created_at)
+        for start in range(0, vacancies, CHUNK_SIZE):
+            ids = reserve_ids(Vacancy, min(CHUNK_SIZE, vacancies - start))
+            rows = []
+            for vacancy_id in ids:
+                recruiter_id = self.rng.choices(self.recruiter_ids, cum_weights=recruiter_weights)[0]
+                created_at = self.get_datetime(joined[recruiter_id])
+                deleted_at = self.get_datetime(created_at) if self.rng.random() < 0.05 else None
+                self.vacancies.append((vacancy_id, recruiter_id, self.recruiter_templates[recruiter_id], created_at))
+                rows.append((
+                    vacancy_id, f"{self.rng.choice(LEVELS)} {self.rng.choice(POSITIONS)}",
+                    " ".join(self.rng.sample(SENTENCES, self.rng.randint(3, 7))),
+                    self.rng.choices(list(WORK_FORMAT_WEIGHTS), list(WORK_FORMAT_WEIGHTS.values()))[0],
+                    self.recruiter_templates[recruiter_id], created_at, recruiter_id, deleted_at,
+                ))
+            self.copy(Vacancy, ("id", "name", "description", "work_format", "application_template_id", "created_at",
+                                "created_by_id", "deleted_at"), rows)
+            self.copy(VacancyTag, ("vacancy_id", "tag_id", "position"), (
+                (vacancy_id, tag_id, position)
+                for vacancy_id in ids
+                for position, tag_id in enumerate(
+                    self.sample_weighted(self.tag_ids, self.tag_weights, self.rng.randint(2, 8)), 1
+                )
+            ))
+            self.copy(Vacancy.cities.through, ("vacancy_id", "city_id"), (
+                (vacancy_id, city_id)
+                for vacancy_id in ids
+                for city_id in self.sample_weighted(self.city_ids, self.city_weights, self.rng.randint(0, 3))
+            ))
+
+    def generate_applications(self, applications):
+        if not self.vacancies:
+            return
+        # a few vacancies attract most of the applications
+        weights = [self.rng.lognormvariate(0, 1.2) for _ in self.vacancies]
+        total = sum(weights)
+        status_ids = [application_statuses.get_by_slug(name).pk for name in STATUS_WEIGHTS]
+
+        for chunk in iter_chunks(zip(self.vacancies, weights), max(1, CHUNK_SIZE // 20)):
+            planned = [
+                (vacancy, self.rng.sample(self.candidate_ids, min(round(applications * weight / total),
+                                                                  len(self.candidate_ids))))
+                for vacancy, weight in chunk
+            ]
+            application_ids = iter(reserve_ids(Application, sum(len(candidates) for _, candidates in planned)))
+            application_rows, answer_values, links, notes = [], [], [], []
+            for (vacancy_id, recruiter_id, template_id, vacancy_created_at), candidates in planned:
+                for candidate_id in candidates:
+                    application_id = next(application_ids)
+                    created_at = min(
+                        vacancy_created_at + datetime.timedelta(days=self.rng.expovariate(1 / 10)), self.end
+                    )
+                    status_id = self.rng.choices(status_ids, list(STATUS_WEIGHTS.values()))[0]
+                    application_rows.append((application_id, vacancy_id, status_id, created_at, candidate_id))
+                    for question_id, type_name, option_ids, is_required in self.templates[template_id]:
+                        if not is_required and self.rng.random() < 0.4:
+                            continue
+                        if type_name == "SINGLE_ANSWER":
+                            links.append((application_id, option_ids[self.rng.randrange(len(option_ids))]))
+                        else:
+                            answer_values.append((application_id, question_id,
+                                                  " ".join(self.rng.sample(SENTENCES, 1 if type_name == "SHORT_TEXT"
+                                                                           else 3))))
+                    if status_id != status_ids[0] and self.rng.random() < 0.3:
+                        for _ in range(self.rng.randint(1, 3)):
+                            notes.append((self.rng.choice(SENTENCES), application_id,
+                                          self.get_datetime(created_at), recruiter_id))
+
+            answer_ids = reserve_ids(Answer, len(answer_values))
+            links += [(application_id, answer_id) for (application_id, *_), answer_id in zip(answer_values, answer_ids)]
+            self.copy(Application, ("id", "vacancy_id", "status_id", "created_at", "created_by_id"), application_rows)
+            self.copy(Answer, ("id", "question_id", "value", "application_created"), (
+                (answer_id, question_id, value, True)
+                for answer_id, (_, question_id, value) in zip(answer_ids, answer_values)
+            ))
+            self.copy(ApplicationAnswer, ("application_id", "answer_id"), links)
+            self.copy(ApplicationNote, ("text", "application_id", "created_at", "created_by_id"), notes)
+
+    def generate_complaints(self, complaints):
+        if not self.vacancies or not complaints:
+            return
+        cause_ids = list(ComplaintCause.objects.values_list("id", flat=True))
+        ids = reserve_ids(Complaint, complaints)
+        rows, causes = [], []
+        for complaint_id in ids:
+            vacancy_id, recruiter_id, _, created_at = self.rng.choice(self.vacancies)
+            on_employer = self.rng.random() < 0.2
+            rows.append((complaint_id, None if on_employer else vacancy_id, recruiter_id if on_employer else None,
+                         self.rng.choice(SENTENCES), self.get_datetime(created_at),
+                         self.rng.choice(self.candidate_ids)))
+            if cause_ids:
+                causes += [(complaint_id, cause_id)
+                           for cause_id in self.rng.sample(cause_ids, min(len(cause_ids), self.rng.randint(1, 2)))]
+        self.copy(Complaint, ("id", "vacancy_id", "employer_id", "description", "created_at", "created_by_id"), rows)
+        self.copy(Complaint.causes.through, ("complaint_id", "complaintcause_id"), causes)
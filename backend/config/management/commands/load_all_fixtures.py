@@ -1,23 +1,40 @@
+import time
+
 from django.core.management import call_command
-from django.core.management.base import BaseCommand
+from django.core.management.base import BaseCommand, CommandError
+
+from api.fixtures import FixtureError, load_fixtures
+
+FIXTURES = [
+    "roles.json",
+    "users.json",
+    "countries.json",
+    "country_translations.json",
+    "cities.json",
+    "city_translations.json",
+    "question_types.json",
+    "application_statuses.json",
+    "tag_groups.json",
+    "tags.json",
+    "file_types.json",
+]
 
 
 class Command(BaseCommand):
-    help = "Load all fixtures in a specific order"
+    help = "Load all fixtures with COPY, in dependency order; loading them again updates the rows in place"
 
-    def handle(self, *args, **kwargs):
-        fixtures = [
-            "roles.json",
-            "users.json",
-            "countries.json",
-            "country_translations.json",
-            "cities.json",
-            "city_translations.json",
-            "question_types.json",
-            "application_statuses.json",
-            "tag_groups.json",
-            "tags.json",
-            "file_types.json",
-        ]
+    def add_arguments(self, parser):
+        parser.add_argument("--loaddata", action="store_true", help="Load through Django's loaddata instead")
 
-        call_command("loaddata", *fixtures, verbosity=1)
+    def handle(self, *args, **options):
+        started = time.perf_counter()
+        if options["loaddata"]:
+            call_command("loaddata", *FIXTURES, verbosity=1)
+        else:
+            try:
+                counts = load_fixtures(FIXTURES)
+            except FixtureError as e:
+                raise CommandError(str(e))
+            for label, count in counts.items():
+                self.stdout.write(f"{label:40} {count:>8}")
+        self.stdout.write(self.style.SUCCESS(f"Loaded in {time.perf_counter() - started:.2f} s."))
@@ -11,6 +11,8 @@ https://docs.djangoproject.com/en/5.0/ref/settings/
 """
 import datetime
 import os
+import sys
+import urllib.parse
 from pathlib import Path
 from environs import Env
 
@@ -49,6 +51,7 @@ INSTALLED_APPS = [
     'django.contrib.sessions',
     'django.contrib.messages',
     'django.contrib.staticfiles',
+    'django.contrib.postgres',
 
     "corsheaders",
     "rest_framework",
@@ -72,6 +75,7 @@ INSTALLED_APPS = [
 AUTH_USER_MODEL = 'accounts.User'
 
 MIDDLEWARE = [
+    "config.utils.PerformanceMiddleware",
     'django.middleware.security.SecurityMiddleware',
     'django.contrib.sessions.middleware.SessionMiddleware',
     "corsheaders.middleware.CorsMiddleware",
@@ -83,8 +87,39 @@ MIDDLEWARE = [
     'django.middleware.clickjacking.XFrameOptionsMiddleware',
 ]
 
-if DEBUG:
-    MIDDLEWARE.append("config.utils.QueryCountMiddleware")
+# Share of requests logged by PerformanceMiddleware; requests over a threshold are always logged
+PERFORMANCE_SAMPLE_RATE = env.float("PERFORMANCE_SAMPLE_RATE", default=1.0 if DEBUG else 0.01)
+# Limits per URL name over "default": wall_ms, db_ms, queries, duplicate_queries, s3_ms, render_ms
+PERFORMANCE_THRESHOLDS = {
+    "default": {
+        "wall_ms": env.float("PERFORMANCE_SLOW_REQUEST_MS", default=500),
+        "queries": 30,
+        "duplicate_queries": 5,
+    },
+    # answered from memory: any query is a regression
+    "tags-autocomplete": {"wall_ms": 50, "queries": 0},
+    "cities-autocomplete": {"wall_ms": 50, "queries": 0},
+}
+
+# Prometheus metrics at /internal/metrics/; with several worker processes, point PROMETHEUS_MULTIPROC_DIR
+# at a shared, emptied-on-start directory so the exposition aggregates all of them
+PROMETHEUS_MULTIPROC_DIR = env("PROMETHEUS_MULTIPROC_DIR", default="")
+METRICS_ALLOWED_IPS = env.list("METRICS_ALLOWED_IPS", default=["127.0.0.1"])
+
+LOGGING = {
+    "version": 1,
+    "disable_existing_loggers": False,
+    "formatters": {
+        # the performance messages are JSON objects, so every line is one JSON document
+        "json": {"format": '{"time": "%(asctime)s", "level": "%(levelname)s", "request": %(message)s}'},
+    },
+    "handlers": {
+        "performance": {"class": "logging.StreamHandler", "formatter": "json"},
+    },
+    "loggers": {
+        "performance": {"handlers": ["performance"], "level": "INFO", "propagate": False},
+    },
+}
 
 ROOT_URLCONF = 'config.urls'
 
@@ -120,6 +155,72 @@ DATABASES = {
     },
 }
 
+TESTING = sys.argv[1:2] == ["test"]
+
+# Read replicas as "host[:port][/name]" entries, the host URL-quoted when it is a socket directory; parts left out
+# are the primary's. Safe-method requests read from them through api.replicas. Locally, a second PostgreSQL
+# server, or a copy of the database on the same one ("createdb -T <DB_NAME> <copy>"), stands in for a replica.
+DATABASE_REPLICAS = []
+for number, replica in enumerate([] if TESTING else env.list("DB_REPLICAS", default=[]), start=1):
+    replica = urllib.parse.urlsplit(f"//{replica}")
+    DATABASE_REPLICAS.append(f"replica_{number}")
+    DATABASES[f"replica_{number}"] = {
+        **DATABASES["default"],
+        "HOST": urllib.parse.unquote(replica.hostname or "") or DATABASES["default"]["HOST"],
+        "PORT": replica.port or DATABASES["default"]["PORT"],
+        "NAME": replica.path.strip("/") or DATABASES["default"]["NAME"],
+        "OPTIONS": {"connect_timeout": env.int("DB_REPLICA_CONNECT_TIMEOUT", default=2)},
+    }
+if TESTING:
+    # a test database of its own, so a test can tell which database served a read; only the replica tests
+    # (api.tests) route to it
+    DATABASES["replica_1"] = {
+        **DATABASES["default"], "TEST": {"NAME": f"test_{DATABASES['default']['NAME']}_replica_1"},
+    }
+if DATABASE_REPLICAS:
+    DATABASE_ROUTERS = ["api.replicas.ReplicaRouter"]
+    MIDDLEWARE.insert(MIDDLEWARE.index("config.utils.PerformanceMiddleware") + 1, "api.replicas.ReplicaMiddleware")
+# Seconds a user reads from the primary after writing, covering the replication lag
+REPLICA_PIN_SECONDS = env.int("REPLICA_PIN_SECONDS", default=5)
+# Seconds a replica that refused a connection is left out
+REPLICA_RETRY_SECONDS = env.int("REPLICA_RETRY_SECONDS", default=30)
+# Upper bound for cached responses read from a replica, which may lag behind the version bumped by a write
+REPLICA_CACHE_TIMEOUT = env.int("REPLICA_CACHE_TIMEOUT", default=10)
+
+# Serve the hot read endpoints of the ASGI application (config.asgi) with the async views of api.async_urls
+ASYNC_VIEWS = env.bool("ASYNC_VIEWS", default=False)
+# Threads, each keeping its database connections open between requests, that run the queries of the async views
+# of one ASGI process: 500 concurrent requests share these connections instead of opening 500.
+ASYNC_DB_CONNECTIONS = env.int("ASYNC_DB_CONNECTIONS", default=20)
+
+# Cache
+# https://docs.djangoproject.com/en/5.0/topics/cache/
+# Content versions (api.cache), cached responses and replica pins are shared through the cache, so every process
+# (web workers, the ASGI app, management commands) must use the same backend: Redis when CACHE_LOCATION is set.
+# The process-local default only suits a single development server; api.apps refuses it for several workers
+# (WEB_CONCURRENCY, read by gunicorn and uvicorn too, or PROMETHEUS_MULTIPROC_DIR) or with read replicas.
+
+CACHE_LOCATION = env("CACHE_LOCATION", default="")
+CACHES = {
+    "default": {
+        "BACKEND": env("CACHE_BACKEND", default="") or (
+            "django.core.cache.backends.redis.RedisCache" if CACHE_LOCATION
+            else "django.core.cache.backends.locmem.LocMemCache"
+        ),
+        "LOCATION": CACHE_LOCATION,
+    },
+}
+WEB_CONCURRENCY = env.int("WEB_CONCURRENCY", default=1)
+
+# Seconds a process trusts its in-memory dictionaries before checking the shared version again
+LOCAL_CACHE_VERSION_CHECK_INTERVAL = env.float("LOCAL_CACHE_VERSION_CHECK_INTERVAL", default=1.0)
+
+# Upper bound for cached API responses; writes invalidate them earlier through content versions
+RESPONSE_CACHE_TIMEOUT = env.int("RESPONSE_CACHE_TIMEOUT", default=300)
+
+# Seconds clients may reuse a dictionary response before revalidating it with If-None-Match
+DICTIONARY_CACHE_MAX_AGE = env.int("DICTIONARY_CACHE_MAX_AGE", default=60)
+
 # Password validation
 # https://docs.djangoproject.com/en/5.0/ref/settings/#auth-password-validators
 
@@ -146,6 +247,10 @@ LANGUAGE_CODE = 'en-us'
 DEFAULT_LANGUAGE_CODE = "en"
 LANGUAGE_CHOICES = [("en", "English"), ("uk", "Ukrainian")]
 AVAILABLE_LANGUAGES = ["en", "uk"]
+# PostgreSQL text search configuration per language; "ukrainian" is created by the vacancies migrations
+SEARCH_CONFIGS = {"en": "english", "uk": "ukrainian"}
+# Match and rank dictionary names (tags, cities...) with pg_trgm; the extension is created by the tags migrations
+TRIGRAM_SEARCH = env.bool("TRIGRAM_SEARCH", default=True)
 
 TIME_ZONE = 'UTC'
 
@@ -175,6 +280,10 @@ SPECTACULAR_SETTINGS = {
 
 REST_FRAMEWORK = {
     "DEFAULT_SCHEMA_CLASS": "drf_spectacular.openapi.AutoSchema",
+    "DEFAULT_RENDERER_CLASSES": (
+        "api.profiling.ProfiledJSONRenderer",
+        "rest_framework.renderers.BrowsableAPIRenderer",
+    ),
     'DEFAULT_AUTHENTICATION_CLASSES': (
         'rest_framework_simplejwt.authentication.JWTAuthentication',
     ),
@@ -191,7 +300,7 @@ SIMPLE_JWT = {
 
 # Files
 
-DEFAULT_FILE_STORAGE = "storages.backends.s3boto3.S3Boto3Storage"
+DEFAULT_FILE_STORAGE = "files.storage.S3Storage"
 AWS_ACCESS_KEY_ID = env("S3_USER")
 AWS_SECRET_ACCESS_KEY = env("S3_PASS")
 AWS_STORAGE_BUCKET_NAME = env("STORAGE_BUCKET_NAME")
@@ -204,5 +313,10 @@ AWS_S3_CUSTOM_DOMAIN = None
 AWS_S3_FILE_OVERWRITE = False
 AWS_DEFAULT_ACL = "bucket-owner-full-control"
 
+# Presigned URLs are signed for PRESIGNED_URL_EXPIRES_IN seconds and reused while at least the requested
+# lifetime remains; at most PRESIGNED_URL_CACHE_SIZE URLs are kept per process (LRU).
+PRESIGNED_URL_EXPIRES_IN = env.int("PRESIGNED_URL_EXPIRES_IN", default=900)
+PRESIGNED_URL_CACHE_SIZE = env.int("PRESIGNED_URL_CACHE_SIZE", default=10_000)
+
 ALLOWED_IMAGE_EXTENSIONS = ['jpg', 'jpeg', 'png']
 ALLOWED_FILE_EXTENSIONS = ['pdf']
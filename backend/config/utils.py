@@ -1,45 +1,90 @@
-import time
-import re
+import json
+import logging
+import random
 
-from django.db import connection
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction
+from django.http import StreamingHttpResponse
+
+from api.lookups import start_counting_saved_queries
+from api.metrics import observe_request
+from api.profiling import RequestProfile, current_profile
+from config.settings import PERFORMANCE_SAMPLE_RATE, PERFORMANCE_THRESHOLDS
+
+logger = logging.getLogger("performance")
+
+
+class PerformanceMiddleware:
+    """
+    Profiles every request: wall, database, S3 signing and rendering time, query count and repeated query shapes.
+    Every request is observed in the api.metrics histograms.
+    Requests over a threshold of their route (PERFORMANCE_THRESHOLDS, by URL name) are logged as warnings,
+    a PERFORMANCE_SAMPLE_RATE share of the rest as info, both as one JSON object per line.
+    Queries reach the profile through api.profiling.profile_query, in whichever thread they run.
+    """
+    sync_capable = True
+    async_capable = True
 
-class QueryCountMiddleware:
     def __init__(self, get_response):
         self.get_response = get_response
+        self.async_mode = iscoroutinefunction(get_response)
+        if self.async_mode:
+            markcoroutinefunction(self)
 
     def __call__(self, request):
-        self.start_time = time.time()
-        self.queries_before = len(connection.queries)
+        if self.async_mode:
+            return self.__acall__(request)
 
-        response = self.get_response(request)
+        profile = RequestProfile()
+        saved_queries = start_counting_saved_queries()
+        token = current_profile.set(profile)
+        try:
+            response = self.get_response(request)
+        finally:
+            current_profile.reset(token)
 
-        total_time = time.time() - self.start_time
-        queries_after = len(connection.queries)
-        queries_count = queries_after - self.queries_before
-        print(f"Total time: {total_time:.2f}s, Queries: {queries_count}")
-        for query in connection.queries[self.queries_before :]:
-            try:
-                print(self.shorten_query(query["sql"]))
-            except Exception:
-                pass
+        self.report(request, response, profile, saved_queries)
+        return response
+
+    async def __acall__(self, request):
+        profile = RequestProfile()
+        saved_queries = start_counting_saved_queries()
+        token = current_profile.set(profile)
+        try:
+            response = await self.get_response(request)
+        finally:
+            current_profile.reset(token)
 
+        self.report(request, response, profile, saved_queries)
         return response
 
-    def shorten_query(self, sql):
-        pattern = re.compile(r"SELECT .*? FROM (.*?) ", re.IGNORECASE)
-        match = pattern.search(sql)
-        if match:
-            return f"SELECT FROM {match.group(1)}"
-        pattern = re.compile(r"INSERT INTO (.*?) ", re.IGNORECASE)
-        match = pattern.search(sql)
-        if match:
-            return f"INSERT INTO {match.group(1)}"
-        pattern = re.compile(r"UPDATE (.*?) ", re.IGNORECASE)
-        match = pattern.search(sql)
-        if match:
-            return f"UPDATE {match.group(1)}"
-        pattern = re.compile(r"DELETE FROM (.*?) ", re.IGNORECASE)
-        match = pattern.search(sql)
-        if match:
-            return f"DELETE FROM {match.group(1)}"
-        return sql
+    @staticmethod
+    def get_record(request, response, profile, saved_queries):
+        match = request.resolver_match
+        return {
+            "method": request.method,
+            "path": request.path,
+            "route": match.view_name if match else None,
+            "status": response.status_code,
+            "wall_ms": round(profile.get_elapsed() * 1000, 2),
+            "db_ms": round(profile.db_seconds * 1000, 2),
+            "queries": profile.queries,
+            "duplicate_queries": profile.get_duplicate_count(),
+            "s3_ms": round(profile.timings["s3"] * 1000, 2),
+            "render_ms": round(profile.timings["render"] * 1000, 2),
+            "lookups": dict(saved_queries),
+            # the body, and the queries it runs, are produced after the middleware returns
+            "streaming": isinstance(response, StreamingHttpResponse),
+        }
+
+    def report(self, request, response, profile, saved_queries):
+        record = self.get_record(request, response, profile, saved_queries)
+        observe_request(record)
+        thresholds = {**PERFORMANCE_THRESHOLDS["default"], **PERFORMANCE_THRESHOLDS.get(record["route"], {})}
+        exceeded = [name for name, limit in thresholds.items() if record[name] > limit]
+
+        if exceeded:
+            record["exceeded"] = exceeded
+            record["top_duplicates"] = profile.get_duplicates()
+            logger.warning(json.dumps(record))
+        elif random.random() < PERFORMANCE_SAMPLE_RATE:
+            logger.info(json.dumps(record))
@@ -0,0 +1,13 @@
+from api.autocomplete import PrefixIndex
+from .models import CityTranslation
+
+
+def load_cities(ids):
+    translations = CityTranslation.objects.all() if ids is None else CityTranslation.objects.filter(city_id__in=ids)
+    for city_id, language_code, name, population in translations.values_list(
+        "city_id", "language_code", "name", "city__population"
+    ):
+        yield city_id, language_code, name, -population  # most populated first
+
+
+city_index = PrefixIndex("autocomplete:cities", load_cities)
@@ -0,0 +1,50 @@
+import statistics
+import time
+
+from django.core.management.base import BaseCommand
+from django.test import Client
+from django.urls import reverse
+from django.utils import translation
+from rest_framework.renderers import JSONRenderer
+
+from config.settings import AVAILABLE_LANGUAGES
+from dict.serializers import CountrySerializer
+from dict.snapshots import get_countries, get_country_snapshot
+
+ENCODINGS = {"identity": "identity", "gzip": "gzip", "br": "br, gzip"}
+
+
+class Command(BaseCommand):
+    help = "Compare rendering the country list from the database with serving the precompressed snapshot"
+
+    def add_arguments(self, parser):
+        parser.add_argument("--rounds", type=int, default=20)
+
+    def handle(self, *args, **options):
+        rounds = options["rounds"]
+        client = Client(SERVER_NAME="localhost")
+        url = reverse("countries-list")
+
+        for language_code in AVAILABLE_LANGUAGES:
+            def render():
+                with translation.override(language_code):
+                    return JSONRenderer().render(CountrySerializer(get_countries(language_code), many=True).data)
+
+            size, rendered = self.measure(render, rounds)
+            self.stdout.write(f"[{language_code}] rendered from the database: {size:>9,} bytes {rendered:8.2f} ms")
+
+            get_country_snapshot(language_code)
+            for name, accept_encoding in ENCODINGS.items():
+                size, served = self.measure(lambda: client.get(
+                    url, HTTP_ACCEPT_LANGUAGE=language_code, HTTP_ACCEPT_ENCODING=accept_encoding
+                ).content, rounds)
+                self.stdout.write(f"[{language_code}] snapshot, {name:<8}:           {size:>9,} bytes {served:8.2f} ms")
+
+    @staticmethod
+    def measure(func, rounds):
+        timings = []
+        for _ in range(rounds):
+            start = time.perf_counter()
+            content = func()
+            timings.append((time.perf_counter() - start) * 1000)
+        return len(content), statistics.median(timings)
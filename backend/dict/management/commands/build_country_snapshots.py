@@ -0,0 +1,11 @@
+from django.core.management.base import BaseCommand
+
+from dict.snapshots import build_all_country_snapshots
+
+
+class Command(BaseCommand):
+    help = "Prebuild the compressed country/city snapshots for every language, e.g. after a deploy"
+
+    def handle(self, *args, **options):
+        build_all_country_snapshots()
+        self.stdout.write(self.style.SUCCESS("Country snapshots built."))
@@ -0,0 +1,24 @@
+# Generated by Django 5.0.7 on 2026-10-18 02:58
+
+import django.contrib.postgres.indexes
+from django.contrib.postgres.operations import TrigramExtension
+from django.db import migrations
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('dict', '0005_remove_country_name_countrytranslation'),
+    ]
+
+    operations = [
+        TrigramExtension(),
+        migrations.AddIndex(
+            model_name='citytranslation',
+            index=django.contrib.postgres.indexes.GinIndex(fields=['name'], name='cities_name_trgm_idx', opclasses=['gin_trgm_ops']),
+        ),
+        migrations.AddIndex(
+            model_name='countrytranslation',
+            index=django.contrib.postgres.indexes.GinIndex(fields=['name'], name='countries_name_trgm_idx', opclasses=['gin_trgm_ops']),
+        ),
+    ]
@@ -1,3 +1,4 @@
+from django.contrib.postgres.indexes import GinIndex
 from django.db import models
 
 from config.settings import LANGUAGE_CHOICES
@@ -15,6 +16,9 @@ class CountryTranslation(models.Model):
 
     class Meta:
         db_table = "dict_countries_translations"
+        indexes = [
+            GinIndex(fields=["name"], name="countries_name_trgm_idx", opclasses=["gin_trgm_ops"]),
+        ]
 
 
 class City(models.Model):
@@ -33,3 +37,6 @@ class CityTranslation(models.Model):
     class Meta:
         db_table = "dict_cities_translations"
         unique_together = (("city", "language_code"),)
+        indexes = [
+            GinIndex(fields=["name"], name="cities_name_trgm_idx", opclasses=["gin_trgm_ops"]),
+        ]
@@ -0,0 +1,28 @@
+from django.db import transaction
+from django.db.models.signals import post_save, post_delete
+from django.dispatch import receiver
+
+from api.bulk import bulk_loaded
+from api.cache import bump_version_on_change
+from api.translations import invalidate_translations_on_change
+from .autocomplete import city_index
+from .models import City, Country, CityTranslation
+
+invalidate_translations_on_change(City, Country)
+bump_version_on_change("countries", Country, City)
+
+
+@receiver([post_save, post_delete], sender=CityTranslation)
+def city_translation_changed(sender, instance, **kwargs):
+    transaction.on_commit(lambda: city_index.update([instance.city_id]))
+
+
+@receiver(post_save, sender=City)
+def city_changed(sender, instance, **kwargs):
+    transaction.on_commit(lambda: city_index.update([instance.id]))  # population is the autocomplete rank
+
+
+@receiver(bulk_loaded, sender=City)
+@receiver(bulk_loaded, sender=CityTranslation)
+def cities_loaded(sender, **kwargs):
+    transaction.on_commit(city_index.invalidate)
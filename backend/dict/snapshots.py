@@ -0,0 +1,106 @@
+import gzip
+
+from django.core.cache import cache
+from django.db.models import Prefetch, OuterRef, Subquery
+from django.utils import translation
+from rest_framework.renderers import JSONRenderer
+
+from api.async_views import run_in_database_thread
+from api.cache import get_version, aget_versions
+from api.metrics import count_cache
+from api.replicas import primary_reads
+from api.translations import get_translations_namespace
+from config.settings import AVAILABLE_LANGUAGES
+from .models import Country, City, CountryTranslation
+from .serializers import CountrySerializer
+
+try:
+    import brotli
+except ImportError:  # gzip only
+    brotli = None
+
+SNAPSHOT_TIMEOUT = 24 * 60 * 60  # old versions expire; the current one is rebuilt on demand
+SNAPSHOT_ENCODINGS = ("identity", "gzip") if brotli is None else ("identity", "gzip", "br")
+COUNTRY_SNAPSHOT_NAMESPACES = ("countries", get_translations_namespace(Country), get_translations_namespace(City))
+
+
+def get_countries(language_code):
+    return Country.objects.prefetch_related(
+        Prefetch("cities", City.objects.order_by("-population"))
+    ).alias(translation=Subquery(
+        CountryTranslation.objects.filter(country=OuterRef('pk'))
+        .filter(language_code=language_code)
+        .values('name')
+    )).order_by("translation")
+
+
+def get_accepted_encoding(accept_encoding, available):
+    """
+    Picks br, then gzip, from an Accept-Encoding header, skipping codings refused with q=0.
+    """
+    accepted = {}
+    for item in accept_encoding.split(","):
+        coding, _, params = item.strip().partition(";")
+        try:
+            quality = float(params.strip().removeprefix("q=")) if params else 1.0
+        except ValueError:
+            quality = 0.0
+        accepted[coding.strip().lower()] = quality
+    for coding in ("br", "gzip"):
+        if coding in available and accepted.get(coding, accepted.get("*", 0)) > 0:
+            return coding
+    return "identity"
+
+
+def compress(content):
+    """
+    Returns {content coding: bytes} for the identity, gzip and, when available, brotli variants.
+    """
+    encoded = {"identity": content, "gzip": gzip.compress(content, compresslevel=9, mtime=0)}
+    if brotli is not None:
+        encoded["br"] = brotli.compress(content, mode=brotli.MODE_TEXT, quality=11)
+    return encoded
+
+
+def get_snapshot_key(language_code, versions=None):
+    if versions is None:
+        versions = [get_version(namespace) for namespace in COUNTRY_SNAPSHOT_NAMESPACES]
+    return f"snapshots:countries:{language_code}:{':'.join(map(str, versions))}"
+
+
+def build_country_snapshot(language_code):
+    with translation.override(language_code), primary_reads():
+        data = CountrySerializer(get_countries(language_code), many=True).data
+    return compress(JSONRenderer().render(data))
+
+
+def get_country_snapshot(language_code):
+    """
+    The full country/city tree for the language, rendered once per content version and kept in the cache.
+    """
+    key = get_snapshot_key(language_code)  # before building, so a snapshot raced by a write is stored as stale
+    snapshot = cache.get(key)
+    count_cache("country_snapshots", snapshot is not None)
+    if snapshot is None:
+        snapshot = build_country_snapshot(language_code)
+        cache.set(key, snapshot, SNAPSHOT_TIMEOUT)
+    return snapshot
+
+
+async def aget_country_snapshot(language_code):
+    """
+    get_country_snapshot() for async views: the cache is read through the async API and a missing snapshot is built
+    in a database thread.
+    """
+    key = get_snapshot_key(language_code, await aget_versions(COUNTRY_SNAPSHOT_NAMESPACES))
+    snapshot = await cache.aget(key)
+    count_cache("country_snapshots", snapshot is not None)
+    if snapshot is None:
+        snapshot = await run_in_database_thread(build_country_snapshot, language_code)
+        await cache.aset(key, snapshot, SNAPSHOT_TIMEOUT)
+    return snapshot
+
+
+def build_all_country_snapshots():
+    for language_code in AVAILABLE_LANGUAGES:
+        cache.set(get_snapshot_key(language_code), build_country_snapshot(language_code), SNAPSHOT_TIMEOUT)
@@ -1,3 +1,48 @@
+import gzip
+
+from django.core.cache import cache
 from django.test import TestCase
+from rest_framework import status
+from rest_framework.test import APIClient
+
+from dict.models import Country, CountryTranslation
+
+
+class CountryListETagTests(TestCase):
+    path = "/api/v1/dict/countries/"
+
+    @classmethod
+    def setUpTestData(cls):
+        country = Country.objects.create()
+        CountryTranslation.objects.create(country=country, name="Ukraine", language_code="en")
+
+    def setUp(self):
+        cache.clear()
+        self.client = APIClient()
+
+    def get(self, accept_encoding, **headers):
+        return self.client.get(self.path, HTTP_ACCEPT_ENCODING=accept_encoding, **headers)
+
+    def test_each_coding_has_its_own_etag(self):
+        responses = {coding: self.get(coding) for coding in ("identity", "gzip", "br")}
+        for coding, response in responses.items():
+            self.assertEqual(response.status_code, status.HTTP_200_OK)
+            self.assertEqual(response.get("Content-Encoding", "identity"), coding)
+            self.assertIn("Accept-Encoding", response["Vary"])
+        identity, gzipped = responses["identity"]["ETag"], responses["gzip"]["ETag"]
+        self.assertEqual(gzipped, identity[:-1] + '-gzip"')
+        self.assertEqual(responses["br"]["ETag"], identity[:-1] + '-br"')
+        self.assertEqual(gzip.decompress(responses["gzip"].content), responses["identity"].content)
+
+    def test_etag_of_another_coding_is_not_revalidated(self):
+        etag = self.get("gzip")["ETag"]
+        not_modified = self.get("gzip", HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(not_modified.status_code, status.HTTP_304_NOT_MODIFIED)
+        self.assertIn("Accept-Encoding", not_modified["Vary"])
+        self.assertEqual(self.get("identity", HTTP_IF_NONE_MATCH=etag).status_code, status.HTTP_200_OK)
 
-# Create your tests here.
+    def test_search_results_are_not_encoded(self):
+        response = self.client.get(self.path, {"search": "Ukr"}, HTTP_ACCEPT_ENCODING="br")
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertNotIn("Content-Encoding", response)
+        self.assertFalse(response["ETag"].endswith('-br"'))
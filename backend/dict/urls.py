@@ -1,7 +1,8 @@
 from django.urls import path, include
 
-from dict.views import CountryListView
+from dict.views import CountryListView, CityAutocompleteAPIView
 
 urlpatterns = [
     path("countries/", CountryListView.as_view(), name="countries-list"),
+    path("cities/autocomplete/", CityAutocompleteAPIView.as_view(), name="cities-autocomplete"),
 ]
\ No newline at end of file
@@ -1,10 +1,20 @@
 from django.db.models import Prefetch, Q, OuterRef, Subquery
+from django.db.models.functions import Greatest
+from django.http import HttpResponse
+from django.utils.cache import patch_vary_headers
 from drf_spectacular.utils import extend_schema, OpenApiParameter
 from rest_framework.generics import ListAPIView
 
+from api.async_views import AsyncConditionalListMixin, AsyncListAPIView
+from api.autocomplete import AutocompleteAPIView
+from api.mixins import ConditionalListMixin
+from api.search import get_matching_ids, get_similarity
 from api.utils import get_language_code
+from dict.autocomplete import city_index
 from dict.models import Country, City, CountryTranslation, CityTranslation
 from dict.serializers import CountrySerializer
+from dict.snapshots import COUNTRY_SNAPSHOT_NAMESPACES, SNAPSHOT_ENCODINGS, get_countries, get_country_snapshot, \
+    get_accepted_encoding, aget_country_snapshot
 
 
 @extend_schema(
@@ -17,45 +27,82 @@ from dict.serializers import CountrySerializer
         ),
     ]
 )
-class CountryListView(ListAPIView):
+class CountryListView(ConditionalListMixin, ListAPIView):
     queryset = Country.objects.none()  # mock for swagger
     serializer_class = CountrySerializer
+    etag_namespaces = COUNTRY_SNAPSHOT_NAMESPACES
+
+    def list(self, request, *args, **kwargs):
+        if request.query_params.get('search', ''):
+            return super().list(request, *args, **kwargs)
+        return self.get_conditional_response(request, self.get_snapshot_response)
+
+    def get_snapshot_response(self, request, snapshot=None):
+        # the unfiltered tree is served from a prebuilt, precompressed snapshot
+        if snapshot is None:
+            snapshot = get_country_snapshot(get_language_code())
+        encoding = self.get_content_coding(request)
+        response = HttpResponse(snapshot[encoding], content_type="application/json")
+        if encoding != "identity":
+            response["Content-Encoding"] = encoding
+        return response
+
+    def get_content_coding(self, request):
+        if request.query_params.get('search', ''):
+            return "identity"
+        return get_accepted_encoding(request.headers.get("Accept-Encoding", ""), SNAPSHOT_ENCODINGS)
+
+    def add_conditional_headers(self, response, etag):
+        # on 304s too, so caches keep one representation per coding
+        if not self.request.query_params.get('search', ''):
+            patch_vary_headers(response, ("Accept-Encoding",))
+        return super().add_conditional_headers(response, etag)
 
     def get_queryset(self):
         language_code = get_language_code()
         search = self.request.query_params.get('search', '')
 
         if not search:
-            return Country.objects.prefetch_related(
-                Prefetch("translations", CountryTranslation.objects.filter(language_code=language_code)),
-                Prefetch("cities", City.objects.prefetch_related(
-                    Prefetch("translations", CityTranslation.objects.filter(language_code=language_code)),
-                ).order_by("-population"))
-            ).alias(translation=Subquery(
-                CountryTranslation.objects.filter(country=OuterRef('pk'))
-                .filter(language_code=language_code)
-                .values('name')
-            )).order_by("translation")
+            return get_countries(language_code)
+
+        # matching ids as IN subqueries, so neither query joins translations or needs DISTINCT
+        city_ids = get_matching_ids(CityTranslation, "city_id", search)
+        country_ids = get_matching_ids(CountryTranslation, "country_id", search)
+        cities = City.objects.filter(
+            Q(id__in=city_ids) | Q(country_id__in=country_ids)
+        ).annotate(
+            similarity=get_similarity(CityTranslation, search, city=OuterRef("pk"))
+        ).order_by("-similarity", "-population")
 
-        country_ids = Country.objects.filter(
-            Q(cities__translations__name__icontains=search) | Q(translations__name__icontains=search)
-        ).values_list("id", flat=True)
         return (
-            Country.objects.
-            filter(id__in=country_ids)
-            .prefetch_related(
-                Prefetch("translations", CountryTranslation.objects.filter(language_code=language_code)),
-                Prefetch("cities", City.objects.filter(
-                    Q(translations__name__icontains=search) | Q(country__translations__name__icontains=search)
-                ).prefetch_related(
-                    Prefetch("translations", CityTranslation.objects.filter(language_code=language_code)),
-                ).order_by("-population").distinct())
-            )
+            Country.objects
+            .filter(Q(id__in=country_ids) | Q(id__in=City.objects.filter(id__in=city_ids).values("country_id")))
+            .annotate(similarity=Greatest(
+                get_similarity(CountryTranslation, search, country=OuterRef("pk")),
+                get_similarity(CityTranslation, search, city__country=OuterRef("pk")),
+            ))
+            .prefetch_related(Prefetch("cities", cities))
             .alias(translation=Subquery(
                 CountryTranslation.objects.filter(country=OuterRef('pk'))
                 .filter(language_code=language_code)
                 .values('name')
-            )
-            )
-            .order_by("translation")
+            ))
+            .order_by("-similarity", "translation")
         )
+
+
+class CountryListAsyncView(AsyncConditionalListMixin, AsyncListAPIView):
+    view_class = CountryListView
+
+    async def get_response(self, view, queryset):
+        if view.request.query_params.get('search', ''):
+            return await super().get_response(view, queryset)
+        return await self.get_conditional_response(view, self.get_snapshot_response)
+
+    @staticmethod
+    async def get_snapshot_response(view):
+        return view.get_snapshot_response(view.request, await aget_country_snapshot(get_language_code()))
+
+
+class CityAutocompleteAPIView(AutocompleteAPIView):
+    index = city_index
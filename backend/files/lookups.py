@@ -0,0 +1,4 @@
+from api.lookups import LookupTable
+from .models import FileType
+
+file_types = LookupTable(FileType, "file_types")
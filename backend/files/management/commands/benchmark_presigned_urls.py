@@ -0,0 +1,41 @@
+import statistics
+import time
+import uuid
+
+from django.core.management.base import BaseCommand
+
+from config.settings import PRESIGNED_URL_EXPIRES_IN
+from files.utils import sign_url, generate_presigned_urls, presigned_url_cache
+
+
+class Command(BaseCommand):
+    help = "Measure presigned URL cost per 1,000 files, signing every time versus the signed URL cache"
+
+    def add_arguments(self, parser):
+        parser.add_argument("--files", type=int, default=1000)
+        parser.add_argument("--rounds", type=int, default=5)
+
+    def handle(self, *args, **options):
+        file_paths = [f"{index % 50}/{uuid.uuid4()}.pdf" for index in range(options["files"])]
+        per_thousand = 1000 / len(file_paths)
+
+        uncached = self.measure(lambda: [sign_url(path, PRESIGNED_URL_EXPIRES_IN) for path in file_paths],
+                                options["rounds"])
+
+        presigned_url_cache.clear()
+        cold = self.measure(lambda: generate_presigned_urls(file_paths), 1)
+        warm = self.measure(lambda: generate_presigned_urls(file_paths), options["rounds"])
+
+        self.stdout.write(f"boto3 signing:     {uncached * per_thousand:8.2f} ms per 1,000 files")
+        self.stdout.write(f"cache, cold:       {cold * per_thousand:8.2f} ms per 1,000 files")
+        self.stdout.write(f"cache, warm:       {warm * per_thousand:8.2f} ms per 1,000 files")
+        self.stdout.write(f"cache stats:       {presigned_url_cache.stats()}")
+
+    @staticmethod
+    def measure(func, rounds):
+        timings = []
+        for _ in range(rounds):
+            start = time.perf_counter()
+            func()
+            timings.append((time.perf_counter() - start) * 1000)
+        return statistics.median(timings)
@@ -1,9 +1,12 @@
 from django.core.validators import FileExtensionValidator
+from django.db import models
 from rest_framework import serializers
 
+from api.serializers import LookupSlugRelatedField
 from config.settings import ALLOWED_IMAGE_EXTENSIONS, ALLOWED_FILE_EXTENSIONS
+from .lookups import file_types
 from .models import File, FileType
-from .utils import generate_presigned_url
+from .utils import generate_presigned_url, generate_presigned_urls
 
 
 class FileTypeSerializer(serializers.ModelSerializer):
@@ -12,8 +15,16 @@ class FileTypeSerializer(serializers.ModelSerializer):
         fields = ("name", )
 
 
+class FileListSerializer(serializers.ListSerializer):
+    def to_representation(self, data):
+        files = list(data.all() if isinstance(data, models.manager.BaseManager) else data)
+        if self.child.include_url:
+            self.child.presigned_urls = generate_presigned_urls([file.file.name for file in files])
+        return super().to_representation(files)
+
+
 class FileSerializer(serializers.ModelSerializer):
-    type = serializers.SlugRelatedField(slug_field='name', queryset=FileType.objects.all())
+    type = LookupSlugRelatedField(file_types)
     file = serializers.FileField(use_url=False, write_only=True, validators=[
         FileExtensionValidator(allowed_extensions=ALLOWED_IMAGE_EXTENSIONS + ALLOWED_FILE_EXTENSIONS)
     ])
@@ -22,6 +33,7 @@ class FileSerializer(serializers.ModelSerializer):
         model = File
         fields = ("id", "file", "user_filename", "extension", "type", "created_at")
         extra_kwargs = {"user_filename": {"read_only": True}, "extension": {"read_only": True}, }
+        list_serializer_class = FileListSerializer
 
     def __init__(self, *args, **kwargs):
         self.validate_photo = kwargs.pop('validate_photo', False)
@@ -49,10 +61,10 @@ class FileSerializer(serializers.ModelSerializer):
     def to_representation(self, instance):
         representation = super().to_representation(instance)
         if self.include_url:
-            representation["url"] = generate_presigned_url(instance.file.name)
+            presigned_urls = getattr(self, "presigned_urls", {})  # signed in batch for the whole list
+            representation["url"] = presigned_urls.get(instance.file.name) or generate_presigned_url(instance.file.name)
         return representation
 
 
 class FilePhotoSerializer(FileSerializer):
-    type = serializers.SlugRelatedField(slug_field='name', queryset=FileType.objects.all(),
-                                        default=serializers.CreateOnlyDefault(lambda: FileType.objects.get(id=3)))
+    type = LookupSlugRelatedField(file_types, default=serializers.CreateOnlyDefault(lambda: file_types.get(3)))
@@ -0,0 +1,4 @@
+from api.cache import bump_version_on_change
+from .models import FileType
+
+bump_version_on_change("file_types", FileType)
@@ -0,0 +1,15 @@
+from storages.backends.s3boto3 import S3Boto3Storage
+
+from api.metrics import instrument_s3_client
+
+
+class S3Storage(S3Boto3Storage):
+    """
+    S3Boto3Storage whose API calls (uploads, deletes...) are timed in api.metrics.
+    """
+
+    @property
+    def connection(self):
+        connection = super().connection
+        instrument_s3_client(connection.meta.client)
+        return connection
@@ -1,10 +1,15 @@
 import os
+import threading
+import time
 import uuid
+from collections import OrderedDict
 
 import boto3
 
+from api.metrics import S3_DURATION, count_cache, instrument_s3_client
+from api.profiling import track
 from config.settings import AWS_STORAGE_BUCKET_NAME, AWS_ACCESS_KEY_ID, AWS_SECRET_ACCESS_KEY, \
-    AWS_S3_ENDPOINT_GET_URL
+    AWS_S3_ENDPOINT_GET_URL, PRESIGNED_URL_EXPIRES_IN, PRESIGNED_URL_CACHE_SIZE
 
 
 def upload_file_path(instance, filename):
@@ -12,17 +17,80 @@ def upload_file_path(instance, filename):
     return f"{instance.created_by.pk}/{uuid.uuid4()}{extension}"
 
 
-s3 = boto3.client(
+s3 = instrument_s3_client(boto3.client(
     's3',
     endpoint_url=AWS_S3_ENDPOINT_GET_URL,
     aws_access_key_id=AWS_ACCESS_KEY_ID,
     aws_secret_access_key=AWS_SECRET_ACCESS_KEY
-)
+))
+
+
+class PresignedUrlCache:
+    """
+    LRU of object key -> (url, expires_at). A URL is only handed out while it stays valid for the requested time.
+    """
+
+    def __init__(self, max_size):
+        self.max_size = max_size
+        self.hits = 0
+        self.misses = 0
+        self._urls = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key, min_lifetime):
+        with self._lock:
+            entry = self._urls.get(key)
+            if entry is None or entry[1] - time.time() < min_lifetime:
+                self.misses += 1
+                count_cache("presigned_urls", False)
+                return None
+            self._urls.move_to_end(key)
+            self.hits += 1
+            count_cache("presigned_urls", True)
+            return entry[0]
+
+    def set(self, key, url, expires_at):
+        with self._lock:
+            self._urls[key] = (url, expires_at)
+            self._urls.move_to_end(key)
+            while len(self._urls) > self.max_size:
+                self._urls.popitem(last=False)
+
+    def clear(self):
+        with self._lock:
+            self._urls.clear()
+
+    def stats(self):
+        return {"hits": self.hits, "misses": self.misses, "size": len(self._urls)}
+
+
+presigned_url_cache = PresignedUrlCache(PRESIGNED_URL_CACHE_SIZE)
+
+
+def sign_url(file_path, expires_in):
+    with track("s3"), S3_DURATION.labels("GeneratePresignedUrl").time():
+        return s3.generate_presigned_url(
+            'get_object',
+            Params={'Bucket': AWS_STORAGE_BUCKET_NAME, 'Key': file_path},
+            ExpiresIn=expires_in
+        )
 
 
 def generate_presigned_url(file_path, expires_in=90):
-    return s3.generate_presigned_url(
-        'get_object',
-        Params={'Bucket': AWS_STORAGE_BUCKET_NAME, 'Key': file_path},
-        ExpiresIn=expires_in
-    )
+    """
+    Returns a URL valid for at least ``expires_in`` seconds, reusing a cached one when possible.
+    """
+    url = presigned_url_cache.get(file_path, expires_in)
+    if url is None:
+        lifetime = max(expires_in, PRESIGNED_URL_EXPIRES_IN)
+        expires_at = time.time() + lifetime
+        url = sign_url(file_path, lifetime)
+        presigned_url_cache.set(file_path, url, expires_at)
+    return url
+
+
+def generate_presigned_urls(file_paths, expires_in=90):
+    """
+    Batch variant for whole pages: file path -> URL, signing each distinct key at most once.
+    """
+    return {file_path: generate_presigned_url(file_path, expires_in) for file_path in dict.fromkeys(file_paths)}
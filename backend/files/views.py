@@ -3,7 +3,9 @@ from rest_framework.generics import CreateAPIView, ListAPIView
 from rest_framework.parsers import FormParser, MultiPartParser
 from rest_framework.permissions import IsAuthenticated
 
+from api.mixins import ConditionalListMixin
 from api.permissions import CreatedByPermission
+from config.settings import DICTIONARY_CACHE_MAX_AGE
 from .models import File, FileType
 from .serializers import FileSerializer, FilePhotoSerializer, FileTypeSerializer
 
@@ -41,7 +43,9 @@ class UserPhotoUploadCreateAPIView(CreateAPIView):
         user.save()
 
 
-class FileTypeListAPIView(ListAPIView):
+class FileTypeListAPIView(ConditionalListMixin, ListAPIView):
     queryset = FileType.objects.all()
     serializer_class = FileTypeSerializer
     permission_classes = [IsAuthenticated]
+    etag_namespaces = ("file_types",)
+    cache_control = {"private": True, "max_age": DICTIONARY_CACHE_MAX_AGE}
@@ -0,0 +1,11 @@
+from api.autocomplete import PrefixIndex
+from .models import TagTranslation
+
+
+def load_tags(ids):
+    translations = TagTranslation.objects.all() if ids is None else TagTranslation.objects.filter(tag_id__in=ids)
+    for tag_id, language_code, name in translations.values_list("tag_id", "language_code", "name"):
+        yield tag_id, language_code, name, (len(name), name.casefold())  # shortest, then alphabetical
+
+
+tag_index = PrefixIndex("autocomplete:tags", load_tags)
@@ -0,0 +1,24 @@
+# Generated by Django 5.0.7 on 2026-10-18 02:58
+
+import django.contrib.postgres.indexes
+from django.contrib.postgres.operations import TrigramExtension
+from django.db import migrations
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('tags', '0004_alter_taggrouptranslation_unique_together_and_more'),
+    ]
+
+    operations = [
+        TrigramExtension(),
+        migrations.AddIndex(
+            model_name='taggrouptranslation',
+            index=django.contrib.postgres.indexes.GinIndex(fields=['name'], name='tag_groups_name_trgm_idx', opclasses=['gin_trgm_ops']),
+        ),
+        migrations.AddIndex(
+            model_name='tagtranslation',
+            index=django.contrib.postgres.indexes.GinIndex(fields=['name'], name='tags_name_trgm_idx', opclasses=['gin_trgm_ops']),
+        ),
+    ]
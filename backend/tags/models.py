@@ -1,3 +1,4 @@
+from django.contrib.postgres.indexes import GinIndex
 from django.db import models
 
 from config.settings import LANGUAGE_CHOICES
@@ -16,6 +17,9 @@ class TagGroupTranslation(models.Model):
     class Meta:
         db_table = 'tags_groups_translations'
         unique_together = (("tag_group", "language_code"),)
+        indexes = [
+            GinIndex(fields=["name"], name="tag_groups_name_trgm_idx", opclasses=["gin_trgm_ops"]),
+        ]
 
 
 
@@ -34,3 +38,6 @@ class TagTranslation(models.Model):
     class Meta:
         db_table = 'tags_translations'
         unique_together = (("tag", "language_code"),)
+        indexes = [
+            GinIndex(fields=["name"], name="tags_name_trgm_idx", opclasses=["gin_trgm_ops"]),
+        ]
@@ -0,0 +1,22 @@
+from django.db import transaction
+from django.db.models.signals import post_save, post_delete
+from django.dispatch import receiver
+
+from api.bulk import bulk_loaded
+from api.cache import bump_version_on_change
+from api.translations import invalidate_translations_on_change
+from .autocomplete import tag_index
+from .models import Tag, TagGroup, TagTranslation
+
+invalidate_translations_on_change(Tag, TagGroup)
+bump_version_on_change("tags", Tag, TagGroup)
+
+
+@receiver([post_save, post_delete], sender=TagTranslation)
+def tag_translation_changed(sender, instance, **kwargs):
+    transaction.on_commit(lambda: tag_index.update([instance.tag_id]))
+
+
+@receiver(bulk_loaded, sender=TagTranslation)
+def tag_translations_loaded(sender, **kwargs):
+    transaction.on_commit(tag_index.invalidate)
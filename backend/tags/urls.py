@@ -1,10 +1,11 @@
 from django.urls import path, include
 
-from tags.views import TagGroupViewSet, TagCreateAPIView
+from tags.views import TagGroupViewSet, TagCreateAPIView, TagAutocompleteAPIView
 
 urlpatterns = [
     path("", include([
         path("", TagCreateAPIView.as_view(), name="tag-create"),
+        path("autocomplete/", TagAutocompleteAPIView.as_view(), name="tags-autocomplete"),
         path("groups/", include([
             path(
                 "",
@@ -1,10 +1,15 @@
-from django.db.models import Prefetch, Q
+from django.db.models import Prefetch, Q, OuterRef
+from django.db.models.functions import Greatest
 from drf_spectacular.utils import extend_schema, OpenApiParameter
 from rest_framework import viewsets
 from rest_framework.generics import CreateAPIView
 
-from api.utils import get_language_code
-from .models import TagGroup, Tag, TagGroupTranslation, TagTranslation
+from api.autocomplete import AutocompleteAPIView
+from api.mixins import ConditionalListMixin
+from api.search import get_matching_ids, get_similarity
+from api.translations import get_translations_namespace
+from .autocomplete import tag_index
+from .models import TagGroup, Tag, TagTranslation, TagGroupTranslation
 from .serializers import TagGroupSerializer, TagSerializer
 
 @extend_schema(
@@ -17,38 +22,44 @@ from .serializers import TagGroupSerializer, TagSerializer
         ),
     ]
 )
-class TagGroupViewSet(viewsets.ModelViewSet):
+class TagGroupViewSet(ConditionalListMixin, viewsets.ModelViewSet):
     queryset = TagGroup.objects.none()  # mock for swagger
     serializer_class = TagGroupSerializer
+    etag_namespaces = ("tags", get_translations_namespace(Tag), get_translations_namespace(TagGroup))
 
     def get_queryset(self):
-        language_code = get_language_code()
         search = self.request.query_params.get('search', '')
 
         if not search:
             return TagGroup.objects.prefetch_related(
-                Prefetch("translations", TagGroupTranslation.objects.filter(language_code=language_code)),
-                Prefetch("tags", Tag.objects.prefetch_related(
-                    Prefetch("translations", TagTranslation.objects.filter(language_code=language_code)),
-                ).order_by("id"))
+                Prefetch("tags", Tag.objects.order_by("id"))
             ).order_by("id")
 
+        # matching ids as IN subqueries, so neither query joins translations or needs DISTINCT
+        tag_ids = get_matching_ids(TagTranslation, "tag_id", search)
+        group_ids = get_matching_ids(TagGroupTranslation, "tag_group_id", search)
+        tags = Tag.objects.filter(
+            Q(id__in=tag_ids) | Q(group_id__in=group_ids)
+        ).annotate(
+            similarity=get_similarity(TagTranslation, search, tag=OuterRef("pk"))
+        ).order_by("-similarity", "id")
+
         return (
-            TagGroup.objects.
-            filter(Q(tags__translations__name__icontains=search) | Q(translations__name__icontains=search))
-            .prefetch_related(
-                Prefetch("translations", TagGroupTranslation.objects.filter(language_code=language_code)),
-                Prefetch("tags", Tag.objects.filter(
-                    Q(translations__name__icontains=search) | Q(group__translations__name__icontains=search)
-                ).prefetch_related(
-                    Prefetch("translations", TagTranslation.objects.filter(language_code=language_code)),
-                ).order_by("id").distinct())
-            )
-            .order_by("id")
-            .distinct()
+            TagGroup.objects
+            .filter(Q(id__in=group_ids) | Q(id__in=Tag.objects.filter(id__in=tag_ids).values("group_id")))
+            .annotate(similarity=Greatest(
+                get_similarity(TagGroupTranslation, search, tag_group=OuterRef("pk")),
+                get_similarity(TagTranslation, search, tag__group=OuterRef("pk")),
+            ))
+            .prefetch_related(Prefetch("tags", tags))
+            .order_by("-similarity", "id")
         )
 
 
 class TagCreateAPIView(CreateAPIView):
     queryset = Tag.objects.all()
     serializer_class = TagSerializer
+
+
+class TagAutocompleteAPIView(AutocompleteAPIView):
+    index = tag_index
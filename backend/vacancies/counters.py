@@ -0,0 +1,56 @@
+from django.db.models import F, Count
+
+from .models import Application, VacancyApplicationCounter
+
+BATCH_SIZE = 5000
+
+
+def change_count(vacancy_id, status_id, delta):
+    """
+    Adds delta to the vacancy's counter for the status, inside the caller's transaction.
+    """
+    counters = VacancyApplicationCounter.objects.filter(vacancy_id=vacancy_id, status_id=status_id)
+    if counters.update(count=F("count") + delta) or delta < 0:
+        # a missing row is not created on decrement: its vacancy is being deleted or the counter is repaired later
+        return
+    counter, created = VacancyApplicationCounter.objects.get_or_create(
+        vacancy_id=vacancy_id, status_id=status_id, defaults={"count": delta}
+    )
+    if not created:
+        counters.update(count=F("count") + delta)
+
+
+def get_actual_counts(**filters):
+    return {
+        (row["vacancy_id"], row["status_id"]): row["count"]
+        for row in Application.objects.filter(**filters)
+        .values("vacancy_id", "status_id").annotate(count=Count("id")).order_by()
+    }
+
+
+def get_stored_counts(**filters):
+    return {
+        (vacancy_id, status_id): count
+        for vacancy_id, status_id, count in VacancyApplicationCounter.objects.filter(**filters)
+        .values_list("vacancy_id", "status_id", "count")
+    }
+
+
+def find_counter_drift(**filters):
+    """
+    Returns [(vacancy_id, status_id, actual, stored)] for every counter that disagrees with the applications.
+    """
+    actual, stored = get_actual_counts(**filters), get_stored_counts(**filters)
+    return [
+        (*key, actual.get(key, 0), stored.get(key, 0))
+        for key in sorted(actual.keys() | stored.keys())
+        if actual.get(key, 0) != stored.get(key, 0)
+    ]
+
+
+def repair_counters(drift):
+    VacancyApplicationCounter.objects.bulk_create(
+        [VacancyApplicationCounter(vacancy_id=vacancy_id, status_id=status_id, count=actual)
+         for vacancy_id, status_id, actual, _ in drift],
+        update_conflicts=True, unique_fields=["vacancy", "status"], update_fields=["count"], batch_size=BATCH_SIZE,
+    )
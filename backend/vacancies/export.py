@@ -0,0 +1,106 @@
+import csv
+import json
+
+from django.core.serializers.json import DjangoJSONEncoder
+
+from api.utils import iter_chunks
+from files.models import File
+from .models import Application, ApplicationAnswer
+
+CHUNK_SIZE = 2000
+# spreadsheets run a cell starting with one of these as a formula
+FORMULA_PREFIXES = ("=", "+", "-", "@", "\t", "\r")
+
+APPLICATION_FIELDS = {
+    "id": "id",
+    "created_at": "created_at",
+    "status": "status__name",
+    "email": "created_by__email",
+    "first_name": "created_by__first_name",
+    "last_name": "created_by__last_name",
+    "phone_number": "created_by__phone_number",
+    "contacts": "created_by__contacts",
+}
+
+
+class Echo:
+    """
+    File-like object whose write() returns the line, so csv.writer can feed a streaming response.
+    """
+
+    def write(self, value):
+        return value
+
+
+def escape_formula(value):
+    """
+    Keeps a text cell from running as a spreadsheet formula by prefixing it with a quote.
+    """
+    if isinstance(value, str) and value.startswith(FORMULA_PREFIXES):
+        return f"'{value}"
+    return value
+
+
+def iter_applications(vacancy, chunk_size=CHUNK_SIZE):
+    """
+    Yields the vacancy's applications as dicts with an ``answers`` mapping of question id -> value.
+    Rows come from a server-side cursor; answers and file names are loaded per chunk,
+    so memory stays bounded by ``chunk_size`` whatever the number of applications.
+    """
+    rows = (
+        Application.objects.filter(vacancy=vacancy)
+        .order_by("created_at", "id")
+        .values_list(*APPLICATION_FIELDS.values())
+        .iterator(chunk_size=chunk_size)
+    )
+    for chunk in iter_chunks(rows, chunk_size):
+        applications = {row[0]: dict(zip(APPLICATION_FIELDS, row), answers={}) for row in chunk}
+
+        answers = list(ApplicationAnswer.objects.filter(application_id__in=applications).values_list(
+            "application_id", "answer__question_id", "answer__question__type__name", "answer__value"
+        ))
+        file_ids = {
+            file_id for *_, type_name, value in answers if type_name == "FILE" and isinstance(value, list)
+            for file_id in value
+        }
+        file_names = dict(File.objects.filter(id__in=file_ids).values_list("id", "user_filename")) if file_ids else {}
+
+        for application_id, question_id, type_name, value in answers:
+            if type_name == "FILE" and isinstance(value, list):
+                value = [file_names[file_id] for file_id in value if file_id in file_names]
+            applications[application_id]["answers"][question_id] = value
+
+        yield from applications.values()
+
+
+def stream_csv(vacancy, questions):
+    """
+    The applications as CSV rows. Candidates write the names and answers, so every text cell is escaped with
+    escape_formula() before a recruiter opens the file in a spreadsheet.
+    """
+    writer = csv.writer(Echo())
+    yield writer.writerow([*APPLICATION_FIELDS, *(escape_formula(question.name) for question in questions)])
+    for application in iter_applications(vacancy):
+        answers = application.pop("answers")
+        row = [*application.values()]
+        row[-1] = json.dumps(row[-1])  # contacts
+        for question in questions:
+            value = answers.get(question.id, "")
+            row.append("; ".join(value) if isinstance(value, list) else value)
+        yield writer.writerow([escape_formula(value) for value in row])
+
+
+def stream_ndjson(vacancy, questions):
+    for application in iter_applications(vacancy):
+        answers = application["answers"]
+        application["answers"] = [
+            {"question": question.name, "value": answers[question.id]}
+            for question in questions if question.id in answers
+        ]
+        yield json.dumps(application, cls=DjangoJSONEncoder) + "\n"
+
+
+EXPORT_FORMATS = {
+    "csv": ("text/csv", stream_csv),
+    "ndjson": ("application/x-ndjson", stream_ndjson),
+}
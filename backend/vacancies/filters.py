@@ -1,6 +1,14 @@
 import django_filters
-from django.db.models import Count, Q
-from .models import Vacancy
+from django.contrib.postgres.search import SearchQuery, SearchRank
+from django.db import connection
+from django.db.models import Count, Q, F, FloatField
+from django.db.models.functions import Cast
+from rest_framework.filters import SearchFilter, OrderingFilter
+
+from api.utils import get_language_code
+from config.settings import SEARCH_CONFIGS
+from .lookups import application_statuses
+from .models import Vacancy, Application
 
 class VacancyFilter(django_filters.FilterSet):
     tags = django_filters.CharFilter(method='filter_tags_and_order',
@@ -26,3 +34,57 @@ class VacancyFilter(django_filters.FilterSet):
                 distinct=True
             )
         ).filter(match_count__gt=0).order_by('-match_count')
+
+
+class VacancySearchFilter(SearchFilter):
+    """
+    Full-text search over the stored Vacancy.search_vector column, ranked by relevance.
+    Falls back to the regular ``search_fields`` lookup on databases other than PostgreSQL.
+    """
+
+    def filter_queryset(self, request, queryset, view):
+        if connection.vendor != "postgresql":
+            return super().filter_queryset(request, queryset, view)
+
+        search = request.query_params.get(self.search_param, "").strip()
+        if not search:
+            return queryset
+
+        query = SearchQuery(search, config=SEARCH_CONFIGS[get_language_code()], search_type="websearch")
+        return (
+            queryset
+            .filter(search_vector=query)
+            # float8, so the rank survives a round trip through a keyset pagination cursor
+            .annotate(search_rank=Cast(SearchRank(F("search_vector"), query), FloatField()))
+            .order_by("-search_rank", *queryset.query.order_by)
+        )
+
+
+class ApplicationFilter(django_filters.FilterSet):
+    status = django_filters.MultipleChoiceFilter(
+        choices=lambda: [(status.name, status.name) for status in application_statuses.all()],
+        method="filter_status", label="status (name, repeatable)"
+    )
+    created_after = django_filters.IsoDateTimeFilter(field_name="created_at", lookup_expr="gte")
+    created_before = django_filters.IsoDateTimeFilter(field_name="created_at", lookup_expr="lt")
+
+    class Meta:
+        model = Application
+        fields = ["status", "created_after", "created_before"]
+
+    def filter_status(self, queryset, name, value):
+        # by id, so the (vacancy, status, created_at) index serves the filter without a join
+        if not value:
+            return queryset
+        return queryset.filter(status_id__in=[application_statuses.get_by_slug(name).pk for name in value])
+
+
+class ApplicationOrderingFilter(OrderingFilter):
+    ordering_fields = ("created_at", "status")
+
+    def get_ordering(self, request, queryset, view):
+        ordering = super().get_ordering(request, queryset, view)
+        # keyset cursors store plain values, so the status is ordered (and compared) by its id
+        return ordering and [
+            f"{field}_id" if field.lstrip("-") == "status" else field for field in ordering
+        ]
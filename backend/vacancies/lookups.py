@@ -0,0 +1,4 @@
+from api.lookups import LookupTable
+from .models import ApplicationStatus
+
+application_statuses = LookupTable(ApplicationStatus, "application_statuses")
@@ -0,0 +1,88 @@
+import time
+import tracemalloc
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db import transaction
+
+from accounts.models import User, Role
+from vacancies.export import EXPORT_FORMATS
+from vacancies.models import Vacancy, Application, ApplicationStatus, ApplicationAnswer
+from vacancies_templates.models import ApplicationTemplate, Question, QuestionType, Answer
+
+BATCH_SIZE = 5000
+
+
+class Rollback(Exception):
+    pass
+
+
+class Command(BaseCommand):
+    help = "Stream an export of synthetic applications and fail if the peak Python memory exceeds the budget"
+
+    def add_arguments(self, parser):
+        parser.add_argument("--applications", type=int, default=100_000)
+        parser.add_argument("--budget-mb", type=float, default=32)
+
+    def handle(self, *args, **options):
+        try:
+            with transaction.atomic():
+                vacancy, questions = self.generate(options["applications"])
+                results = {output: self.measure(stream, vacancy, questions)
+                           for output, (_, stream) in EXPORT_FORMATS.items()}
+                raise Rollback
+        except Rollback:
+            pass
+
+        for output, (rows, size, seconds, peak) in results.items():
+            self.stdout.write(f"{output:7} {rows} rows, {size / 2 ** 20:8.1f} MB in {seconds:6.2f} s, "
+                              f"peak memory {peak / 2 ** 20:6.1f} MB")
+
+        over_budget = [output for output, (*_, peak) in results.items() if peak > options["budget_mb"] * 2 ** 20]
+        if over_budget:
+            raise CommandError(f"Peak memory over {options['budget_mb']} MB for: {', '.join(over_budget)}")
+
+    def generate(self, count):
+        role = Role.objects.get_or_create(name="benchmark", defaults={"hidden": True})[0]
+        recruiter = User.objects.create(email="benchmark@example.com", role=role)
+        template = ApplicationTemplate.objects.create(name="benchmark", created_by=recruiter)
+        question = Question.objects.create(
+            name="Why us?", type=QuestionType.objects.get(name="SHORT_TEXT"), application_template=template,
+            max_length=100
+        )
+        vacancy = Vacancy.objects.create(name="benchmark", description="benchmark", work_format="REMOTE",
+                                         application_template=template, created_by=recruiter)
+        status = ApplicationStatus.objects.get(pk=1)
+
+        for start in range(0, count, BATCH_SIZE):
+            size = min(BATCH_SIZE, count - start)
+            users = User.objects.bulk_create([
+                User(email=f"benchmark-{start + i}@example.com", first_name="Candidate", last_name=str(start + i),
+                     role=role, contacts={"telegram": f"@candidate{start + i}"})
+                for i in range(size)
+            ])
+            applications = Application.objects.bulk_create([
+                Application(vacancy=vacancy, status=status, created_by=user) for user in users
+            ])
+            answers = Answer.objects.bulk_create([
+                Answer(question=question, value="Because of the team", application_created=True) for _ in users
+            ])
+            ApplicationAnswer.objects.bulk_create([
+                ApplicationAnswer(application=application, answer=answer)
+                for application, answer in zip(applications, answers)
+            ])
+
+        self.stdout.write(f"Generated {count} applications.")
+        return vacancy, [question]
+
+    @staticmethod
+    def measure(stream, vacancy, questions):
+        rows = size = 0
+        tracemalloc.start()
+        start = time.perf_counter()
+        for line in stream(vacancy, questions):
+            rows += 1
+            size += len(line)
+        seconds = time.perf_counter() - start
+        peak = tracemalloc.get_traced_memory()[1]
+        tracemalloc.stop()
+        return rows, size, seconds, peak
@@ -0,0 +1,99 @@
+import random
+import statistics
+import time
+
+from django.contrib.postgres.search import SearchQuery, SearchRank
+from django.core.management.base import BaseCommand
+from django.db import transaction, connection
+from django.db.models import Q, F
+
+from accounts.models import User, Role
+from config.settings import SEARCH_CONFIGS
+from vacancies.models import Vacancy
+from vacancies_templates.models import ApplicationTemplate
+
+WORDS = {
+    "en": ["python", "developer", "engineer", "senior", "junior", "backend", "frontend", "manager", "designer",
+           "analyst", "remote", "office", "team", "product", "data", "cloud", "testing", "support", "sales",
+           "marketing", "accountant", "teacher", "driver", "nurse", "lawyer", "experience", "salary", "growth"],
+    "uk": ["розробник", "інженер", "менеджер", "дизайнер", "аналітик", "бухгалтер", "вчитель", "водій",
+           "медсестра", "юрист", "досвід", "зарплата", "команда", "офіс", "віддалено", "продукт", "дані",
+           "підтримка", "продажі", "маркетинг", "тестування", "хмара", "зростання", "навчання"],
+}
+
+
+class Rollback(Exception):
+    pass
+
+
+class Command(BaseCommand):
+    help = "Compare the full-text vacancy search with the ILIKE SearchFilter on a synthetic vacancy set"
+
+    def add_arguments(self, parser):
+        parser.add_argument("--vacancies", type=int, default=100_000)
+        parser.add_argument("--repeat", type=int, default=5)
+        parser.add_argument("--seed", type=int, default=42)
+
+    def handle(self, *args, **options):
+        try:
+            with transaction.atomic():
+                self.generate(options["vacancies"], random.Random(options["seed"]))
+                for language_code, words in WORDS.items():
+                    for term in words[::6]:
+                        self.compare(language_code, term, options["repeat"])
+                raise Rollback
+        except Rollback:
+            pass
+
+    def generate(self, count, rnd):
+        role = Role.objects.get_or_create(name="benchmark", defaults={"hidden": True})[0]
+        user = User.objects.create(email="benchmark@example.com", role=role)
+        template = ApplicationTemplate.objects.create(name="benchmark", created_by=user)
+
+        # Zipf-like word frequencies, so the benchmark covers both common and selective terms
+        weights = {language_code: [1 / rank for rank in range(1, len(words) + 1)]
+                   for language_code, words in WORDS.items()}
+
+        def text(language_code, length):
+            return " ".join(rnd.choices(WORDS[language_code], weights[language_code], k=length))
+
+        batch = []
+        for i in range(count):
+            language_code = "en" if i % 2 else "uk"
+            batch.append(Vacancy(name=text(language_code, 4), description=text(language_code, 40),
+                                 work_format="REMOTE", application_template=template, created_by=user))
+            if len(batch) == 5000:
+                Vacancy.objects.bulk_create(batch)
+                batch = []
+        Vacancy.objects.bulk_create(batch)
+
+        with connection.cursor() as cursor:
+            cursor.execute("ANALYZE vacancies")
+        self.stdout.write(f"Generated {count} vacancies.")
+
+    def compare(self, language_code, term, repeat):
+        ilike = Vacancy.objects.filter(Q(name__icontains=term) | Q(description__icontains=term)).order_by("-created_at")
+
+        query = SearchQuery(term, config=SEARCH_CONFIGS[language_code], search_type="websearch")
+        full_text = (
+            Vacancy.objects.filter(search_vector=query)
+            .annotate(search_rank=SearchRank(F("search_vector"), query))
+            .order_by("-search_rank", "-created_at")
+        )
+
+        ilike_ms, ilike_count = self.measure(ilike, repeat)
+        full_text_ms, full_text_count = self.measure(full_text, repeat)
+        self.stdout.write(
+            f"[{language_code}] {term!r}: ILIKE {ilike_ms:.1f} ms ({ilike_count} rows), "
+            f"full-text {full_text_ms:.1f} ms ({full_text_count} rows)"
+        )
+
+    @staticmethod
+    def measure(queryset, repeat):
+        timings = []
+        for _ in range(repeat):
+            start = time.perf_counter()
+            count = queryset.count()
+            list(queryset[:15])
+            timings.append((time.perf_counter() - start) * 1000)
+        return statistics.median(timings), count
@@ -0,0 +1,44 @@
+from django.core.management.base import BaseCommand, CommandError
+
+from accounts.models import UserTag
+from vacancies.matching import rebuild_all_scores, rebuild_user_scores, check_user_scores
+
+
+class Command(BaseCommand):
+    help = "Rebuild the materialized user-vacancy match scores, or check them against the SQL formula"
+
+    def add_arguments(self, parser):
+        parser.add_argument("--user", type=int, action="append", dest="users",
+                            help="Limit to the given user id (may be repeated)")
+        parser.add_argument("--check", action="store_true",
+                            help="Only compare the stored scores with the SQL formula, do not rebuild")
+
+    def handle(self, *args, **options):
+        user_ids = options["users"]
+
+        if options["check"]:
+            self.check(user_ids)
+            return
+
+        if user_ids:
+            for user_id in user_ids:
+                rebuild_user_scores(user_id)
+        else:
+            rebuild_all_scores()
+        self.stdout.write(self.style.SUCCESS("Match scores rebuilt."))
+
+    def check(self, user_ids):
+        if not user_ids:
+            user_ids = UserTag.objects.values_list("user_id", flat=True).distinct().order_by("user_id")
+
+        inconsistent_users = 0
+        for user_id in user_ids:
+            mismatches = check_user_scores(user_id)
+            if mismatches:
+                inconsistent_users += 1
+                for vacancy_id, expected, stored in mismatches:
+                    self.stdout.write(f"user={user_id} vacancy={vacancy_id} expected={expected} stored={stored}")
+
+        if inconsistent_users:
+            raise CommandError(f"Match scores are inconsistent for {inconsistent_users} user(s).")
+        self.stdout.write(self.style.SUCCESS("Match scores are consistent."))
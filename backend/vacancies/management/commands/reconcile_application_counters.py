@@ -0,0 +1,30 @@
+from django.core.management.base import BaseCommand, CommandError
+from django.db import transaction
+
+from vacancies.counters import find_counter_drift, repair_counters
+
+
+class Command(BaseCommand):
+    help = "Compare the per-vacancy application counters with the applications and repair any drift"
+
+    def add_arguments(self, parser):
+        parser.add_argument("--vacancy", type=int, action="append", dest="vacancies",
+                            help="Limit to the given vacancy id (may be repeated)")
+        parser.add_argument("--check", action="store_true", help="Only report the drift, do not repair it")
+
+    def handle(self, *args, **options):
+        filters = {"vacancy_id__in": options["vacancies"]} if options["vacancies"] else {}
+
+        with transaction.atomic():
+            drift = find_counter_drift(**filters)
+            for vacancy_id, status_id, actual, stored in drift:
+                self.stdout.write(f"vacancy={vacancy_id} status={status_id} actual={actual} stored={stored}")
+
+            if drift and options["check"]:
+                raise CommandError(f"{len(drift)} application counter(s) drifted.")
+            if drift:
+                repair_counters(drift)
+
+        self.stdout.write(self.style.SUCCESS(
+            f"Repaired {len(drift)} application counter(s)." if drift else "Application counters are consistent."
+        ))
@@ -0,0 +1,17 @@
+from django.core.management.base import BaseCommand
+from django.db import connection
+
+
+class Command(BaseCommand):
+    help = "Rebuild the vacancy full-text search index and refresh planner statistics"
+
+    def add_arguments(self, parser):
+        parser.add_argument("--concurrently", action="store_true",
+                            help="Rebuild without locking writes to the vacancies table")
+
+    def handle(self, *args, **options):
+        concurrently = " CONCURRENTLY" if options["concurrently"] else ""
+        with connection.cursor() as cursor:
+            cursor.execute(f"REINDEX INDEX{concurrently} vacancies_search_vector_idx")
+            cursor.execute("ANALYZE vacancies")
+        self.stdout.write(self.style.SUCCESS("Vacancy search index rebuilt."))
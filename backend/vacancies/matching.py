@@ -0,0 +1,132 @@
+import math
+from functools import partial
+
+from django.db import transaction, connection
+from django.db.models import OuterRef, ExpressionWrapper, F, Subquery, FloatField, Sum
+
+from accounts.models import UserTag
+from .models import Vacancy, VacancyTag, VacancyMatchScore
+
+BATCH_SIZE = 5000
+
+
+def get_match_score_subquery(user):
+    """
+    Reference formula of the personalized feed, evaluated per vacancy (OuterRef('pk')).
+    The materialized store must always agree with it.
+    """
+    user_tags_qs = UserTag.objects.filter(user=user).values('tag')
+
+    return (
+        VacancyTag.objects
+        .filter(vacancy=OuterRef('pk'), tag__in=user_tags_qs)
+        .annotate(user_position=Subquery(UserTag.objects.filter(
+            user=user,
+            tag=OuterRef('tag')
+        ).values('position')[:1]))
+        .annotate(weight=ExpressionWrapper(
+            1.0 / F('user_position') + 1.0 / F('position'),
+            output_field=FloatField())
+        )
+        .values('vacancy')
+        .annotate(total=Sum('weight'))
+        .values('total')
+    )
+
+
+def get_match_scores(**filters):
+    return (
+        VacancyTag.objects
+        .filter(vacancy__deleted_at__isnull=True, tag__usertag__isnull=False, **filters)
+        .values("vacancy_id", user_id=F("tag__usertag__user_id"))
+        .annotate(score=Sum(ExpressionWrapper(
+            1.0 / F("tag__usertag__position") + 1.0 / F("position"),
+            output_field=FloatField()
+        )))
+        .order_by()
+    )
+
+
+def _bulk_create_scores(rows):
+    def flush(batch):
+        # upsert, so concurrent rebuilds of the same user or vacancy do not collide on the unique key
+        VacancyMatchScore.objects.bulk_create(
+            batch, update_conflicts=True, unique_fields=["user", "vacancy"], update_fields=["score"]
+        )
+
+    batch = []
+    for row in rows:
+        batch.append(VacancyMatchScore(user_id=row["user_id"], vacancy_id=row["vacancy_id"], score=row["score"]))
+        if len(batch) >= BATCH_SIZE:
+            flush(batch)
+            batch = []
+    if batch:
+        flush(batch)
+
+
+def rebuild_user_scores(user_id):
+    with transaction.atomic():
+        VacancyMatchScore.objects.filter(user_id=user_id).delete()
+        _bulk_create_scores(get_match_scores(tag__usertag__user_id=user_id))
+
+
+def rebuild_vacancy_scores(vacancy_id):
+    with transaction.atomic():
+        VacancyMatchScore.objects.filter(vacancy_id=vacancy_id).delete()
+        _bulk_create_scores(get_match_scores(vacancy_id=vacancy_id))
+
+
+def delete_vacancy_scores(vacancy_id):
+    VacancyMatchScore.objects.filter(vacancy_id=vacancy_id).delete()
+
+
+def rebuild_all_scores():
+    """
+    Recomputes the whole store inside the database with one INSERT ... SELECT over the get_match_scores() query.
+    """
+    sql, params = get_match_scores().values_list("vacancy_id", "user_id", "score").query.sql_with_params()
+    table = VacancyMatchScore._meta.db_table
+    with transaction.atomic(), connection.cursor() as cursor:
+        cursor.execute(f"DELETE FROM {table}")
+        cursor.execute(f"INSERT INTO {table} (vacancy_id, user_id, score) {sql}", params)
+
+
+def _schedule_once(key, func, *args):
+    """
+    on_commit(func(*args)), unless a callback with the same key is already pending in the current transaction,
+    so a bulk change to many rows of one user or vacancy rebuilds it once.
+    """
+    connection = transaction.get_connection()
+    if any(getattr(callback, "rebuild_key", None) == key for _, callback, *_ in connection.run_on_commit):
+        return
+    callback = partial(func, *args)
+    callback.rebuild_key = key
+    transaction.on_commit(callback)
+
+
+def schedule_user_rebuild(user_id):
+    _schedule_once(("user", user_id), rebuild_user_scores, user_id)
+
+
+def schedule_vacancy_rebuild(vacancy_id):
+    _schedule_once(("vacancy", vacancy_id), rebuild_vacancy_scores, vacancy_id)
+
+
+def check_user_scores(user_id):
+    """
+    Returns (vacancy_id, expected, stored) for every vacancy where the store disagrees with the SQL formula.
+    """
+    expected = dict(
+        Vacancy.objects
+        .annotate(match_score=Subquery(get_match_score_subquery(user_id), output_field=FloatField()))
+        .filter(match_score__isnull=False)
+        .values_list("id", "match_score")
+    )
+    stored = dict(VacancyMatchScore.objects.filter(user_id=user_id).values_list("vacancy_id", "score"))
+
+    mismatches = []
+    for vacancy_id in expected.keys() | stored.keys():
+        expected_score, stored_score = expected.get(vacancy_id), stored.get(vacancy_id)
+        if expected_score is None or stored_score is None or not math.isclose(expected_score, stored_score):
+            mismatches.append((vacancy_id, expected_score, stored_score))
+    return mismatches
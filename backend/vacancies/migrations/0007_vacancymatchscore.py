@@ -0,0 +1,52 @@
+# Generated by Django 5.0.7 on 2026-10-18 02:37
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+from django.db.models import ExpressionWrapper, F, FloatField, Sum
+
+
+def populate_match_scores(apps, schema_editor):
+    VacancyTag = apps.get_model('vacancies', 'VacancyTag')
+    VacancyMatchScore = apps.get_model('vacancies', 'VacancyMatchScore')
+
+    rows = (
+        VacancyTag.objects
+        .filter(vacancy__deleted_at__isnull=True, tag__usertag__isnull=False)
+        .values('vacancy_id', user_id=F('tag__usertag__user_id'))
+        .annotate(score=Sum(ExpressionWrapper(
+            1.0 / F('tag__usertag__position') + 1.0 / F('position'),
+            output_field=FloatField()
+        )))
+        .order_by()
+    )
+    VacancyMatchScore.objects.bulk_create(
+        [VacancyMatchScore(user_id=row['user_id'], vacancy_id=row['vacancy_id'], score=row['score']) for row in rows],
+        batch_size=5000,
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('vacancies', '0006_applicationnote_created_at_and_more'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='VacancyMatchScore',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('score', models.FloatField()),
+                ('user', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='vacancy_match_scores', to=settings.AUTH_USER_MODEL)),
+                ('vacancy', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='match_scores', to='vacancies.vacancy')),
+            ],
+            options={
+                'db_table': 'vacancies_match_scores',
+                'indexes': [models.Index(fields=['user', '-score', '-vacancy'], name='vacancies_match_user_score_idx')],
+                'unique_together': {('user', 'vacancy')},
+            },
+        ),
+        migrations.RunPython(populate_match_scores, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,36 @@
+# Generated by Django 5.0.7 on 2026-10-18 02:40
+
+import django.contrib.postgres.indexes
+import django.contrib.postgres.search
+from django.db import migrations, models
+
+# Starts as a copy of "simple"; can be altered later to use a Ukrainian hunspell dictionary without code changes.
+CREATE_UKRAINIAN_CONFIG = """
+DO $$
+BEGIN
+    IF NOT EXISTS (SELECT 1 FROM pg_ts_config WHERE cfgname = 'ukrainian') THEN
+        CREATE TEXT SEARCH CONFIGURATION ukrainian (COPY = simple);
+    END IF;
+END
+$$;
+"""
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('vacancies', '0007_vacancymatchscore'),
+    ]
+
+    operations = [
+        migrations.RunSQL(CREATE_UKRAINIAN_CONFIG, "DROP TEXT SEARCH CONFIGURATION IF EXISTS ukrainian;"),
+        migrations.AddField(
+            model_name='vacancy',
+            name='search_vector',
+            field=models.GeneratedField(db_persist=True, expression=django.contrib.postgres.search.CombinedSearchVector(django.contrib.postgres.search.CombinedSearchVector(django.contrib.postgres.search.SearchVector('name', config='english', weight='A'), '||', django.contrib.postgres.search.SearchVector('description', config='english', weight='B'), django.contrib.postgres.search.SearchConfig('english')), '||', django.contrib.postgres.search.CombinedSearchVector(django.contrib.postgres.search.SearchVector('name', config='ukrainian', weight='A'), '||', django.contrib.postgres.search.SearchVector('description', config='ukrainian', weight='B'), django.contrib.postgres.search.SearchConfig('ukrainian')), django.contrib.postgres.search.SearchConfig('english')), output_field=django.contrib.postgres.search.SearchVectorField()),
+        ),
+        migrations.AddIndex(
+            model_name='vacancy',
+            index=django.contrib.postgres.indexes.GinIndex(fields=['search_vector'], name='vacancies_search_vector_idx'),
+        ),
+    ]
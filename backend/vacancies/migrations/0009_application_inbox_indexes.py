@@ -0,0 +1,21 @@
+# Generated by Django 5.0.7 on 2026-10-18 02:49
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('vacancies', '0008_vacancy_search_vector'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='application',
+            index=models.Index(fields=['vacancy', 'created_at'], name='applications_vac_date_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='application',
+            index=models.Index(fields=['vacancy', 'status', 'created_at'], name='applications_vac_status_idx'),
+        ),
+    ]
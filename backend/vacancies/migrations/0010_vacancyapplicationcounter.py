@@ -0,0 +1,41 @@
+# Generated by Django 5.0.7 on 2026-10-18 02:52
+
+import django.db.models.deletion
+from django.db import migrations, models
+from django.db.models import Count
+
+
+def populate_application_counters(apps, schema_editor):
+    Application = apps.get_model('vacancies', 'Application')
+    VacancyApplicationCounter = apps.get_model('vacancies', 'VacancyApplicationCounter')
+
+    rows = Application.objects.values('vacancy_id', 'status_id').annotate(count=Count('id')).order_by()
+    VacancyApplicationCounter.objects.bulk_create(
+        [VacancyApplicationCounter(vacancy_id=row['vacancy_id'], status_id=row['status_id'], count=row['count'])
+         for row in rows],
+        batch_size=5000,
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('vacancies', '0009_application_inbox_indexes'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='VacancyApplicationCounter',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('count', models.PositiveIntegerField(default=0)),
+                ('status', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, to='vacancies.applicationstatus')),
+                ('vacancy', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='application_counters', to='vacancies.vacancy')),
+            ],
+            options={
+                'db_table': 'vacancies_application_counters',
+                'unique_together': {('vacancy', 'status')},
+            },
+        ),
+        migrations.RunPython(populate_application_counters, migrations.RunPython.noop),
+    ]
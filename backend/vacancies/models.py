@@ -1,4 +1,6 @@
-from django.db import models
+from django.contrib.postgres.indexes import GinIndex
+from django.contrib.postgres.search import SearchVectorField
+from django.db import models, router, transaction
 
 from accounts.models import User
 from api.models import AbstractSoftDeleteModel
@@ -6,6 +8,7 @@ from dict.models import City
 from tags.models import Tag
 from vacancies_templates.models import ApplicationTemplate, Answer
 from .enums import WorkFormat
+from .search import get_search_vector
 
 
 class Vacancy(AbstractSoftDeleteModel):
@@ -17,9 +20,15 @@ class Vacancy(AbstractSoftDeleteModel):
     created_at = models.DateTimeField(auto_now_add=True)
     created_by = models.ForeignKey(User, on_delete=models.CASCADE)
     cities = models.ManyToManyField(City, related_name="vacancies")
+    search_vector = models.GeneratedField(
+        expression=get_search_vector(), output_field=SearchVectorField(), db_persist=True
+    )
 
     class Meta:
         db_table = 'vacancies'
+        indexes = [
+            GinIndex(fields=["search_vector"], name="vacancies_search_vector_idx"),
+        ]
 
 
 class VacancyTag(models.Model):
@@ -33,6 +42,19 @@ class VacancyTag(models.Model):
         unique_together = (('vacancy', 'tag'),)
 
 
+class VacancyMatchScore(models.Model):
+    user = models.ForeignKey(User, on_delete=models.CASCADE, related_name="vacancy_match_scores")
+    vacancy = models.ForeignKey(Vacancy, on_delete=models.CASCADE, related_name="match_scores")
+    score = models.FloatField()
+
+    class Meta:
+        db_table = "vacancies_match_scores"
+        unique_together = (("user", "vacancy"),)
+        indexes = [
+            models.Index(fields=["user", "-score", "-vacancy"], name="vacancies_match_user_score_idx"),
+        ]
+
+
 class ApplicationStatus(models.Model):
     name = models.CharField(max_length=100)
 
@@ -49,6 +71,42 @@ class Application(models.Model):
 
     class Meta:
         db_table = 'vacancies_applications'
+        indexes = [
+            models.Index(fields=["vacancy", "created_at"], name="applications_vac_date_idx"),
+            models.Index(fields=["vacancy", "status", "created_at"], name="applications_vac_status_idx"),
+        ]
+
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        instance = super().from_db(db, field_names, values)
+        # the status as stored, so a status change can move the application between counters
+        instance._loaded_status_id = instance.__dict__.get("status_id")
+        return instance
+
+    def save(self, *args, **kwargs):
+        """
+        Locks the stored row and takes the previous status from it, so concurrent status changes are counted once:
+        the counters are changed by the post_save signal, inside the same transaction.
+        """
+        if self._state.adding or self.pk is None:
+            return super().save(*args, **kwargs)
+        using = kwargs.get("using") or router.db_for_write(type(self), instance=self)
+        with transaction.atomic(using=using, savepoint=False):
+            self._loaded_status_id = (
+                Application.objects.using(using).select_for_update().filter(pk=self.pk)
+                .values_list("status_id", flat=True).first()
+            )
+            super().save(*args, **kwargs)
+
+
+class VacancyApplicationCounter(models.Model):
+    vacancy = models.ForeignKey(Vacancy, on_delete=models.CASCADE, related_name="application_counters")
+    status = models.ForeignKey(ApplicationStatus, on_delete=models.CASCADE)
+    count = models.PositiveIntegerField(default=0)
+
+    class Meta:
+        db_table = "vacancies_application_counters"
+        unique_together = (("vacancy", "status"),)
 
 
 class ApplicationNote(models.Model):
@@ -0,0 +1,17 @@
+from django.contrib.postgres.search import SearchVector
+
+from config.settings import SEARCH_CONFIGS
+
+
+def get_search_vector():
+    """
+    Weighted tsvector over name (A) and description (B), stemmed with every configured language.
+    Changing SEARCH_CONFIGS requires a migration that regenerates Vacancy.search_vector.
+    """
+    vector = None
+    for config in dict.fromkeys(SEARCH_CONFIGS.values()):
+        language_vector = (
+            SearchVector("name", weight="A", config=config) + SearchVector("description", weight="B", config=config)
+        )
+        vector = language_vector if vector is None else vector + language_vector
+    return vector
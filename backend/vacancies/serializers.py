@@ -1,11 +1,17 @@
-from django.db import transaction
+from django.db import models, transaction
 from rest_framework import serializers
 
 from accounts.serializers import UserShortSerializer, UserNameSerializer
+from api.serializers import LookupSlugRelatedField
 from dict.serializers import CitySerializer
 from tags.serializers import TagSerializer
-from vacancies_templates.serializers import AnswerQuestionSerializer
+from vacancies_templates.serializers import AnswerQuestionSerializer, AnswerInputSerializer
+from vacancies_templates.utils import get_answer_files
+from vacancies_templates.validators import ApplicationAnswersValidator
+from .lookups import application_statuses
+from .matching import schedule_vacancy_rebuild
 from .models import Vacancy, Application, ApplicationStatus, ApplicationNote, VacancyTag
+from .utils import get_applied_vacancy_ids, create_application_answers
 
 
 class VacancyTagSerializer(serializers.ModelSerializer):
@@ -15,6 +21,16 @@ class VacancyTagSerializer(serializers.ModelSerializer):
         extra_kwargs = {'vacancy': {'read_only': True}}
 
 
+class VacancyListSerializer(serializers.ListSerializer):
+    def to_representation(self, data):
+        vacancies = list(data.all() if isinstance(data, models.manager.BaseManager) else data)
+        if "is_applied" in self.child.fields:
+            self.child.applied_vacancy_ids = get_applied_vacancy_ids(
+                self.context["request"].user, [vacancy.id for vacancy in vacancies]
+            )
+        return super().to_representation(vacancies)
+
+
 class VacancySerializer(serializers.ModelSerializer):
     tags = VacancyTagSerializer(many=True, write_only=True)
     is_applied = serializers.SerializerMethodField()
@@ -23,6 +39,7 @@ class VacancySerializer(serializers.ModelSerializer):
         model = Vacancy
         fields = ("id", "name", "description", "work_format", "tags", "application_template", "cities", "is_applied")
         extra_kwargs = {'cities': {'write_only': True, "allow_empty": True, "required": False}}
+        list_serializer_class = VacancyListSerializer
 
     def create(self, validated_data):
         tags = validated_data.pop('tags')
@@ -32,12 +49,15 @@ class VacancySerializer(serializers.ModelSerializer):
             instance = super().create(validated_data)
             VacancyTag.objects.bulk_create([VacancyTag(**data, vacancy=instance) for data in tags])
             instance.cities.set(cities)
+            schedule_vacancy_rebuild(instance.id)  # bulk_create does not send post_save
 
         return instance
 
     def get_is_applied(self, instance):
-        return (self.context["request"].user.is_authenticated and
-                self.context["request"].user.applications.filter(vacancy_id=instance.id).exists())
+        applied_vacancy_ids = getattr(self, "applied_vacancy_ids", None)  # resolved for the whole page
+        if applied_vacancy_ids is None:
+            applied_vacancy_ids = get_applied_vacancy_ids(self.context["request"].user, [instance.id])
+        return instance.id in applied_vacancy_ids
 
     def to_representation(self, instance):
         representation = super().to_representation(instance)
@@ -78,48 +98,51 @@ class ApplicationNoteSerializer(serializers.ModelSerializer):
 
 
 class ApplicationCandidateSerializer(serializers.ModelSerializer):
-    answers = AnswerQuestionSerializer(many=True)
+    answers = AnswerInputSerializer(many=True, write_only=True)
 
     class Meta:
         model = Application
         fields = ("vacancy", "answers")
         extra_kwargs = {"created_by": {"read_only": True}}
 
-    def validate_answers(self, answers):
-        for answer in answers:
-            answer["question"] = answer["question"].id
-        return answers
-
     def validate(self, attrs):
         if self.context["request"].user.applications.filter(vacancy=attrs["vacancy"]).exists():
             raise serializers.ValidationError("You already applied!")
+        attrs["answers"] = ApplicationAnswersValidator(attrs["vacancy"].application_template_id).validate(
+            attrs["answers"]
+        )
         return attrs
 
     def create(self, validated_data):
         answers = validated_data.pop("answers")
-        required_question_ids = list(validated_data.get("vacancy").application_template.questions.filter(
-            is_required=True
-        ).values_list("id", flat=True))
-        for answer in answers:
-            if answer["question"] in required_question_ids:
-                required_question_ids.remove(answer["question"])
-        if required_question_ids:
-            raise serializers.ValidationError("Answer required questions.")
-
-        validated_data["status"] = ApplicationStatus.objects.get(pk=1)
+        validated_data["status"] = application_statuses.get(1)
 
         with transaction.atomic():
             instance = super().create(validated_data)
-            answer_serializer = AnswerQuestionSerializer(data=answers, many=True)
-            answer_serializer.is_valid(raise_exception=True)
-            created_answers = answer_serializer.save()
-            instance.answers.set(created_answers)
+            create_application_answers(instance, answers)
 
         return instance
 
+    def to_representation(self, instance):
+        representation = super().to_representation(instance)
+        answers = list(instance.answers.select_related("question"))
+        representation["answers"] = AnswerQuestionSerializer(
+            answers, many=True, context={**self.context, "answer_files": get_answer_files(answers)}
+        ).data
+        return representation
+
+
+class ApplicationListSerializer(serializers.ListSerializer):
+    def to_representation(self, data):
+        applications = list(data.all() if isinstance(data, models.manager.BaseManager) else data)
+        self.context["answer_files"] = get_answer_files(
+            [answer for application in applications for answer in application.answers.all()]
+        )
+        return super().to_representation(applications)
+
 
 class ApplicationRecruiterSerializer(serializers.ModelSerializer):
-    status = serializers.SlugRelatedField(queryset=ApplicationStatus.objects.all(), slug_field="name")
+    status = LookupSlugRelatedField(application_statuses)
     notes = ApplicationNoteSerializer(many=True)
     answers = AnswerQuestionSerializer(many=True)
     created_by = UserShortSerializer(read_only=True)
@@ -127,10 +150,20 @@ class ApplicationRecruiterSerializer(serializers.ModelSerializer):
     class Meta:
         model = Application
         fields = ("id", "status", "notes", "answers", "created_at", "created_by")
+        list_serializer_class = ApplicationListSerializer
+
+
+class ApplicationSummarySerializer(serializers.ModelSerializer):
+    status = LookupSlugRelatedField(application_statuses, read_only=True)
+    created_by = UserShortSerializer(read_only=True)
+
+    class Meta:
+        model = Application
+        fields = ("id", "status", "created_at", "created_by")
 
 
 class ApplicationUpdateSerializer(serializers.ModelSerializer):
-    status = serializers.SlugRelatedField(slug_field="name", queryset=ApplicationStatus.objects.all())
+    status = LookupSlugRelatedField(application_statuses)
     class Meta:
         model = Application
         fields = ("status", )
@@ -143,20 +176,31 @@ class VacancyShortSerializer(serializers.ModelSerializer):
 
 
 class ApplicationSerializer(serializers.ModelSerializer):
-    status = serializers.SlugRelatedField(queryset=ApplicationStatus.objects.all(), slug_field="name")
+    status = LookupSlugRelatedField(application_statuses)
     vacancy = VacancyShortSerializer(read_only=True)
     answers = AnswerQuestionSerializer(many=True)
 
     class Meta:
         model = Application
         fields = ("id", "vacancy", "answers", "status", "created_at")
+        list_serializer_class = ApplicationListSerializer
 
 
 class UserVacancySerializer(VacancySerializer):
-    applied = serializers.IntegerField(read_only=True)
+    applied = serializers.SerializerMethodField()
+    applied_by_status = serializers.SerializerMethodField()
 
     class Meta(VacancySerializer.Meta):
-        fields = ("id", "name", "description", "work_format", "tags", "cities", "applied")
+        fields = ("id", "name", "description", "work_format", "tags", "cities", "applied", "applied_by_status")
+
+    def get_applied(self, instance):
+        return sum(counter.count for counter in instance.application_counters.all())
+
+    def get_applied_by_status(self, instance):
+        return {
+            application_statuses.get(counter.status_id).name: counter.count
+            for counter in instance.application_counters.all()
+        }
 
 
 class VacancyDeletedSerializer(UserVacancySerializer):
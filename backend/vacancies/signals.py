@@ -0,0 +1,57 @@
+from django.db.models.signals import post_save, post_delete
+from django.dispatch import receiver
+
+from accounts.models import UserTag
+from accounts.signals import user_tags_changed
+from api.cache import bump_version_on_change
+from dict.models import City
+from tags.models import Tag
+from .counters import change_count
+from .matching import schedule_user_rebuild, schedule_vacancy_rebuild, delete_vacancy_scores
+from .models import Vacancy, VacancyTag, Application, ApplicationStatus
+
+# the public vacancy responses; tag and city names are versioned with their translations
+bump_version_on_change("vacancies", Vacancy, VacancyTag, Vacancy.cities.through, Tag, City)
+bump_version_on_change("application_statuses", ApplicationStatus)
+
+
+@receiver([post_save, post_delete], sender=UserTag)
+def user_tag_changed(sender, instance, **kwargs):
+    schedule_user_rebuild(instance.user_id)
+
+
+@receiver(user_tags_changed)
+def user_tags_bulk_changed(sender, user_id, **kwargs):
+    schedule_user_rebuild(user_id)
+
+
+@receiver([post_save, post_delete], sender=VacancyTag)
+def vacancy_tag_changed(sender, instance, **kwargs):
+    schedule_vacancy_rebuild(instance.vacancy_id)
+
+
+@receiver(post_save, sender=Vacancy)
+def vacancy_soft_deleted_or_restored(sender, instance, update_fields=None, **kwargs):
+    if not update_fields or "deleted_at" not in update_fields:
+        return
+    if instance.deleted_at:
+        delete_vacancy_scores(instance.id)
+    else:
+        schedule_vacancy_rebuild(instance.id)
+
+
+@receiver(post_save, sender=Application)
+def application_saved(sender, instance, created, **kwargs):
+    # runs inside Application.save(), which locked the row and loaded its previous status
+    previous_status_id = None if created else getattr(instance, "_loaded_status_id", instance.status_id)
+    if previous_status_id == instance.status_id:
+        return
+    if previous_status_id is not None:
+        change_count(instance.vacancy_id, previous_status_id, -1)
+    change_count(instance.vacancy_id, instance.status_id, 1)
+    instance._loaded_status_id = instance.status_id
+
+
+@receiver(post_delete, sender=Application)
+def application_deleted(sender, instance, **kwargs):
+    change_count(instance.vacancy_id, getattr(instance, "_loaded_status_id", instance.status_id), -1)
@@ -0,0 +1,323 @@
+import csv
+import io
+import json
+import tracemalloc
+
+from django.core.cache import cache
+from django.db import connection
+from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+from rest_framework import status
+from rest_framework.test import APIClient
+
+from accounts.lookups import roles
+from accounts.models import User
+from api.bulk import copy_rows, reserve_ids
+from dict.models import City, CityTranslation, Country
+from files.models import File
+from tags.models import Tag, TagGroup, TagTranslation
+from vacancies.enums import WorkFormat
+from vacancies.counters import get_stored_counts
+from vacancies.lookups import application_statuses
+from vacancies.models import Vacancy, VacancyTag, Application, ApplicationAnswer, ApplicationNote
+from vacancies_templates.lookups import question_types
+from vacancies_templates.models import ApplicationTemplate, Question, Answer
+
+FIXTURES = ["roles.json", "application_statuses.json", "question_types.json", "file_types.json"]
+
+
+def create_user(email, role="CANDIDATE"):
+    return User.objects.create_user(email, "password", role=roles.get_by_slug(role), first_name="Test")
+
+
+def create_tags(count):
+    group = TagGroup.objects.create()
+    tags = Tag.objects.bulk_create([Tag(group=group) for _ in range(count)])
+    TagTranslation.objects.bulk_create([
+        TagTranslation(tag=tag, name=f"Tag {tag.id}", language_code="en") for tag in tags
+    ])
+    return tags
+
+
+def create_cities(count):
+    country = Country.objects.create()
+    cities = City.objects.bulk_create([City(population=1000 * i, country=country) for i in range(count)])
+    CityTranslation.objects.bulk_create([
+        CityTranslation(city=city, name=f"City {city.id}", language_code="en") for city in cities
+    ])
+    return cities
+
+
+def create_vacancy(recruiter, template, tags=(), cities=(), **fields):
+    vacancy = Vacancy.objects.create(
+        name="Python Developer", description="Build the hiring platform.", work_format=WorkFormat.REMOTE,
+        application_template=template, created_by=recruiter, **fields
+    )
+    VacancyTag.objects.bulk_create([VacancyTag(vacancy=vacancy, tag=tag, position=i) for i, tag in enumerate(tags)])
+    vacancy.cities.set(cities)
+    return vacancy
+
+
+def create_application(vacancy, candidate, status="New"):
+    return Application.objects.create(
+        vacancy=vacancy, created_by=candidate, status=application_statuses.get_by_slug(status)
+    )
+
+
+def create_template(recruiter):
+    """
+    A template with a question of every type; the single-answer question gets two options.
+    """
+    template = ApplicationTemplate.objects.create(name="Form", created_by=recruiter)
+    for type_name in ("SHORT_TEXT", "LONG_TEXT", "SINGLE_ANSWER", "FILE"):
+        question = Question.objects.create(
+            name=type_name.title(), type=question_types.get_by_slug(type_name), application_template=template
+        )
+        if type_name == "SINGLE_ANSWER":
+            Answer.objects.bulk_create([Answer(question=question, value=value) for value in ("Yes", "No")])
+    return template
+
+
+def answer_application(application):
+    """
+    Answers every question of the vacancy's template: text, the first option, and a CV file.
+    """
+    answer_ids = []
+    for question in application.vacancy.application_template.questions.order_by("id"):
+        type_name = question_types.get(question.type_id).name
+        if type_name == "SINGLE_ANSWER":
+            answer_ids.append(question.answers.order_by("id").first().id)
+            continue
+        value = f"{type_name} answer"
+        if type_name == "FILE":
+            value = [File.objects.create(
+                file=f"{application.created_by_id}/cv.pdf", user_filename="cv.pdf", extension="pdf", type_id=1,
+                created_by=application.created_by,
+            ).id]
+        answer_ids.append(Answer.objects.create(question=question, value=value, application_created=True).id)
+    ApplicationAnswer.objects.bulk_create([
+        ApplicationAnswer(application=application, answer_id=answer_id) for answer_id in answer_ids
+    ])
+    return application
+
+
+class QueryCountTestCase(TestCase):
+    """
+    Responses whose query count must not grow with the number of rows they list.
+    """
+    fixtures = FIXTURES
+
+    def setUp(self):
+        cache.clear()  # versions are bumped on commit, which never comes inside a test
+        self.client = APIClient()
+
+    def get(self, user, path, **params):
+        self.client.force_authenticate(user)
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.get(path, params)
+        self.assertEqual(response.status_code, status.HTTP_200_OK, response.content)
+        data = response.json()
+        return len(queries), data["results"] if isinstance(data, dict) else data
+
+    def assertConstantQueries(self, small, large):
+        """
+        ``small`` and ``large`` are (user, path, params) requests listing one and several rows.
+        """
+        # loads the lookup tables and translations of the process; another URL, so no response is cached
+        self.get(*small[:2], warm_up=1, **small[2])
+        small_queries, small_rows = self.get(*small[:2], **small[2])
+        with self.assertNumQueries(small_queries):
+            _, large_rows = self.get(*large[:2], **large[2])
+        self.assertEqual(len(small_rows), 1)
+        self.assertGreater(len(large_rows), 1)
+
+
+class VacancyQueryCountTests(QueryCountTestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.candidate = create_user("candidate@example.com")
+        cls.recruiter = create_user("recruiter@example.com", "RECRUITER")
+        cls.other_recruiter = create_user("other.recruiter@example.com", "RECRUITER")
+        template = ApplicationTemplate.objects.create(name="Form", created_by=cls.recruiter)
+        tags, cities = create_tags(3), create_cities(2)
+
+        create_vacancy(cls.other_recruiter, template, tags, cities)
+        create_vacancy(cls.other_recruiter, template, tags, cities, deleted_at="2024-01-01T00:00:00Z")
+        for _ in range(4):
+            vacancy = create_vacancy(cls.recruiter, template, tags, cities)
+            create_application(vacancy, cls.candidate, "Interviewing")
+            create_vacancy(cls.recruiter, template, tags[:1], cities[:1], deleted_at="2024-01-01T00:00:00Z")
+
+    def test_vacancy_list(self):
+        path = "/api/v1/vacancies/"
+        self.assertConstantQueries(
+            (self.candidate, path, {"page_size": 1}), (self.candidate, path, {"page_size": 5})
+        )
+
+    def test_user_vacancy_list(self):
+        path = "/api/v1/users/me/vacancies/"
+        self.assertConstantQueries((self.other_recruiter, path, {}), (self.recruiter, path, {}))
+
+    def test_deleted_vacancy_list(self):
+        path = "/api/v1/users/me/vacancies/deleted/"
+        self.assertConstantQueries((self.other_recruiter, path, {}), (self.recruiter, path, {}))
+
+
+class ApplicationQueryCountTests(QueryCountTestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.recruiter = create_user("recruiter@example.com", "RECRUITER")
+        cls.candidate = create_user("candidate@example.com")
+        cls.other_candidate = create_user("other.candidate@example.com")
+        template = create_template(cls.recruiter)
+        cls.vacancy = create_vacancy(cls.recruiter, template)
+        cls.other_vacancy = create_vacancy(cls.recruiter, template)
+
+        application = answer_application(create_application(cls.other_vacancy, cls.other_candidate))
+        ApplicationNote.objects.create(text="Call back", application=application, created_by=cls.recruiter)
+        for _ in range(4):
+            application = answer_application(create_application(create_vacancy(cls.recruiter, template), cls.candidate))
+            ApplicationNote.objects.create(text="Call back", application=application, created_by=cls.recruiter)
+        for candidate in (create_user(f"candidate{i}@example.com") for i in range(4)):
+            application = answer_application(create_application(cls.vacancy, candidate))
+            ApplicationNote.objects.create(text="Call back", application=application, created_by=cls.recruiter)
+
+    def test_vacancy_application_list(self):
+        self.assertConstantQueries(
+            (self.recruiter, f"/api/v1/vacancies/{self.other_vacancy.id}/applications/", {}),
+            (self.recruiter, f"/api/v1/vacancies/{self.vacancy.id}/applications/", {}),
+        )
+
+    def test_user_application_list(self):
+        path = "/api/v1/users/me/applications/"
+        self.assertConstantQueries((self.other_candidate, path, {}), (self.candidate, path, {}))
+
+    def test_answers_are_rendered(self):
+        _, applications = self.get(self.recruiter, f"/api/v1/vacancies/{self.vacancy.id}/applications/")
+        answers = {answer["question"]["type"]: answer["value"] for answer in applications[0]["answers"]}
+        self.assertEqual(answers["SINGLE_ANSWER"], "Yes")
+        self.assertEqual(answers["FILE"][0]["user_filename"], "cv.pdf")
+        self.assertIn("url", answers["FILE"][0])
+
+
+class ApplicationCounterTests(TestCase):
+    fixtures = FIXTURES
+
+    @classmethod
+    def setUpTestData(cls):
+        recruiter = create_user("recruiter@example.com", "RECRUITER")
+        cls.vacancy = create_vacancy(recruiter, ApplicationTemplate.objects.create(name="Form", created_by=recruiter))
+        cls.application = create_application(cls.vacancy, create_user("candidate@example.com"))
+
+    def get_counts(self):
+        return {
+            application_statuses.get(status_id).name: count
+            for (_, status_id), count in get_stored_counts(vacancy=self.vacancy).items()
+        }
+
+    def test_status_change_moves_the_application(self):
+        self.application.status = application_statuses.get_by_slug("Interviewing")
+        self.application.save()
+        self.assertEqual(self.get_counts(), {"New": 0, "Interviewing": 1})
+
+    def test_concurrent_status_changes_are_counted_once(self):
+        # both requests loaded the application before either saved it
+        first, second = Application.objects.get(pk=self.application.pk), Application.objects.get(pk=self.application.pk)
+        first.status = second.status = application_statuses.get_by_slug("Interviewing")
+        first.save()
+        second.save()
+        self.assertEqual(self.get_counts(), {"New": 0, "Interviewing": 1})
+
+        second.status = application_statuses.get_by_slug("Hired")
+        first.status = application_statuses.get_by_slug("Rejected")
+        second.save()
+        first.save()
+        self.assertEqual(self.get_counts(), {"New": 0, "Interviewing": 0, "Hired": 0, "Rejected": 1})
+
+
+class ApplicationExportTests(TestCase):
+    fixtures = FIXTURES
+    applications = 100_000
+    memory_budget = 32 * 2 ** 20
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.recruiter = create_user("recruiter@example.com", "RECRUITER")
+        template = create_template(cls.recruiter)
+        cls.vacancy = create_vacancy(cls.recruiter, template)
+        cls.questions = list(template.questions.order_by("id"))
+
+    def setUp(self):
+        self.client = APIClient()
+        self.client.force_authenticate(self.recruiter)
+
+    def export(self, output):
+        """
+        Consumes the streamed export line by line; returns the lines and the peak Python memory while streaming.
+        """
+        response = self.client.get(f"/api/v1/vacancies/{self.vacancy.id}/applications/export/", {"output": output})
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        lines = []
+        tracemalloc.start()
+        try:
+            for line in response.streaming_content:
+                if len(lines) < 10:
+                    lines.append(line.decode())
+                else:
+                    lines.append(None)  # counted, not kept
+            peak = tracemalloc.get_traced_memory()[1]
+        finally:
+            tracemalloc.stop()
+        return lines, peak
+
+    def test_csv_cells_do_not_run_as_formulas(self):
+        candidate = User.objects.create_user(
+            "candidate@example.com", "password", role=roles.get_by_slug("CANDIDATE"),
+            first_name="=HYPERLINK(\"http://example.com\")", last_name="@SUM(A1:A9)", phone_number="+380501234567",
+        )
+        application = create_application(self.vacancy, candidate)
+        short_text = self.questions[0]
+        answer = Answer.objects.create(question=short_text, value="-2+3", application_created=True)
+        ApplicationAnswer.objects.create(application=application, answer=answer)
+
+        lines, _ = self.export("csv")
+        row = next(csv.DictReader(io.StringIO("".join(lines)), strict=True))
+        self.assertEqual(row["first_name"], "'=HYPERLINK(\"http://example.com\")")
+        self.assertEqual(row["last_name"], "'@SUM(A1:A9)")
+        self.assertEqual(row["phone_number"], "'+380501234567")
+        self.assertEqual(row[short_text.name], "'-2+3")
+        self.assertEqual(row["email"], "candidate@example.com")
+
+    def test_export_memory_stays_bounded(self):
+        self.generate_applications(self.applications)
+        for output, header_lines in (("csv", 1), ("ndjson", 0)):
+            with self.subTest(output=output):
+                lines, peak = self.export(output)
+                self.assertEqual(len(lines), self.applications + header_lines)
+                self.assertLess(peak, self.memory_budget)
+        self.assertEqual(json.loads(lines[0])["answers"][0]["value"], "Because of the team")
+
+    def generate_applications(self, count):
+        """
+        ``count`` candidates applying with one short text answer, written with COPY.
+        """
+        role, status_id = roles.get_by_slug("CANDIDATE"), application_statuses.get_by_slug("New").pk
+        user_ids, application_ids = reserve_ids(User, count), reserve_ids(Application, count)
+        answer_ids, now = reserve_ids(Answer, count), self.vacancy.created_at
+        copy_rows(User, ("id", "password", "is_superuser", "first_name", "last_name", "is_staff", "is_active",
+                         "date_joined", "email", "contacts", "role_id"), (
+            (user_id, "", False, "Candidate", str(user_id), False, True, now, f"candidate{user_id}@example.com",
+             {"telegram": f"@candidate{user_id}"}, role.pk)
+            for user_id in user_ids
+        ))
+        copy_rows(Application, ("id", "vacancy_id", "status_id", "created_at", "created_by_id"), (
+            (application_id, self.vacancy.id, status_id, now, user_id)
+            for application_id, user_id in zip(application_ids, user_ids)
+        ))
+        copy_rows(Answer, ("id", "question_id", "value", "application_created"), (
+            (answer_id, self.questions[0].id, "Because of the team", True) for answer_id in answer_ids
+        ))
+        copy_rows(ApplicationAnswer, ("application_id", "answer_id"), zip(application_ids, answer_ids))
+        with connection.cursor() as cursor:  # planner statistics, as autovacuum would gather for a real vacancy
+            for model in (User, Application, Answer, ApplicationAnswer):
+                cursor.execute(f"ANALYZE {model._meta.db_table}")
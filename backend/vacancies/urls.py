@@ -2,7 +2,8 @@ from django.urls import path, include
 
 from vacancies.views import VacancyModelViewSet, ApplicationModelViewSet, VacancySearchListAPIView, \
     VacancyApplicationListAPIView, ApplicationStatusListAPIView, ApplicationNoteCreateAPIView, \
-    ApplicationNoteRetrieveUpdateDestroyAPIView, VacancyRestoreUpdateAPIView
+    ApplicationNoteRetrieveUpdateDestroyAPIView, VacancyRestoreUpdateAPIView, VacancyApplicationInboxListAPIView, \
+    VacancyApplicationRetrieveAPIView, VacancyApplicationExportAPIView
 
 urlpatterns = [
     path("vacancies/", include([
@@ -22,7 +23,16 @@ urlpatterns = [
                 }),
                 name="vacancies-retrieve-update-delete"
             ),
-            path("applications/", VacancyApplicationListAPIView.as_view(), name="vacancies-application-list"),
+            path("applications/", include([
+                path("", VacancyApplicationListAPIView.as_view(), name="vacancies-application-list"),
+                path("inbox/", VacancyApplicationInboxListAPIView.as_view(), name="vacancies-application-inbox"),
+                path("export/", VacancyApplicationExportAPIView.as_view(), name="vacancies-application-export"),
+                path(
+                    "<int:application_pk>/",
+                    VacancyApplicationRetrieveAPIView.as_view(),
+                    name="vacancies-application-retrieve"
+                ),
+            ])),
             path("restore/", VacancyRestoreUpdateAPIView.as_view(), name="vacancies-restore"),
         ])),
         path("personalized/", VacancySearchListAPIView.as_view())
@@ -1,15 +1,50 @@
 from django.db.models import Prefetch
 
-from dict.models import City, CityTranslation
-from tags.models import Tag, TagTranslation
+from dict.models import City
+from tags.models import Tag
+from vacancies_templates.lookups import get_type_name
+from vacancies_templates.models import Answer
+from vacancies_templates.validators import CREATED_ANSWER_TYPES
+from .models import Application, ApplicationAnswer, VacancyApplicationCounter
 
 
-def get_prefetched_translations_for_vacancies(language_code="en"):
+def get_vacancy_prefetches():
+    # names are resolved through api.translations.translation_cache, so translations are not prefetched
     return (
-        Prefetch("tags", queryset=Tag.objects.prefetch_related(
-            Prefetch("translations", TagTranslation.objects.filter(language_code=language_code)),
-        ).order_by("vacancytag__position")),
-        Prefetch("cities", queryset=City.objects.prefetch_related(
-            Prefetch("translations", CityTranslation.objects.filter(language_code=language_code))
-        ).order_by("-population"))
+        Prefetch("tags", queryset=Tag.objects.order_by("vacancytag__position")),
+        Prefetch("cities", queryset=City.objects.order_by("-population")),
     )
+
+
+def get_application_counters_prefetch():
+    return Prefetch(
+        "application_counters", queryset=VacancyApplicationCounter.objects.order_by("status_id")
+    )
+
+
+def get_applied_vacancy_ids(user, vacancy_ids):
+    if not user.is_authenticated:
+        return set()
+    return set(Application.objects.filter(
+        created_by=user, vacancy_id__in=vacancy_ids
+    ).values_list("vacancy_id", flat=True))
+
+
+def create_application_answers(application, answers):
+    """
+    Bulk-creates the answer rows for text and file questions and links every answer to the application.
+    """
+    is_created = [get_type_name(answer["question"]) in CREATED_ANSWER_TYPES for answer in answers]
+    created = Answer.objects.bulk_create([
+        Answer(question=answer["question"], value=answer["value"], application_created=True)
+        for answer, answer_is_created in zip(answers, is_created) if answer_is_created
+    ])
+    created_ids = iter(answer.id for answer in created)
+
+    ApplicationAnswer.objects.bulk_create([
+        ApplicationAnswer(
+            application=application,
+            answer_id=next(created_ids) if answer_is_created else answer["value"],
+        )
+        for answer, answer_is_created in zip(answers, is_created)
+    ])
@@ -1,41 +1,53 @@
-from django.db.models import OuterRef, ExpressionWrapper, F, Subquery, FloatField, Sum, Count
+from django.db.models import F
+from django.http import StreamingHttpResponse
 from django_filters.rest_framework import DjangoFilterBackend
+from drf_spectacular.types import OpenApiTypes
+from drf_spectacular.utils import extend_schema, OpenApiParameter
 from rest_framework import viewsets
-from rest_framework.exceptions import PermissionDenied
-from rest_framework.filters import SearchFilter
+from rest_framework.exceptions import PermissionDenied, ValidationError
 from rest_framework.generics import ListAPIView, CreateAPIView, RetrieveAPIView, RetrieveUpdateDestroyAPIView, \
-    UpdateAPIView
+    UpdateAPIView, get_object_or_404
 from rest_framework.permissions import IsAuthenticatedOrReadOnly, IsAuthenticated
+from rest_framework.views import APIView
 
-from accounts.models import UserTag
-from api.pagination import DefaultPageNumberPagination
+from api.async_views import AsyncCachedResponseMixin, AsyncListAPIView, AsyncRetrieveAPIView
+from api.mixins import CachedResponseMixin, ConditionalListMixin
+from api.pagination import SwitchablePagination, OptionalPagination, KeysetPagination
 from api.permissions import CreatedByPermission, VacancyCreatedByPermission
-from api.utils import get_language_code
-from .filters import VacancyFilter
-from .models import Vacancy, Application, ApplicationStatus, VacancyTag, ApplicationNote
+from api.translations import get_translations_namespace
+from dict.models import City
+from tags.models import Tag
+from .export import EXPORT_FORMATS
+from .filters import VacancyFilter, VacancySearchFilter, ApplicationFilter, ApplicationOrderingFilter
+from .models import Vacancy, Application, ApplicationStatus, ApplicationNote
 from .serializers import VacancySerializer, ApplicationCandidateSerializer, ApplicationStatusSerializer, \
     ApplicationNoteSerializer, ApplicationSerializer, UserVacancySerializer, ApplicationRecruiterSerializer, \
-    ApplicationUpdateSerializer, VacancyDeletedSerializer, VacancyRestoreSerializer
-from .utils import get_prefetched_translations_for_vacancies
+    ApplicationUpdateSerializer, VacancyDeletedSerializer, VacancyRestoreSerializer, ApplicationSummarySerializer
+from .utils import get_vacancy_prefetches, get_application_counters_prefetch, get_applied_vacancy_ids
 
 
-class VacancyModelViewSet(viewsets.ModelViewSet):
+class VacancyModelViewSet(CachedResponseMixin, viewsets.ModelViewSet):
     queryset = Vacancy.objects.none()  # mock for swagger
     serializer_class = VacancySerializer
     permission_classes = (IsAuthenticatedOrReadOnly,)
-    filter_backends = [DjangoFilterBackend, SearchFilter]
+    filter_backends = [DjangoFilterBackend, VacancySearchFilter]
     filterset_class = VacancyFilter
     search_fields = ['name', 'description']
-    pagination_class = DefaultPageNumberPagination
+    pagination_class = SwitchablePagination
+    cache_namespaces = ("vacancies", get_translations_namespace(Tag), get_translations_namespace(City))
+    user_fields = ("is_applied",)
+
+    def add_user_fields(self, vacancies):
+        applied_vacancy_ids = get_applied_vacancy_ids(self.request.user, [vacancy["id"] for vacancy in vacancies])
+        for vacancy in vacancies:
+            vacancy["is_applied"] = vacancy["id"] in applied_vacancy_ids
 
     def perform_create(self, serializer):
         serializer.save(created_by=self.request.user)
 
     def get_queryset(self):
-        language_code = get_language_code()
-
         return Vacancy.objects.prefetch_related(
-            *get_prefetched_translations_for_vacancies(language_code)
+            *get_vacancy_prefetches()
         ).order_by("-created_at")
 
     def perform_destroy(self, instance):
@@ -51,13 +63,11 @@ class VacancyDeletedListAPIView(ListAPIView):
     permission_classes = (IsAuthenticated,)
 
     def get_queryset(self):
-        language_code = get_language_code()
-
         return Vacancy.all_objects.filter(
             deleted_at__isnull=False, created_by=self.request.user
         ).prefetch_related(
-            *get_prefetched_translations_for_vacancies(language_code)
-        ).annotate(applied=Count("applications")).order_by("-created_at")
+            *get_vacancy_prefetches(), get_application_counters_prefetch()
+        ).order_by("-created_at")
 
 
 class VacancyRecruiterRetrieveAPIView(RetrieveAPIView):
@@ -66,11 +76,9 @@ class VacancyRecruiterRetrieveAPIView(RetrieveAPIView):
     permission_classes = (IsAuthenticated, CreatedByPermission)
 
     def get_queryset(self):
-        language_code = get_language_code()
-
         return Vacancy.objects.prefetch_related(
-            *get_prefetched_translations_for_vacancies(language_code)
-        ).annotate(applied=Count("applications")).order_by("-created_at")
+            *get_vacancy_prefetches(), get_application_counters_prefetch()
+        ).order_by("-created_at")
 
 
 class ApplicationModelViewSet(viewsets.ModelViewSet):
@@ -94,9 +102,10 @@ class ApplicationModelViewSet(viewsets.ModelViewSet):
         return [permission() for permission in permission_classes]
 
 
-class ApplicationStatusListAPIView(ListAPIView):
+class ApplicationStatusListAPIView(ConditionalListMixin, ListAPIView):
     queryset = ApplicationStatus.objects.order_by("id")
     serializer_class = ApplicationStatusSerializer
+    etag_namespaces = ("application_statuses",)
 
 
 class ApplicationNoteCreateAPIView(CreateAPIView):
@@ -117,12 +126,13 @@ class ApplicationNoteRetrieveUpdateDestroyAPIView(RetrieveUpdateDestroyAPIView):
 class UserApplicationsListAPIView(ListAPIView):
     serializer_class = ApplicationSerializer
     permission_classes = (IsAuthenticated,)
+    pagination_class = OptionalPagination
 
     def get_queryset(self):
         return (
             Application.objects.order_by("-created_at")
             .filter(created_by=self.request.user)
-            .select_related("vacancy", "status")
+            .select_related("vacancy")
             .prefetch_related("answers__question")
         )
 
@@ -132,12 +142,9 @@ class UserVacanciesListAPIView(ListAPIView):
     permission_classes = (IsAuthenticated,)
 
     def get_queryset(self):
-        language_code = get_language_code()
-
         return (
             Vacancy.objects.order_by("created_at")
-            .annotate(applied=Count("applications"))
-            .prefetch_related(*get_prefetched_translations_for_vacancies(language_code))
+            .prefetch_related(*get_vacancy_prefetches(), get_application_counters_prefetch())
             .filter(created_by=self.request.user)
             .prefetch_related("tags", "cities")
         )
@@ -146,10 +153,10 @@ class UserVacanciesListAPIView(ListAPIView):
 class VacancySearchListAPIView(ListAPIView):
     serializer_class = VacancySerializer
     permission_classes = [IsAuthenticated]
-    filter_backends = [DjangoFilterBackend, SearchFilter]
+    filter_backends = [DjangoFilterBackend, VacancySearchFilter]
     filterset_class = VacancyFilter
     search_fields = ['name', 'description']
-    pagination_class = DefaultPageNumberPagination
+    pagination_class = SwitchablePagination
 
     def get_queryset(self):
         if getattr(self, "swagger_fake_view", False):
@@ -157,50 +164,114 @@ class VacancySearchListAPIView(ListAPIView):
             return Vacancy.objects.none()
 
         user = self.request.user
-        language_code = get_language_code()
-
-        user_tags_qs = UserTag.objects.filter(user=user).values('tag')
-
-        vacancy_tag_match_qs = (
-            VacancyTag.objects
-            .filter(vacancy=OuterRef('pk'), tag__in=user_tags_qs)
-            .annotate(user_position=Subquery(UserTag.objects.filter(
-                user=user,
-                tag=OuterRef('tag')
-            ).values('position')[:1]))
-            .annotate(weight=ExpressionWrapper(
-                1.0 / F('user_position') + 1.0 / F('position'),
-                output_field=FloatField())
-            )
-            .values('vacancy')
-            .annotate(total=Sum('weight'))
-            .values('total')
-        )
 
         qs = (
             Vacancy.objects
-            .annotate(match_score=Subquery(vacancy_tag_match_qs, output_field=FloatField()))
-            .filter(match_score__isnull=False)
-            .prefetch_related(*get_prefetched_translations_for_vacancies(language_code))
-            .order_by('-match_score')
+            .filter(match_scores__user=user)
+            .annotate(match_score=F("match_scores__score"))
+            .prefetch_related(*get_vacancy_prefetches())
+            .order_by("-match_score", "-id")
         )
 
         return qs
 
 
+class VacancyListAsyncView(AsyncCachedResponseMixin, AsyncListAPIView):
+    view_class = VacancyModelViewSet
+    actions = {'get': 'list', 'post': 'create'}
+
+
+class VacancyRetrieveAsyncView(AsyncCachedResponseMixin, AsyncRetrieveAPIView):
+    view_class = VacancyModelViewSet
+    actions = {'get': 'retrieve', 'put': 'update', 'patch': 'partial_update', 'delete': 'destroy'}
+
+
+class VacancySearchListAsyncView(AsyncListAPIView):
+    view_class = VacancySearchListAPIView
+
+
 class VacancyApplicationListAPIView(ListAPIView):
     queryset = Application.objects.select_related(
-        "status", "created_by__photo"
+        "created_by__photo"
     ).prefetch_related(
-        "notes__created_by"
+        "notes__created_by", "answers__question"
     ).order_by("created_at")
     serializer_class = ApplicationRecruiterSerializer
     permission_classes = (IsAuthenticated,)
+    pagination_class = OptionalPagination
+    filter_backends = [DjangoFilterBackend, ApplicationOrderingFilter]
+    filterset_class = ApplicationFilter
 
     def get_queryset(self):
         return self.queryset.filter(vacancy_id=self.kwargs["pk"])
 
 
+class VacancyApplicationInboxListAPIView(ListAPIView):
+    """
+    Cursor-paginated summaries of a vacancy's applications for its recruiter;
+    answers and notes are loaded per application from VacancyApplicationRetrieveAPIView.
+    """
+    queryset = Application.objects.none()  # mock for swagger
+    serializer_class = ApplicationSummarySerializer
+    permission_classes = (IsAuthenticated,)
+    pagination_class = KeysetPagination
+    filter_backends = [DjangoFilterBackend, ApplicationOrderingFilter]
+    filterset_class = ApplicationFilter
+    ordering = ("-created_at",)
+
+    def get_queryset(self):
+        return Application.objects.filter(
+            vacancy_id=self.kwargs["pk"], vacancy__created_by=self.request.user
+        ).select_related("created_by__photo")
+
+
+class VacancyApplicationRetrieveAPIView(RetrieveAPIView):
+    queryset = Application.objects.none()  # mock for swagger
+    serializer_class = ApplicationRecruiterSerializer
+    permission_classes = (IsAuthenticated,)
+    lookup_url_kwarg = "application_pk"
+
+    def get_queryset(self):
+        return Application.objects.filter(
+            vacancy_id=self.kwargs["pk"], vacancy__created_by=self.request.user
+        ).select_related(
+            "created_by__photo"
+        ).prefetch_related(
+            "notes__created_by", "answers__question"
+        )
+
+
+@extend_schema(
+    parameters=[
+        OpenApiParameter(
+            "output",
+            str,
+            OpenApiParameter.QUERY,
+            required=False,
+            enum=list(EXPORT_FORMATS),
+        ),
+    ],
+    responses={(200, "text/csv"): OpenApiTypes.STR, (200, "application/x-ndjson"): OpenApiTypes.STR},
+)
+class VacancyApplicationExportAPIView(APIView):
+    """
+    Streams every application of the vacancy, with candidate contacts and answers, as CSV or NDJSON.
+    """
+    permission_classes = (IsAuthenticated,)
+
+    def get(self, request, pk):
+        vacancy = get_object_or_404(Vacancy, pk=pk, created_by=request.user)
+        output = request.query_params.get("output", "csv")
+        if output not in EXPORT_FORMATS:
+            raise ValidationError({"output": f"Choose one of: {', '.join(EXPORT_FORMATS)}."})
+
+        content_type, stream = EXPORT_FORMATS[output]
+        questions = list(vacancy.application_template.questions.order_by("id"))
+        response = StreamingHttpResponse(stream(vacancy, questions), content_type=content_type)
+        response["Content-Disposition"] = f'attachment; filename="vacancy-{vacancy.id}-applications.{output}"'
+        return response
+
+
 class VacancyRestoreUpdateAPIView(UpdateAPIView):
     queryset = Vacancy.all_objects.filter(deleted_at__isnull=False)
     serializer_class = VacancyRestoreSerializer
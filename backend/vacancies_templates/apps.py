@@ -4,3 +4,6 @@ from django.apps import AppConfig
 class VacanciesTemplatesConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'vacancies_templates'
+
+    def ready(self):
+        from . import signals  # noqa: F401
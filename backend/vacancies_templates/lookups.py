@@ -0,0 +1,8 @@
+from api.lookups import LookupTable
+from .models import QuestionType
+
+question_types = LookupTable(QuestionType, "question_types")
+
+
+def get_type_name(question):
+    return question_types.get(question.type_id).name
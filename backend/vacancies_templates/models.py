@@ -1,4 +1,5 @@
 from django.db import models
+from django.db.models import Prefetch
 
 from accounts.models import User
 from api.models import AbstractSoftDeleteModel
@@ -36,6 +37,14 @@ class Question(models.Model):
     def initial_answers(self):
         return self.answers.filter(application_created=False)
 
+    @staticmethod
+    def prefetch_initial_answers():
+        # the initial answers as a list in prefetched_initial_answers; initial_answers stays a queryset
+        return Prefetch(
+            "answers", Answer.objects.filter(application_created=False).order_by("id"),
+            to_attr="prefetched_initial_answers",
+        )
+
 
 class Answer(models.Model):
     question = models.ForeignKey(Question, on_delete=models.CASCADE, related_name='answers')
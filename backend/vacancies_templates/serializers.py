@@ -2,8 +2,11 @@ from django.db import transaction
 from rest_framework import serializers
 
 from files.models import File
+from api.serializers import LookupSlugRelatedField
 from files.serializers import FileSerializer
+from vacancies_templates.lookups import question_types, get_type_name
 from vacancies_templates.models import QuestionType, ApplicationTemplate, Question, Answer
+from vacancies_templates.validators import validate_answer, get_file_types
 
 
 class QuestionTypeSerializer(serializers.ModelSerializer):
@@ -19,7 +22,7 @@ class AnswerSerializer(serializers.ModelSerializer):
 
 
 class QuestionSerializer(serializers.ModelSerializer):
-    type = serializers.SlugRelatedField(slug_field="name", queryset=QuestionType.objects.all())
+    type = LookupSlugRelatedField(question_types)
     answers = AnswerSerializer(many=True, source="initial_answers")
 
     class Meta:
@@ -27,6 +30,13 @@ class QuestionSerializer(serializers.ModelSerializer):
         exclude = ("application_template", "custom_requirements")
 
 
+class PrefetchedQuestionSerializer(QuestionSerializer):
+    """
+    QuestionSerializer for questions loaded with Question.prefetch_initial_answers().
+    """
+    answers = AnswerSerializer(many=True, source="prefetched_initial_answers")
+
+
 class QuestionTemplateSerializer(QuestionSerializer):
     answers = AnswerSerializer(many=True, required=False)
 
@@ -60,13 +70,18 @@ class ApplicationTemplateSerializer(serializers.ModelSerializer):
 
 
 class QuestionShortSerializer(serializers.ModelSerializer):
-    type = serializers.SlugRelatedField(slug_field="name", read_only=True)
+    type = LookupSlugRelatedField(question_types, read_only=True)
 
     class Meta:
         model = Question
         fields = ("id", "name", "type")
 
 
+class AnswerInputSerializer(serializers.Serializer):
+    question = serializers.IntegerField()
+    value = serializers.JSONField()
+
+
 class AnswerQuestionSerializer(serializers.ModelSerializer):
     value = serializers.JSONField(write_only=True)
 
@@ -77,41 +92,31 @@ class AnswerQuestionSerializer(serializers.ModelSerializer):
     def validate(self, attrs):
         question = attrs["question"]
         answer = attrs["value"]
-        if question.type.name in ["SHORT_TEXT", "LONG_TEXT"]:
-            if not isinstance(answer, str):
-                raise serializers.ValidationError("This text field must be a string.")
-            if len(answer) > question.max_length:
-                raise serializers.ValidationError(
-                    f"This text field cannot be longer than {question.max_length} characters.")
-        if question.type.name == "FILE":
-            if not isinstance(answer, list) or len(answer) == 0:
-                raise serializers.ValidationError("Specify files.")
-            if question.max_length and len(answer) > question.max_length:
-                raise serializers.ValidationError(f"This field cannot be more than {question.max_length}.")
-            if types := question.custom_requirements.get("types"):
-                file_types = File.objects.filter(id__in=answer).select_related("type").values_list("type__name",
-                                                                                                   flat=True)
-                if set(types) != set(file_types):
-                    raise serializers.ValidationError("Enter correct files.")
-        if question.type.name == "SINGLE_ANSWER":
-            if not isinstance(answer, int):
-                raise serializers.ValidationError("This answer field must be an int.")
-            elif answer not in question.answers.values_list("id", flat=True):
-                raise serializers.ValidationError("This answer field must be related to question.")
+        type_name = get_type_name(question)
+        option_ids = set(question.initial_answers.values_list("id", flat=True)) if type_name == "SINGLE_ANSWER" else ()
+        file_types = get_file_types(answer) if type_name == "FILE" and isinstance(answer, list) else {}
+        validate_answer(question, answer, option_ids, file_types)
         return attrs
 
     def create(self, validated_data):
-        if validated_data["question"].type.name in ["SHORT_TEXT", "LONG_TEXT", "FILE"]:
+        type_name = get_type_name(validated_data["question"])
+        if type_name in ["SHORT_TEXT", "LONG_TEXT", "FILE"]:
             validated_data["application_created"] = True
             return super().create(validated_data)
-        if validated_data["question"].type.name == "SINGLE_ANSWER":
+        if type_name == "SINGLE_ANSWER":
             return self.Meta.model.objects.get(pk=validated_data["value"])
 
     def to_representation(self, instance):
         representation = super().to_representation(instance)
         question = instance.question
         representation["question"] = QuestionShortSerializer(question).data
-        representation["value"] = instance.value if question.type.name != "FILE" else (
-            FileSerializer(File.objects.filter(id__in=instance.value).all(), many=True, include_url=True).data
+        representation["value"] = instance.value if get_type_name(question) != "FILE" else (
+            FileSerializer(self.get_files(instance), many=True, include_url=True).data
         )
         return representation
+
+    def get_files(self, instance):
+        answer_files = self.context.get("answer_files")  # preloaded for the whole page by the parent list
+        if answer_files is None:
+            return File.objects.filter(id__in=instance.value)
+        return [answer_files[file_id] for file_id in instance.value if file_id in answer_files]
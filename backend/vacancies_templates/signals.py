@@ -0,0 +1,4 @@
+from api.cache import bump_version_on_change
+from .models import QuestionType
+
+bump_version_on_change("question_types", QuestionType)
@@ -0,0 +1,50 @@
+from django.core.cache import cache
+from django.test import TestCase
+from rest_framework import status
+from rest_framework.test import APIClient
+
+from accounts.lookups import roles
+from accounts.models import User
+from vacancies_templates.lookups import question_types
+from vacancies_templates.models import ApplicationTemplate, Question, Answer
+
+
+class QuestionViewSetTests(TestCase):
+    fixtures = ["roles.json", "question_types.json"]
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = User.objects.create_user("recruiter@example.com", "password", role=roles.get_by_slug("RECRUITER"))
+        template = ApplicationTemplate.objects.create(name="Backend", created_by=cls.user)
+        cls.question = Question.objects.create(
+            name="Level", type=question_types.get_by_slug("SINGLE_ANSWER"), application_template=template
+        )
+        cls.option = Answer.objects.create(question=cls.question, value="Senior")
+        Answer.objects.create(question=cls.question, value="Middle", application_created=True)
+
+    def setUp(self):
+        cache.clear()
+        self.client = APIClient()
+        self.client.force_authenticate(self.user)
+
+    def assertInitialAnswers(self, question):
+        self.assertEqual([answer["id"] for answer in question["answers"]], [self.option.id])
+
+    def test_initial_answers_is_a_queryset(self):
+        question = Question.objects.prefetch_related(Question.prefetch_initial_answers()).get()
+        self.assertEqual(question.prefetched_initial_answers, [self.option])
+        self.assertEqual(list(question.initial_answers.values_list("id", flat=True)), [self.option.id])
+
+    def test_list_and_retrieve_serialize_the_prefetched_answers(self):
+        response = self.client.get("/api/v1/templates/questions/")
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertInitialAnswers(response.json()[0])
+        response = self.client.get(f"/api/v1/templates/questions/{self.question.id}/")
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertInitialAnswers(response.json())
+
+    def test_update_serializes_the_answers_without_a_prefetch(self):
+        response = self.client.patch(f"/api/v1/templates/questions/{self.question.id}/", {"name": "Seniority"})
+        self.assertEqual(response.status_code, status.HTTP_200_OK, response.content)
+        self.assertEqual(response.json()["name"], "Seniority")
+        self.assertInitialAnswers(response.json())
@@ -0,0 +1,16 @@
+from files.models import File
+from .lookups import get_type_name
+
+
+def get_answer_files(answers):
+    """
+    Files referenced by FILE answers, loaded with one query: file id -> File.
+    """
+    file_ids = {
+        file_id
+        for answer in answers if get_type_name(answer.question) == "FILE"
+        for file_id in answer.value
+    }
+    if not file_ids:
+        return {}
+    return {file.id: file for file in File.objects.filter(id__in=file_ids)}
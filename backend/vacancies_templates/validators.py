@@ -0,0 +1,103 @@
+from collections import defaultdict
+
+from rest_framework import serializers
+from rest_framework.settings import api_settings
+
+from files.lookups import file_types
+from files.models import File
+from .lookups import get_type_name
+from .models import Question, Answer
+
+TEXT_TYPES = ("SHORT_TEXT", "LONG_TEXT")
+CREATED_ANSWER_TYPES = ("SHORT_TEXT", "LONG_TEXT", "FILE")
+
+
+def get_file_types(file_ids):
+    return {
+        file_id: file_types.get(type_id).name
+        for file_id, type_id in File.objects.filter(id__in=file_ids).values_list("id", "type_id")
+    }
+
+
+def validate_answer(question, answer, option_ids, file_types):
+    """
+    option_ids: ids of the question's initial answers, file_types: file id -> file type name.
+    """
+    type_name = get_type_name(question)
+    if type_name in TEXT_TYPES:
+        if not isinstance(answer, str):
+            raise serializers.ValidationError("This text field must be a string.")
+        if len(answer) > question.max_length:
+            raise serializers.ValidationError(
+                f"This text field cannot be longer than {question.max_length} characters.")
+    if type_name == "FILE":
+        if not isinstance(answer, list) or len(answer) == 0:
+            raise serializers.ValidationError("Specify files.")
+        if question.max_length and len(answer) > question.max_length:
+            raise serializers.ValidationError(f"This field cannot be more than {question.max_length}.")
+        if types := question.custom_requirements.get("types"):
+            if set(types) != {file_types[file_id] for file_id in answer if file_id in file_types}:
+                raise serializers.ValidationError("Enter correct files.")
+    if type_name == "SINGLE_ANSWER":
+        if not isinstance(answer, int):
+            raise serializers.ValidationError("This answer field must be an int.")
+        elif answer not in option_ids:
+            raise serializers.ValidationError("This answer field must be related to question.")
+
+
+class ApplicationAnswersValidator:
+    """
+    Validates every answer of an application in memory: the template's questions, their types and options,
+    and the referenced files are each loaded with a single query.
+    """
+
+    def __init__(self, application_template_id):
+        self.questions = {
+            question.id: question
+            for question in Question.objects.filter(application_template_id=application_template_id)
+        }
+        self.option_ids = defaultdict(set)
+        for question_id, answer_id in Answer.objects.filter(
+            question__in=self.questions, application_created=False
+        ).values_list("question_id", "id"):
+            self.option_ids[question_id].add(answer_id)
+
+    def validate(self, answers):
+        """
+        Takes [{"question": id, "value": ...}] and returns [{"question": Question, "value": ...}].
+        """
+        file_ids = {
+            file_id
+            for answer in answers
+            if (question := self.questions.get(answer["question"])) and get_type_name(question) == "FILE"
+            and isinstance(answer["value"], list)
+            for file_id in answer["value"] if isinstance(file_id, int)
+        }
+        file_types = get_file_types(file_ids) if file_ids else {}
+
+        errors, validated, has_errors = [], [], False
+        for answer in answers:
+            question = self.questions.get(answer["question"])
+            try:
+                if question is None:
+                    raise serializers.ValidationError(
+                        {"question": ["This question does not belong to the vacancy application template."]})
+                validate_answer(question, answer["value"], self.option_ids[question.id], file_types)
+            except serializers.ValidationError as exc:
+                errors.append(
+                    exc.detail if isinstance(exc.detail, dict) else {api_settings.NON_FIELD_ERRORS_KEY: exc.detail}
+                )
+                has_errors = True
+                continue
+            errors.append({})
+            validated.append({"question": question, "value": answer["value"]})
+
+        if has_errors:
+            raise serializers.ValidationError({"answers": errors})
+
+        answered = {answer["question"].id for answer in validated}
+        if any(question.is_required and question.id not in answered for question in self.questions.values()):
+            raise serializers.ValidationError("Answer required questions.")
+
+        return validated
+
@@ -3,8 +3,14 @@ from rest_framework import viewsets
 from rest_framework.generics import ListAPIView
 from rest_framework.permissions import IsAuthenticated
 
+from api.mixins import ConditionalListMixin
+from api.pagination import OptionalPagination
+from config.settings import DICTIONARY_CACHE_MAX_AGE
 from .models import ApplicationTemplate, Question, Answer, QuestionType
-from .serializers import ApplicationTemplateSerializer, QuestionSerializer, AnswerSerializer, QuestionTypeSerializer
+from .serializers import (
+    ApplicationTemplateSerializer, QuestionSerializer, PrefetchedQuestionSerializer, AnswerSerializer,
+    QuestionTypeSerializer,
+)
 
 
 class ApplicationTemplateModelViewSet(viewsets.ModelViewSet):
@@ -19,9 +25,16 @@ class ApplicationTemplateModelViewSet(viewsets.ModelViewSet):
 
 
 class QuestionModelViewSet(viewsets.ModelViewSet):
-    queryset = Question.objects.all()
+    queryset = Question.objects.prefetch_related(Question.prefetch_initial_answers()).order_by("id")
     serializer_class = QuestionSerializer
     permission_classes = (IsAuthenticated,)
+    pagination_class = OptionalPagination
+
+    def get_serializer_class(self):
+        # list and retrieve read the prefetched queryset; written questions are serialized without it
+        if self.action in ("list", "retrieve"):
+            return PrefetchedQuestionSerializer
+        return QuestionSerializer
 
 
 class AnswerModelViewSet(viewsets.ModelViewSet):
@@ -30,7 +43,9 @@ class AnswerModelViewSet(viewsets.ModelViewSet):
     permission_classes = (IsAuthenticated,)
 
 
-class QuestionTypeListAPIView(ListAPIView):
+class QuestionTypeListAPIView(ConditionalListMixin, ListAPIView):
     queryset = QuestionType.objects.all()
     serializer_class = QuestionTypeSerializer
     permission_classes = (IsAuthenticated,)
+    etag_namespaces = ("question_types",)
+    cache_control = {"private": True, "max_age": DICTIONARY_CACHE_MAX_AGE}